@@ -1,14 +1,74 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.data_source import DataSource
 from app.models.user import User
-from app.schemas.data_source import DataSourceCreate, DataSourceResponse, DataSourceUpdate
+from app.schemas.data_source import DataSourceCreate, DataSourceResponse, DataSourceUpdate, DataConstraint, IngestionSchedule, OutputSink, PromotionTarget
+from app.schemas.processing import TransformationRuleCreate
+from app.services.constraint_engine import compile_constraints
+from app.services.incremental_service import IncrementalProcessingService
+from app.services.ingestion_scheduler import IngestionScheduler, next_run_time
+from app.services.output_sinks import validate_sink
+from app.services.promotion_engine import validate_target
 from app.api.v1.endpoints.auth import get_current_user
 
 router = APIRouter()
 
+def _constraint_definitions(constraints: Optional[List[DataConstraint]]) -> Optional[List[dict]]:
+    if constraints is None:
+        return None
+    definitions = [constraint.dict(exclude_none=True) for constraint in constraints]
+    try:
+        compile_constraints(definitions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return definitions
+
+def _standing_rule_definitions(rules: Optional[List[TransformationRuleCreate]], db: Session) -> Optional[List[dict]]:
+    if rules is None:
+        return None
+    definitions = [rule.dict(exclude_none=True) for rule in rules]
+    try:
+        IncrementalProcessingService(db).compile_plan(definitions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return definitions
+
+def _schedule_definition(schedule: Optional[IngestionSchedule]) -> Optional[dict]:
+    if schedule is None:
+        return None
+    definition = schedule.dict(exclude_none=True)
+    try:
+        next_run_time(definition, datetime.utcnow())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return definition
+
+def _output_sink_definitions(sinks: Optional[List[OutputSink]]) -> Optional[List[dict]]:
+    if sinks is None:
+        return None
+    definitions = [sink.dict(exclude_none=True) for sink in sinks]
+    names = [definition["name"] for definition in definitions]
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=400, detail="Output sink names must be unique")
+    try:
+        for definition in definitions:
+            validate_sink(definition)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return definitions
+
+def _promotion_target_definition(target: Optional[PromotionTarget]) -> Optional[dict]:
+    if target is None:
+        return None
+    try:
+        validate_target(target.table)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return target.dict(exclude_none=True)
+
 @router.post("/", response_model=DataSourceResponse)
 async def create_data_source(
     data_source: DataSourceCreate,
@@ -21,9 +81,17 @@ async def create_data_source(
         source_type=data_source.source_type,
         connection_config=data_source.connection_config,
         schema_config=data_source.schema_config,
+        constraints=_constraint_definitions(data_source.constraints),
+        standing_rules=_standing_rule_definitions(data_source.standing_rules, db),
+        scheduling_weight=data_source.scheduling_weight,
+        schedule=_schedule_definition(data_source.schedule),
+        promotion_target=_promotion_target_definition(data_source.promotion_target),
+        output_sinks=_output_sink_definitions(data_source.output_sinks),
         created_by=current_user.id
     )
     db.add(db_data_source)
+    db.flush()
+    IngestionScheduler(db).schedule_source(db_data_source)
     db.commit()
     db.refresh(db_data_source)
     
@@ -34,6 +102,14 @@ async def create_data_source(
         source_type=db_data_source.source_type,
         connection_config=db_data_source.connection_config,
         schema_config=db_data_source.schema_config,
+        constraints=db_data_source.constraints,
+        standing_rules=db_data_source.standing_rules,
+        incremental_watermark=db_data_source.incremental_watermark,
+        scheduling_weight=db_data_source.scheduling_weight,
+        schedule=db_data_source.schedule,
+        next_run_at=db_data_source.next_run_at,
+        promotion_target=db_data_source.promotion_target,
+        output_sinks=db_data_source.output_sinks,
         is_active=db_data_source.is_active,
         created_at=db_data_source.created_at,
         updated_at=db_data_source.updated_at
@@ -55,6 +131,14 @@ async def list_data_sources(
             source_type=ds.source_type,
             connection_config=ds.connection_config,
             schema_config=ds.schema_config,
+            constraints=ds.constraints,
+            standing_rules=ds.standing_rules,
+            incremental_watermark=ds.incremental_watermark,
+            scheduling_weight=ds.scheduling_weight,
+            schedule=ds.schedule,
+            next_run_at=ds.next_run_at,
+            promotion_target=ds.promotion_target,
+            output_sinks=ds.output_sinks,
             is_active=ds.is_active,
             created_at=ds.created_at,
             updated_at=ds.updated_at
@@ -79,6 +163,14 @@ async def get_data_source(
         source_type=data_source.source_type,
         connection_config=data_source.connection_config,
         schema_config=data_source.schema_config,
+        constraints=data_source.constraints,
+        standing_rules=data_source.standing_rules,
+        incremental_watermark=data_source.incremental_watermark,
+        scheduling_weight=data_source.scheduling_weight,
+        schedule=data_source.schedule,
+        next_run_at=data_source.next_run_at,
+        promotion_target=data_source.promotion_target,
+        output_sinks=data_source.output_sinks,
         is_active=data_source.is_active,
         created_at=data_source.created_at,
         updated_at=data_source.updated_at
@@ -95,10 +187,28 @@ async def update_data_source(
     if not data_source:
         raise HTTPException(status_code=404, detail="Data source not found")
     
-    for field, value in data_source_update.dict(exclude_unset=True).items():
+    updates = data_source_update.dict(exclude_unset=True)
+    if "constraints" in updates:
+        updates["constraints"] = _constraint_definitions(data_source_update.constraints)
+    standing_rules_changed = False
+    if "standing_rules" in updates:
+        updates["standing_rules"] = _standing_rule_definitions(data_source_update.standing_rules, db)
+        standing_rules_changed = updates["standing_rules"] != data_source.standing_rules
+    if "schedule" in updates:
+        updates["schedule"] = _schedule_definition(data_source_update.schedule)
+    if "promotion_target" in updates:
+        updates["promotion_target"] = _promotion_target_definition(data_source_update.promotion_target)
+    if "output_sinks" in updates:
+        updates["output_sinks"] = _output_sink_definitions(data_source_update.output_sinks)
+    for field, value in updates.items():
         setattr(data_source, field, value)
+    if "schedule" in updates:
+        IngestionScheduler(db).schedule_source(data_source)
     
     db.commit()
+    if standing_rules_changed:
+        # State folded under the old rules cannot be merged with the new ones.
+        await IncrementalProcessingService(db).reset(data_source)
     db.refresh(data_source)
     
     return DataSourceResponse(
@@ -108,11 +218,82 @@ async def update_data_source(
         source_type=data_source.source_type,
         connection_config=data_source.connection_config,
         schema_config=data_source.schema_config,
+        constraints=data_source.constraints,
+        standing_rules=data_source.standing_rules,
+        incremental_watermark=data_source.incremental_watermark,
+        scheduling_weight=data_source.scheduling_weight,
+        schedule=data_source.schedule,
+        next_run_at=data_source.next_run_at,
+        promotion_target=data_source.promotion_target,
+        output_sinks=data_source.output_sinks,
         is_active=data_source.is_active,
         created_at=data_source.created_at,
         updated_at=data_source.updated_at
     )
 
+@router.post("/{data_source_id}/incremental/run")
+async def run_incremental_processing(
+    data_source_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    data_source = db.query(DataSource).filter(DataSource.id == data_source_id).first()
+    if not data_source:
+        raise HTTPException(status_code=404, detail="Data source not found")
+
+    try:
+        job = await IncrementalProcessingService(db).queue_run(data_source, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "queued", "job_id": job.id, "task_id": job.task_id}
+
+@router.get("/{data_source_id}/incremental")
+async def get_incremental_status(
+    data_source_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    data_source = db.query(DataSource).filter(DataSource.id == data_source_id).first()
+    if not data_source:
+        raise HTTPException(status_code=404, detail="Data source not found")
+
+    return {
+        "data_source_id": data_source.id,
+        "standing_rules": data_source.standing_rules,
+        "watermark": data_source.incremental_watermark,
+        "state": data_source.incremental_state
+    }
+
+@router.post("/{data_source_id}/incremental/reset")
+async def reset_incremental_state(
+    data_source_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    data_source = db.query(DataSource).filter(DataSource.id == data_source_id).first()
+    if not data_source:
+        raise HTTPException(status_code=404, detail="Data source not found")
+
+    await IncrementalProcessingService(db).reset(data_source)
+    return {"message": "Incremental state reset; the next run reprocesses all batches"}
+
+@router.get("/{data_source_id}/schedule")
+async def get_ingestion_schedule(
+    data_source_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    data_source = db.query(DataSource).filter(DataSource.id == data_source_id).first()
+    if not data_source:
+        raise HTTPException(status_code=404, detail="Data source not found")
+
+    return {
+        "data_source_id": data_source.id,
+        "schedule": data_source.schedule,
+        "next_run_at": data_source.next_run_at,
+        "state": data_source.schedule_state
+    }
+
 @router.delete("/{data_source_id}")
 async def delete_data_source(
     data_source_id: int,
@@ -2,8 +2,10 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Backgro
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.user import User
+from app.models.processing_job import ProcessingJob
 from app.schemas.ingestion import DataIngestionRequest, SwiftMessageRequest, BatchUploadResponse
 from app.services.ingestion_service import IngestionService
+from app.services.job_queue import JobQueue
 from app.api.v1.endpoints.auth import get_current_user
 
 router = APIRouter()
@@ -40,7 +42,6 @@ async def ingest_swift_message(
 async def upload_batch_file(
     file: UploadFile = File(...),
     source_id: int = None,
-    background_tasks: BackgroundTasks = BackgroundTasks(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -48,14 +49,15 @@ async def upload_batch_file(
         service = IngestionService(db)
         result = await service.process_batch_file(file, source_id, current_user.id)
         
-        background_tasks.add_task(service.process_uploaded_file, result.job_id)
+        job = db.query(ProcessingJob).filter(ProcessingJob.id == result.job_id).first()
+        await JobQueue(db).enqueue_ingestion(job)
         
         return BatchUploadResponse(
             job_id=result.job_id,
             filename=file.filename,
             file_size=result.file_size,
-            status="uploaded",
-            message="File uploaded successfully, processing started"
+            status="queued",
+            message="File uploaded successfully, processing queued"
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
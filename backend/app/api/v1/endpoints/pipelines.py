@@ -0,0 +1,154 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.models.user import User
+from app.models.data_source import DataSource
+from app.models.pipeline import Pipeline, PipelineRun
+from app.schemas.pipeline import (
+    PipelineCreate, PipelineUpdate, PipelineResponse, PipelineRunCreate, PipelineRunResponse, PipelineStep
+)
+from app.services.pipeline_service import PipelineService, plan_steps
+from app.api.v1.endpoints.auth import get_current_user
+
+router = APIRouter()
+
+def _step_definitions(steps: List[PipelineStep]) -> List[dict]:
+    definitions = [step.dict() for step in steps]
+    try:
+        plan_steps(definitions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return definitions
+
+def _pipeline_response(pipeline: Pipeline) -> PipelineResponse:
+    return PipelineResponse(
+        id=pipeline.id,
+        name=pipeline.name,
+        description=pipeline.description,
+        source_id=pipeline.source_id,
+        steps=pipeline.steps,
+        is_active=pipeline.is_active,
+        created_at=pipeline.created_at,
+        updated_at=pipeline.updated_at
+    )
+
+def _run_response(run: PipelineRun) -> PipelineRunResponse:
+    return PipelineRunResponse(
+        id=run.id,
+        pipeline_id=run.pipeline_id,
+        status=run.status,
+        input_job_id=run.input_job_id,
+        step_states=run.step_states,
+        timing=run.timing,
+        started_at=run.started_at,
+        completed_at=run.completed_at
+    )
+
+@router.post("/", response_model=PipelineResponse)
+async def create_pipeline(
+    pipeline: PipelineCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if not db.query(DataSource).filter(DataSource.id == pipeline.source_id).first():
+        raise HTTPException(status_code=404, detail="Data source not found")
+
+    db_pipeline = Pipeline(
+        name=pipeline.name,
+        description=pipeline.description,
+        source_id=pipeline.source_id,
+        steps=_step_definitions(pipeline.steps),
+        created_by=current_user.id
+    )
+    db.add(db_pipeline)
+    db.commit()
+    db.refresh(db_pipeline)
+    return _pipeline_response(db_pipeline)
+
+@router.get("/", response_model=List[PipelineResponse])
+async def list_pipelines(
+    source_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    query = db.query(Pipeline)
+    if source_id is not None:
+        query = query.filter(Pipeline.source_id == source_id)
+    return [_pipeline_response(pipeline) for pipeline in query.offset(skip).limit(limit).all()]
+
+@router.get("/runs/{run_id}", response_model=PipelineRunResponse)
+async def get_pipeline_run(
+    run_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    run = db.query(PipelineRun).filter(PipelineRun.id == run_id).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Pipeline run not found")
+    return _run_response(run)
+
+@router.get("/{pipeline_id}", response_model=PipelineResponse)
+async def get_pipeline(
+    pipeline_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    pipeline = db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
+    if not pipeline:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+    return _pipeline_response(pipeline)
+
+@router.put("/{pipeline_id}", response_model=PipelineResponse)
+async def update_pipeline(
+    pipeline_id: int,
+    pipeline_update: PipelineUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    pipeline = db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
+    if not pipeline:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+
+    updates = pipeline_update.dict(exclude_unset=True)
+    if "steps" in updates:
+        updates["steps"] = _step_definitions(pipeline_update.steps)
+    for field, value in updates.items():
+        setattr(pipeline, field, value)
+    db.commit()
+    db.refresh(pipeline)
+    return _pipeline_response(pipeline)
+
+@router.post("/{pipeline_id}/runs", response_model=PipelineRunResponse)
+async def start_pipeline_run(
+    pipeline_id: int,
+    run_request: PipelineRunCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    pipeline = db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
+    if not pipeline:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+    if not pipeline.is_active:
+        raise HTTPException(status_code=400, detail="Pipeline is not active")
+
+    try:
+        run = await PipelineService(db).start_run(pipeline, run_request.input_job_id, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _run_response(run)
+
+@router.get("/{pipeline_id}/runs", response_model=List[PipelineRunResponse])
+async def list_pipeline_runs(
+    pipeline_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    runs = db.query(PipelineRun).filter(PipelineRun.pipeline_id == pipeline_id).order_by(
+        PipelineRun.id.desc()
+    ).offset(skip).limit(limit).all()
+    return [_run_response(run) for run in runs]
@@ -1,11 +1,16 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.user import User
 from app.models.processing_job import ProcessingJob
-from app.schemas.processing import ProcessingJobResponse, TransformationRuleCreate
+from app.schemas.processing import ProcessingJobResponse, TransformationRuleCreate, TransformationPreviewRequest
 from app.services.data_processing_service import DataProcessingService
+from app.services.job_queue import JobQueue
+from app.services.lane_scheduler import LaneScheduler, LANES
+from app.services.retry_scheduler import RetryScheduler
+from app.services.quarantine import read_quarantine
+from app.services.rule_registry import rule_registry, RuleValidationError
 from app.api.v1.endpoints.auth import get_current_user
 
 router = APIRouter()
@@ -27,7 +32,8 @@ async def list_processing_jobs(
             status=job.status,
             started_at=job.started_at,
             completed_at=job.completed_at,
-            created_at=job.created_at
+            created_at=job.created_at,
+            progress=job.progress
         )
         for job in jobs
     ]
@@ -52,13 +58,60 @@ async def get_processing_job(
         completed_at=job.completed_at,
         created_at=job.created_at,
         transformation_rules=job.transformation_rules,
-        error_message=job.error_message
+        error_message=job.error_message,
+        progress=job.progress,
+        cancel_requested_at=job.cancel_requested_at
     )
 
 @router.post("/jobs/{job_id}/transform")
 async def apply_transformation_rules(
     job_id: int,
     rules: List[TransformationRuleCreate],
+    profile: bool = False,
+    lane: Optional[str] = None,
+    priority: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Processing job not found")
+    
+    try:
+        # Reject bad rules here rather than in a worker nobody is watching.
+        rule_registry.compile(rules)
+    except RuleValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if lane is not None and lane not in LANES:
+        raise HTTPException(status_code=400, detail=f"Unknown lane '{lane}'; expected one of {list(LANES)}")
+
+    if lane is not None:
+        job.lane = lane
+    if priority is not None:
+        job.priority = priority
+    task_id = await JobQueue(db).enqueue_transformation(job, rules, capture_cprofile=profile)
+    return {"status": "queued", "job_id": job.id, "task_id": task_id}
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_processing_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Processing job not found")
+
+    try:
+        status = await JobQueue(db).cancel(job)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"status": status, "job_id": job.id}
+
+@router.post("/jobs/{job_id}/preview")
+async def preview_transformation_rules(
+    job_id: int,
+    preview_request: TransformationPreviewRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -68,11 +121,88 @@ async def apply_transformation_rules(
     
     try:
         service = DataProcessingService(db)
-        result = await service.apply_transformation_rules(job, rules)
-        return {"status": "success", "result": result}
+        preview = await service.preview_transformation_rules(
+            job,
+            preview_request.rules,
+            head_rows=preview_request.head_rows,
+            sample_rows=preview_request.sample_rows,
+            seed=preview_request.seed
+        )
+        return {"status": "success", "preview": preview}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/jobs/{job_id}/profile")
+async def get_job_execution_profile(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Processing job not found")
+    if not job.execution_profile:
+        raise HTTPException(status_code=404, detail="No execution profile recorded for this job")
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "execution_profile": job.execution_profile
+    }
+
+@router.get("/jobs/{job_id}/quarantine")
+async def get_quarantined_rows(
+    job_id: int,
+    offset: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Processing job not found")
+
+    summary = (job.output_data or {}).get("quarantine") or {"row_count": 0, "path": None, "reasons": {}}
+    return {
+        "job_id": job.id,
+        "row_count": summary["row_count"],
+        "reasons": summary["reasons"],
+        "rows": read_quarantine(job.id, offset=offset, limit=limit)
+    }
+
+@router.get("/rules")
+async def list_transformation_rules(
+    current_user: User = Depends(get_current_user)
+):
+    return {
+        "rules": [
+            {
+                "rule_type": spec.name,
+                "description": spec.description,
+                "parameters": spec.parameters.model_json_schema()
+            }
+            for spec in rule_registry.specs()
+        ],
+        "load_errors": rule_registry.load_errors
+    }
+
+@router.get("/rules/profile-summary")
+async def get_rule_profile_summary(
+    limit: int = 1000,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    service = DataProcessingService(db)
+    return await service.summarize_rule_profiles(limit=limit)
+
+@router.get("/lanes")
+async def get_lane_metrics(
+    window_minutes: int = 15,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await LaneScheduler(db).lane_metrics(window_minutes=window_minutes)
+
 @router.post("/jobs/{job_id}/retry")
 async def retry_processing_job(
     job_id: int,
@@ -84,8 +214,8 @@ async def retry_processing_job(
         raise HTTPException(status_code=404, detail="Processing job not found")
     
     try:
-        service = DataProcessingService(db)
-        result = await service.retry_job(job)
+        scheduler = RetryScheduler(db)
+        result = await scheduler.retry(job)
         return {"status": "success", "message": "Job retry initiated", "new_job_id": result.id}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
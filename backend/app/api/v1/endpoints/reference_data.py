@@ -0,0 +1,114 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.models.user import User
+from app.models.reference_data import ReferenceDataset
+from app.schemas.reference_data import ReferenceDatasetCreate, ReferenceDatasetResponse, ReferenceDatasetUpdate
+from app.services.reference_data_service import ReferenceDataService
+from app.api.v1.endpoints.auth import get_current_user
+
+router = APIRouter()
+
+@router.post("/", response_model=ReferenceDatasetResponse)
+async def create_reference_dataset(
+    dataset: ReferenceDatasetCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if db.query(ReferenceDataset).filter(ReferenceDataset.name == dataset.name).first():
+        raise HTTPException(status_code=400, detail="Reference dataset already exists")
+    
+    try:
+        service = ReferenceDataService(db)
+        db_dataset = await service.create_dataset(
+            name=dataset.name,
+            key_columns=dataset.key_columns,
+            data=dataset.data,
+            description=dataset.description,
+            created_by=current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ReferenceDatasetResponse(
+        id=db_dataset.id,
+        name=db_dataset.name,
+        description=db_dataset.description,
+        key_columns=db_dataset.key_columns,
+        row_count=db_dataset.row_count,
+        version=db_dataset.version,
+        created_at=db_dataset.created_at,
+        updated_at=db_dataset.updated_at
+    )
+
+@router.get("/", response_model=List[ReferenceDatasetResponse])
+async def list_reference_datasets(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    datasets = db.query(ReferenceDataset).offset(skip).limit(limit).all()
+    return [
+        ReferenceDatasetResponse(
+            id=ds.id,
+            name=ds.name,
+            description=ds.description,
+            key_columns=ds.key_columns,
+            row_count=ds.row_count,
+            version=ds.version,
+            created_at=ds.created_at,
+            updated_at=ds.updated_at
+        )
+        for ds in datasets
+    ]
+
+@router.get("/{dataset_id}", response_model=ReferenceDatasetResponse)
+async def get_reference_dataset(
+    dataset_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    dataset = db.query(ReferenceDataset).filter(ReferenceDataset.id == dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Reference dataset not found")
+    
+    return ReferenceDatasetResponse(
+        id=dataset.id,
+        name=dataset.name,
+        description=dataset.description,
+        key_columns=dataset.key_columns,
+        row_count=dataset.row_count,
+        version=dataset.version,
+        created_at=dataset.created_at,
+        updated_at=dataset.updated_at
+    )
+
+@router.put("/{dataset_id}", response_model=ReferenceDatasetResponse)
+async def update_reference_dataset(
+    dataset_id: int,
+    dataset_update: ReferenceDatasetUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    dataset = db.query(ReferenceDataset).filter(ReferenceDataset.id == dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Reference dataset not found")
+    
+    try:
+        service = ReferenceDataService(db)
+        dataset = await service.update_dataset(dataset, dataset_update.dict(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ReferenceDatasetResponse(
+        id=dataset.id,
+        name=dataset.name,
+        description=dataset.description,
+        key_columns=dataset.key_columns,
+        row_count=dataset.row_count,
+        version=dataset.version,
+        created_at=dataset.created_at,
+        updated_at=dataset.updated_at
+    )
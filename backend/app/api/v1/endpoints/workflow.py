@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.user import User
 from app.models.workflow import WorkflowApproval
-from app.schemas.workflow import WorkflowApprovalResponse, ApprovalRequest
+from app.schemas.workflow import WorkflowApprovalResponse, ApprovalRequest, BulkApprovalRequest, BulkRejectionRequest
 from app.services.workflow_service import WorkflowService
 from app.api.v1.endpoints.auth import get_current_user
 
@@ -56,6 +56,40 @@ async def submit_for_approval(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/approvals/bulk-approve")
+async def bulk_approve_jobs(
+    bulk_request: BulkApprovalRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        result = await WorkflowService(db).bulk_decide(
+            approval_ids=bulk_request.approval_ids,
+            approver_id=current_user.id,
+            approve=True,
+            comments=bulk_request.comments
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "success", **result}
+
+@router.post("/approvals/bulk-reject")
+async def bulk_reject_jobs(
+    bulk_request: BulkRejectionRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        result = await WorkflowService(db).bulk_decide(
+            approval_ids=bulk_request.approval_ids,
+            approver_id=current_user.id,
+            approve=False,
+            comments=bulk_request.comments
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "success", **result}
+
 @router.post("/approvals/{approval_id}/approve")
 async def approve_job(
     approval_id: int,
@@ -0,0 +1,46 @@
+from celery import Celery
+from app.core.config import settings
+
+celery_app = Celery(
+    "etl_fastprocessing",
+    broker=settings.celery_broker_url or settings.redis_url,
+    backend=settings.celery_result_backend,
+    include=["app.tasks"]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    timezone="UTC",
+    enable_utc=True,
+    worker_concurrency=settings.worker_concurrency,
+    # Jobs are long and uneven in size: take one at a time and only ack once finished,
+    # so a worker that dies hands its job back to the broker instead of losing it.
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    task_ignore_result=settings.celery_result_backend is None,
+    task_always_eager=settings.celery_task_always_eager,
+    task_eager_propagates=True,
+    # Jobs are published to their lane's queue by the LaneScheduler; everything else is housekeeping.
+    task_default_queue="maintenance",
+    beat_schedule={
+        "reap-expired-job-leases": {
+            "task": "etl.reap_expired_leases",
+            "schedule": settings.job_reaper_interval_seconds,
+        },
+        "schedule-job-retries": {
+            "task": "etl.schedule_retries",
+            "schedule": settings.retry_scheduler_interval_seconds,
+        },
+        "dispatch-lanes": {
+            "task": "etl.dispatch_lanes",
+            "schedule": settings.lane_dispatch_interval_seconds,
+        },
+        "run-scheduled-ingestions": {
+            "task": "etl.run_scheduled_ingestions",
+            "schedule": settings.ingestion_scheduler_interval_seconds,
+        },
+    },
+)
@@ -6,6 +6,8 @@ from app.models.schema import DetectedSchema
 from app.models.workflow import WorkflowApproval
 from app.models.data_lineage import DataLineage
 from app.models.exception import DataException
+from app.models.reference_data import ReferenceDataset
+from app.models.pipeline import Pipeline, PipelineRun
 
 __all__ = [
     "Base",
@@ -15,5 +17,8 @@ __all__ = [
     "DetectedSchema",
     "WorkflowApproval",
     "DataLineage",
-    "DataException"
+    "DataException",
+    "ReferenceDataset",
+    "Pipeline",
+    "PipelineRun"
 ]
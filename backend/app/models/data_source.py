@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Enum, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Enum, Boolean, Text, Float
 from datetime import datetime
 import enum
 from app.core.database import Base
@@ -17,6 +17,16 @@ class DataSource(Base):
     source_type = Column(Enum(SourceType), nullable=False)
     connection_config = Column(JSON)
     schema_config = Column(JSON)
+    constraints = Column(JSON)
+    standing_rules = Column(JSON)
+    incremental_watermark = Column(Integer)
+    incremental_state = Column(JSON)
+    scheduling_weight = Column(Float, default=1.0)  # share of a lane relative to other sources
+    schedule = Column(JSON)  # {"cron": "0 2 * * *"} or {"interval_seconds": 3600}, optionally "jitter_seconds"
+    next_run_at = Column(DateTime, index=True)
+    schedule_state = Column(JSON)
+    promotion_target = Column(JSON)  # where approved data is loaded; see PromotionTarget
+    output_sinks = Column(JSON)  # file datasets approved data is written to; see OutputSink
     is_active = Column(Boolean, default=True)
     created_by = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
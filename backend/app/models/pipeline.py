@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, ForeignKey, Boolean, Enum
+from datetime import datetime
+import enum
+from app.core.database import Base
+
+class PipelineRunStatus(enum.Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class Pipeline(Base):
+    __tablename__ = "pipelines"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source_id = Column(Integer, ForeignKey("data_sources.id"), index=True)
+    name = Column(String, nullable=False)
+    description = Column(Text)
+    steps = Column(JSON, nullable=False)
+    is_active = Column(Boolean, default=True)
+    created_by = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class PipelineRun(Base):
+    __tablename__ = "pipeline_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    pipeline_id = Column(Integer, ForeignKey("pipelines.id"), index=True, nullable=False)
+    status = Column(Enum(PipelineRunStatus), default=PipelineRunStatus.RUNNING)
+    input_job_id = Column(Integer)
+    steps = Column(JSON, nullable=False)
+    step_states = Column(JSON)
+    timing = Column(JSON)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime)
+    created_by = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Enum, Text, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, JSON, Enum, Text, ForeignKey, Index, event, text
+from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 from app.core.database import Base
@@ -17,13 +18,69 @@ class ProcessingJob(Base):
     name = Column(String, nullable=False)
     description = Column(Text)
     source_id = Column(Integer, ForeignKey("data_sources.id"))
+    job_type = Column(String, default="batch")
     status = Column(Enum(JobStatus), default=JobStatus.PENDING)
     input_data = Column(JSON)
     output_data = Column(JSON)
     transformation_rules = Column(JSON)
+    execution_profile = Column(JSON)
     error_message = Column(Text)
+    task_id = Column(String, index=True)
+    task_name = Column(String)
+    task_args = Column(JSON)
+    queued_at = Column(DateTime)
+    # Lane and priority decide when a queued job is released to the workers (see LaneScheduler).
+    lane = Column(String, index=True)
+    priority = Column(Integer, default=0)
+    dispatched_at = Column(DateTime)
+    attempts = Column(Integer, default=0)
+    lease_owner = Column(String)
+    lease_expires_at = Column(DateTime, index=True)
+    heartbeat_at = Column(DateTime)
+    checkpoint = Column(JSON)
+    progress = Column(JSON)
+    cancel_requested_at = Column(DateTime)
+    # Retries point at the first job of their chain for the payload instead of copying it.
+    root_job_id = Column(Integer, ForeignKey("processing_jobs.id"), index=True)
+    retry_of_id = Column(Integer, ForeignKey("processing_jobs.id"))
+    retry_count = Column(Integer, default=0)
+    retry_status = Column(String)
+    next_retry_at = Column(DateTime)
+    # Pipeline steps read the output of an upstream job by reference.
+    input_job_id = Column(Integer, ForeignKey("processing_jobs.id"))
+    pipeline_run_id = Column(Integer, ForeignKey("pipeline_runs.id"), index=True)
+    pipeline_step = Column(String)
+    # PostgreSQL transaction that inserted the job; incremental runs read batches in this order.
+    insert_txid = Column(BigInteger, index=True)
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
     created_by = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    root_job = relationship("ProcessingJob", remote_side=[id], foreign_keys=[root_job_id])
+    input_job = relationship("ProcessingJob", remote_side=[id], foreign_keys=[input_job_id])
+
+    __table_args__ = (
+        Index("ix_processing_jobs_retry_due", "retry_status", "next_retry_at"),
+        Index("ix_processing_jobs_status_updated_at", "status", "updated_at"),
+        Index("ix_processing_jobs_lane_dispatch", "lane", "status", "dispatched_at"),
+    )
+
+
+@event.listens_for(ProcessingJob, "before_insert")
+def _record_insert_txid(mapper, connection, job):
+    if connection.dialect.name == "postgresql" and job.insert_txid is None:
+        job.insert_txid = connection.execute(text("SELECT txid_current()")).scalar()
+
+
+def job_payload(job: ProcessingJob):
+    """The job's input, read from the first job of its retry chain or from the upstream
+    pipeline job's output when it only references them."""
+    if job.input_data is None and job.root_job_id is not None:
+        return job_payload(job.root_job)
+    if job.input_data is None and job.input_job_id is not None:
+        # Upstream output when it produced one; jobs that only carry data (API ingestion) pass their input on.
+        processed = (job.input_job.output_data or {}).get("processed_data")
+        return processed if processed is not None else job_payload(job.input_job)
+    return job.input_data
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text
+from datetime import datetime
+from app.core.database import Base
+
+class ReferenceDataset(Base):
+    __tablename__ = "reference_datasets"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    description = Column(Text)
+    key_columns = Column(JSON, nullable=False)
+    data = Column(JSON, nullable=False)
+    row_count = Column(Integer, default=0)
+    version = Column(Integer, default=1, nullable=False)
+    created_by = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,7 +1,52 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime
 from app.models.data_source import SourceType
+from app.schemas.processing import TransformationRuleCreate
+
+class DataConstraint(BaseModel):
+    type: Literal["not_null", "unique", "range", "regex", "allowed_values", "reference", "cross_column"]
+    name: Optional[str] = None
+    column: Optional[str] = None
+    columns: Optional[List[str]] = None
+    min: Optional[Any] = None
+    max: Optional[Any] = None
+    pattern: Optional[str] = None
+    values: Optional[List[Any]] = None
+    dataset: Optional[str] = None
+    expression: Optional[str] = None
+    severity: Literal["low", "medium", "high", "critical"] = "medium"
+
+class IngestionSchedule(BaseModel):
+    cron: Optional[str] = None
+    interval_seconds: Optional[int] = Field(None, gt=0)
+    jitter_seconds: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def one_trigger(self):
+        if (self.cron is None) == (self.interval_seconds is None):
+            raise ValueError("schedule needs exactly one of 'cron' or 'interval_seconds'")
+        return self
+
+class PromotionTarget(BaseModel):
+    table: str = Field(..., pattern=r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+    mode: Literal["append", "upsert", "replace"] = "append"
+    key_columns: List[str] = []
+    update_columns: Optional[List[str]] = None
+    batch_rows: Optional[int] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def keys_for_upsert(self):
+        if self.mode == "upsert" and not self.key_columns:
+            raise ValueError("upsert needs 'key_columns'")
+        return self
+
+class OutputSink(BaseModel):
+    name: str = Field(..., pattern=r"^[A-Za-z0-9_\-]+$")
+    format: Literal["parquet", "arrow", "csv", "ndjson"] = "parquet"
+    partition_by: List[str] = []
+    row_group_rows: Optional[int] = Field(None, gt=0)
+    compression: Optional[str] = None
 
 class DataSourceCreate(BaseModel):
     name: str
@@ -9,12 +54,24 @@ class DataSourceCreate(BaseModel):
     source_type: SourceType
     connection_config: Optional[Dict[str, Any]] = None
     schema_config: Optional[Dict[str, Any]] = None
+    constraints: Optional[List[DataConstraint]] = None
+    standing_rules: Optional[List[TransformationRuleCreate]] = None
+    scheduling_weight: float = Field(1.0, gt=0)
+    schedule: Optional[IngestionSchedule] = None
+    promotion_target: Optional[PromotionTarget] = None
+    output_sinks: Optional[List[OutputSink]] = None
 
 class DataSourceUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     connection_config: Optional[Dict[str, Any]] = None
     schema_config: Optional[Dict[str, Any]] = None
+    constraints: Optional[List[DataConstraint]] = None
+    standing_rules: Optional[List[TransformationRuleCreate]] = None
+    scheduling_weight: Optional[float] = Field(None, gt=0)
+    schedule: Optional[IngestionSchedule] = None
+    promotion_target: Optional[PromotionTarget] = None
+    output_sinks: Optional[List[OutputSink]] = None
     is_active: Optional[bool] = None
 
 class DataSourceResponse(BaseModel):
@@ -24,6 +81,14 @@ class DataSourceResponse(BaseModel):
     source_type: SourceType
     connection_config: Optional[Dict[str, Any]]
     schema_config: Optional[Dict[str, Any]]
+    constraints: Optional[List[Dict[str, Any]]] = None
+    standing_rules: Optional[List[Dict[str, Any]]] = None
+    incremental_watermark: Optional[int] = None
+    scheduling_weight: Optional[float] = None
+    schedule: Optional[Dict[str, Any]] = None
+    next_run_at: Optional[datetime] = None
+    promotion_target: Optional[Dict[str, Any]] = None
+    output_sinks: Optional[List[Dict[str, Any]]] = None
     is_active: bool
     created_at: datetime
     updated_at: datetime
@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any, List, Literal
+from datetime import datetime
+from app.models.pipeline import PipelineRunStatus
+from app.schemas.processing import TransformationRuleCreate
+
+class PipelineStep(BaseModel):
+    name: str
+    step_type: Literal["transform", "promote"] = "transform"
+    depends_on: List[str] = []
+    # The dependency whose output this step reads; defaults to the only dependency,
+    # or the run's input job for steps without dependencies.
+    input: Optional[str] = None
+    rules: List[TransformationRuleCreate] = []
+
+class PipelineCreate(BaseModel):
+    name: str
+    description: Optional[str] = None
+    source_id: int
+    steps: List[PipelineStep]
+
+class PipelineUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    steps: Optional[List[PipelineStep]] = None
+    is_active: Optional[bool] = None
+
+class PipelineResponse(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    source_id: int
+    steps: List[Dict[str, Any]]
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class PipelineRunCreate(BaseModel):
+    input_job_id: Optional[int] = None
+
+class PipelineRunResponse(BaseModel):
+    id: int
+    pipeline_id: int
+    status: PipelineRunStatus
+    input_job_id: Optional[int]
+    step_states: Dict[str, Any]
+    timing: Optional[Dict[str, Any]] = None
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
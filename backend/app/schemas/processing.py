@@ -8,6 +8,12 @@ class TransformationRuleCreate(BaseModel):
     parameters: Dict[str, Any]
     description: Optional[str] = None
 
+class TransformationPreviewRequest(BaseModel):
+    rules: List[TransformationRuleCreate]
+    head_rows: int = 50
+    sample_rows: int = 450
+    seed: int = 0
+
 class ProcessingJobResponse(BaseModel):
     id: int
     name: str
@@ -19,6 +25,8 @@ class ProcessingJobResponse(BaseModel):
     created_at: datetime
     transformation_rules: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
+    progress: Optional[Dict[str, Any]] = None
+    cancel_requested_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
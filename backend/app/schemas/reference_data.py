@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any, List
+from datetime import datetime
+
+class ReferenceDatasetCreate(BaseModel):
+    name: str
+    description: Optional[str] = None
+    key_columns: List[str]
+    data: List[Dict[str, Any]]
+
+class ReferenceDatasetUpdate(BaseModel):
+    description: Optional[str] = None
+    key_columns: Optional[List[str]] = None
+    data: Optional[List[Dict[str, Any]]] = None
+
+class ReferenceDatasetResponse(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    key_columns: List[str]
+    row_count: int
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,105 @@
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, Dict, Any, List, Literal, Union
+from app.services.expression_compiler import compile_expression
+
+OnError = Optional[Literal["quarantine", "coerce", "fail"]]
+
+class RuleParameters(BaseModel):
+    class Config:
+        extra = "forbid"
+
+class RemoveDuplicatesParameters(RuleParameters):
+    subset_columns: Optional[List[str]] = None
+    keep: Literal["first", "last"] = "first"
+    cross_batch: bool = False
+    ttl_days: Optional[int] = Field(None, ge=0)
+    max_entries: Optional[int] = Field(None, gt=0)
+
+class HandleNullsParameters(RuleParameters):
+    strategy: Literal["drop", "fill", "forward_fill"] = "drop"
+    columns: Optional[List[str]] = None
+    fill_value: Any = None
+
+class NormalizeTextParameters(RuleParameters):
+    columns: List[str] = []
+    operations: List[Literal["lower", "upper", "strip", "remove_special_chars"]] = ["lower", "strip"]
+
+class ValidateDataTypesParameters(RuleParameters):
+    type_mappings: Dict[str, Literal["int", "float", "datetime", "string"]] = {}
+    on_error: OnError = None
+
+class FilterCondition(BaseModel):
+    column: str
+    operator: Literal["equals", "not_equals", "greater_than", "less_than", "contains", "not_null", "is_null"]
+    value: Any = None
+
+class FilterRowsParameters(RuleParameters):
+    conditions: List[FilterCondition] = []
+    on_error: OnError = None
+
+class AggregateDataParameters(RuleParameters):
+    group_by: List[str] = []
+    aggregations: Dict[str, Any] = {}
+
+class ExpressionParameters(RuleParameters):
+    expressions: Dict[str, str] = {}
+    column: Optional[str] = None
+    expression: Optional[str] = None
+    on_error: OnError = None
+
+    @model_validator(mode="after")
+    def compile_expressions(self):
+        expressions = dict(self.expressions)
+        if self.column and self.expression:
+            expressions[self.column] = self.expression
+        if not expressions:
+            raise ValueError("expression rule requires 'expressions' or 'column' and 'expression'")
+        # Syntax errors surface when the rule set is compiled, before any data is read.
+        for expression in expressions.values():
+            compile_expression(expression)
+        return self
+
+class LookupParameters(RuleParameters):
+    dataset: str
+    on: Union[str, List[str]]
+    columns: Optional[List[str]] = None
+    prefix: str = ""
+    how: Literal["left", "inner"] = "left"
+
+class OptimizeDtypesParameters(RuleParameters):
+    pass
+
+class SortParameters(RuleParameters):
+    by: Union[str, List[str]]
+    ascending: Union[bool, List[bool]] = True
+
+class TopNParameters(RuleParameters):
+    by: Union[str, List[str]]
+    n: int = Field(..., ge=0)
+    ascending: Union[bool, List[bool]] = False
+
+class FuzzyDedupParameters(RuleParameters):
+    columns: Union[str, List[str]]
+    threshold: float = Field(0.85, ge=0, le=1)
+    blocking: Optional[List[Literal["soundex", "sorted_token", "ngram"]]] = None
+    weights: Optional[Dict[str, float]] = None
+    max_block_size: int = Field(1000, gt=1)
+    action: Literal["drop", "mark"] = "drop"
+    cluster_column: str = "match_cluster"
+
+    @field_validator("columns")
+    @classmethod
+    def require_columns(cls, columns):
+        if not columns:
+            raise ValueError("fuzzy_dedup rule requires 'columns'")
+        return columns
+
+    @model_validator(mode="after")
+    def weights_are_usable(self):
+        if self.weights is not None:
+            columns = [self.columns] if isinstance(self.columns, str) else self.columns
+            if any(weight < 0 for weight in self.weights.values()):
+                raise ValueError("fuzzy_dedup 'weights' must not be negative")
+            if sum(self.weights.get(column, 0.0) for column in columns) <= 0:
+                raise ValueError("fuzzy_dedup 'weights' must give the match columns a total weight above zero")
+        return self
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 from datetime import datetime
 from app.models.workflow import WorkflowState, ApprovalType
 
@@ -7,6 +7,14 @@ class ApprovalRequest(BaseModel):
     approval_type: ApprovalType
     comments: Optional[str] = None
 
+class BulkApprovalRequest(BaseModel):
+    approval_ids: List[int] = Field(..., min_length=1)
+    comments: Optional[str] = None
+
+class BulkRejectionRequest(BaseModel):
+    approval_ids: List[int] = Field(..., min_length=1)
+    comments: str
+
 class WorkflowApprovalResponse(BaseModel):
     id: int
     job_id: int
@@ -0,0 +1,195 @@
+import re
+import json
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+import numpy as np
+import pandas as pd
+from app.models.exception import ExceptionSeverity
+from app.services.expression_compiler import compile_expression, ExpressionError
+
+CONSTRAINT_TYPES = ("not_null", "unique", "range", "regex", "allowed_values", "reference", "cross_column")
+SAMPLE_SIZE = 5
+
+
+class Constraint:
+    def __init__(self, definition: Dict[str, Any]):
+        self.type = definition.get("type")
+        if self.type not in CONSTRAINT_TYPES:
+            raise ValueError(f"Unknown constraint type: {self.type}")
+
+        columns = definition.get("columns") or ([definition["column"]] if definition.get("column") else [])
+        self.columns: List[str] = list(columns)
+        self.definition = definition
+        self.severity = ExceptionSeverity(definition.get("severity", "medium"))
+
+        self.pattern = None
+        self.expression = None
+        if self.type == "cross_column":
+            if not definition.get("expression"):
+                raise ValueError("cross_column constraints require an 'expression'")
+            self.expression = compile_expression(definition["expression"])
+            self.columns = list(self.expression.columns)
+        elif not self.columns:
+            raise ValueError(f"{self.type} constraints require 'column' or 'columns'")
+
+        if self.type == "regex":
+            if not definition.get("pattern"):
+                raise ValueError("regex constraints require a 'pattern'")
+            try:
+                self.pattern = re.compile(definition["pattern"])
+            except re.error as e:
+                raise ValueError(f"Invalid regex pattern '{definition['pattern']}': {e}") from e
+        elif self.type == "range" and definition.get("min") is None and definition.get("max") is None:
+            raise ValueError("range constraints require 'min' and/or 'max'")
+        elif self.type == "allowed_values" and not definition.get("values"):
+            raise ValueError("allowed_values constraints require 'values'")
+        elif self.type == "reference" and not definition.get("dataset"):
+            raise ValueError("reference constraints require a 'dataset'")
+
+        self.name = definition.get("name") or f"{self.type}:{','.join(self.columns)}"
+
+
+class ConstraintSuite:
+    """A data source's constraints, compiled once and evaluated as vectorised masks."""
+
+    def __init__(self, definitions: List[Dict[str, Any]]):
+        self.constraints = [Constraint(definition) for definition in definitions]
+
+    @property
+    def reference_datasets(self) -> List[str]:
+        return sorted({c.definition["dataset"] for c in self.constraints if c.type == "reference"})
+
+    async def evaluate(self, df: pd.DataFrame, reference_data_service=None) -> List[Dict[str, Any]]:
+        # Conversions shared by several constraints on the same column are computed once.
+        numeric: Dict[str, pd.Series] = {}
+        results = []
+        for constraint in self.constraints:
+            missing = [column for column in constraint.columns if column not in df.columns]
+            if missing:
+                results.append(self._result(constraint, df, None, error=f"Columns not found: {missing}"))
+                continue
+            failing = await self._failing_mask(constraint, df, reference_data_service, numeric)
+            results.append(self._result(constraint, df, failing))
+        return results
+
+    async def _failing_mask(
+        self,
+        constraint: Constraint,
+        df: pd.DataFrame,
+        reference_data_service,
+        numeric: Dict[str, pd.Series]
+    ) -> np.ndarray:
+        definition = constraint.definition
+
+        if constraint.type == "not_null":
+            return df[constraint.columns].isna().any(axis=1).to_numpy()
+
+        if constraint.type == "unique":
+            subset = df[constraint.columns]
+            # Nulls are the not_null constraint's business, not duplicates.
+            return (subset.duplicated(keep=False) & subset.notna().all(axis=1)).to_numpy()
+
+        if constraint.type == "cross_column":
+            return ~constraint.expression(df).fillna(False).astype(bool).to_numpy()
+
+        if constraint.type == "reference":
+            if reference_data_service is None:
+                raise ValueError("reference constraints need the reference data service")
+            reference = await reference_data_service.get_frame(definition["dataset"])
+            keys = df[constraint.columns]
+            present = keys.notna().all(axis=1).to_numpy()
+            return present & (reference.positions(keys) < 0)
+
+        failing = np.zeros(len(df), dtype=bool)
+        for column in constraint.columns:
+            failing |= self._column_failures(constraint, df[column], column, numeric)
+        return failing
+
+    def _column_failures(
+        self,
+        constraint: Constraint,
+        series: pd.Series,
+        column: str,
+        numeric: Dict[str, pd.Series]
+    ) -> np.ndarray:
+        definition = constraint.definition
+        present = series.notna().to_numpy()
+
+        if constraint.type == "range":
+            values = self._numeric_values(series, column, definition, numeric)
+            failing = present & values.isna().to_numpy()
+            if definition.get("min") is not None:
+                failing |= (values < definition["min"]).to_numpy()
+            if definition.get("max") is not None:
+                failing |= (values > definition["max"]).to_numpy()
+            return failing
+
+        if constraint.type == "allowed_values":
+            return present & ~series.isin(definition["values"]).to_numpy()
+
+        # regex: match each distinct value once; identifiers and codes repeat heavily.
+        codes, uniques = pd.factorize(series)
+        matches = np.fromiter(
+            (constraint.pattern.fullmatch(str(value)) is not None for value in uniques),
+            dtype=bool,
+            count=len(uniques)
+        )
+        return present & ~np.append(matches, True)[codes]
+
+    def _numeric_values(
+        self,
+        series: pd.Series,
+        column: str,
+        definition: Dict[str, Any],
+        numeric: Dict[str, pd.Series]
+    ) -> pd.Series:
+        bound = definition.get("min") if definition.get("min") is not None else definition.get("max")
+        if not isinstance(bound, (int, float)):
+            # Dates and other ordered values are compared as they are.
+            return series
+        if column not in numeric:
+            numeric[column] = series if pd.api.types.is_numeric_dtype(series) else pd.to_numeric(series, errors="coerce")
+        return numeric[column]
+
+    def _result(self, constraint: Constraint, df: pd.DataFrame, failing: Optional[np.ndarray], error: str = None) -> Dict[str, Any]:
+        result = {
+            "name": constraint.name,
+            "type": constraint.type,
+            "columns": constraint.columns,
+            "severity": constraint.severity.value,
+            "failed_count": 0,
+            "failed_ratio": 0.0,
+            "passed": error is None,
+            "error": error,
+            "sample_failures": []
+        }
+        if failing is None:
+            return result
+
+        failed_count = int(failing.sum())
+        positions = np.flatnonzero(failing)[:SAMPLE_SIZE]
+        samples = df.iloc[positions]
+        result.update({
+            "failed_count": failed_count,
+            "failed_ratio": round(failed_count / len(df), 6) if len(df) else 0.0,
+            "passed": failed_count == 0,
+            "sample_failures": [
+                {"row": str(index), "values": row}
+                for index, row in zip(samples.index, json.loads(samples.to_json(
+                    orient="records", date_format="iso", default_handler=str
+                )))
+            ]
+        })
+        return result
+
+
+@lru_cache(maxsize=256)
+def _compile_suite(definitions_json: str) -> ConstraintSuite:
+    return ConstraintSuite(json.loads(definitions_json))
+
+
+def compile_constraints(definitions: List[Dict[str, Any]]) -> ConstraintSuite:
+    try:
+        return _compile_suite(json.dumps(definitions, sort_keys=True, default=str))
+    except ExpressionError as e:
+        raise ValueError(str(e)) from e
@@ -1,10 +1,36 @@
-from typing import Dict, Any, List
+import time
+import random
+from typing import Dict, Any, List, Optional
+import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
-from app.models.processing_job import ProcessingJob, JobStatus
+from app.models.processing_job import ProcessingJob, JobStatus, job_payload
+from app.models.data_source import DataSource
 from app.schemas.processing import TransformationRuleCreate
 from app.services.lineage_service import DataLineageService
 from app.services.exception_service import ExceptionService
+from app.services.dedup_index import DedupIndex
+from app.services.transformation_cache import TransformationCache
+from app.services.dataframe_profile import profile_dataframe
+from app.services.expression_compiler import compile_expression, ExpressionError
+from app.services.reference_data_service import ReferenceDataService
+from app.services.datetime_parsing import parse_datetime_column, summarize_invalid_dates
+from app.services.memory_optimizer import optimize_dtypes
+from app.services.rule_profiler import RuleProfiler
+from app.services.job_progress import JobProgress, JobCancelledError
+from app.services.job_lease import LeaseLostError
+from app.services.rule_registry import rule_registry, CompiledRuleSet
+from app.schemas.rule_parameters import (
+    RemoveDuplicatesParameters, HandleNullsParameters, NormalizeTextParameters, ValidateDataTypesParameters,
+    FilterRowsParameters, AggregateDataParameters, ExpressionParameters, LookupParameters,
+    OptimizeDtypesParameters, SortParameters, TopNParameters, FuzzyDedupParameters
+)
+from app.services import quarantine
+from app.services.constraint_engine import compile_constraints
+from app.services.sorting import sort_frame, top_n
+from app.services.fuzzy_matching import find_clusters, describe_clusters
+from app.models.exception import ExceptionSeverity
+from app.core.config import settings
 from datetime import datetime
 
 class DataProcessingService:
@@ -12,89 +38,183 @@ class DataProcessingService:
         self.db = db
         self.lineage_service = DataLineageService(db)
         self.exception_service = ExceptionService(db)
-        self.cleaning_rules = {
-            'remove_duplicates': self._remove_duplicates,
-            'handle_nulls': self._handle_nulls,
-            'normalize_text': self._normalize_text,
-            'validate_data_types': self._validate_data_types,
-            'filter_rows': self._filter_rows,
-            'aggregate_data': self._aggregate_data
-        }
+        self.reference_data_service = ReferenceDataService(db)
+        self.result_cache = TransformationCache()
+        self.current_job = None
+        self.rule_outputs: Dict[str, Any] = {}
+        self._pending_dedup_indexes: List[DedupIndex] = []
+        self._pending_exceptions: List[Dict[str, Any]] = []
+        self._quarantine: List[pd.DataFrame] = []
 
     async def apply_transformation_rules(
         self, 
         job: ProcessingJob, 
-        transformation_rules: List[TransformationRuleCreate]
+        transformation_rules: List[TransformationRuleCreate],
+        capture_cprofile: bool = False,
+        progress: Optional[JobProgress] = None
     ) -> Dict[str, Any]:
+        # Raises RuleValidationError before the job is touched or any data is loaded.
+        compiled_rules = rule_registry.compile(transformation_rules)
+
+        self._reset_run_state(job)
+        profiler = None
+
         try:
             job.status = JobStatus.RUNNING
             job.started_at = datetime.utcnow()
             self.db.commit()
 
-            input_data = job.input_data
+            input_data = job_payload(job)
             if isinstance(input_data, dict) and "data" in input_data:
                 df = pd.DataFrame(input_data["data"])
             else:
                 df = pd.DataFrame(input_data)
 
-            original_schema = await self._get_dataframe_schema(df)
+            constraints = await self._load_constraints(job)
 
-            for rule in transformation_rules:
-                if rule.rule_type in self.cleaning_rules:
-                    df = await self.cleaning_rules[rule.rule_type](df, rule.parameters)
-                else:
-                    await self.exception_service.report_exception(
-                        job_id=job.id,
-                        exception_type="unknown_transformation_rule",
-                        message=f"Unknown transformation rule: {rule.rule_type}",
-                        severity="medium"
-                    )
+            cache_key = None
+            cached = None
+            if settings.transform_cache_enabled and compiled_rules.cacheable:
+                cache_key = self.result_cache.key(
+                    TransformationCache.input_hash(df),
+                    TransformationCache.rules_hash(await self._cache_rules_payload(compiled_rules, constraints, job.source_id))
+                )
+                cached = self.result_cache.get(cache_key)
 
-            processed_schema = await self._get_dataframe_schema(df)
-            
-            validation_results = await self._validate_processed_data(df)
+            capture_cprofile = capture_cprofile or random.random() < settings.rule_cprofile_sample_rate
+            profiler = RuleProfiler(
+                trace_memory=settings.rule_profile_trace_memory,
+                capture_cprofile=capture_cprofile
+            )
+
+            if cached:
+                df = cached["processed_df"]
+                original_schema = cached["original_schema"]
+                original_row_count = original_schema["row_count"]
+                processed_schema = cached["processed_schema"]
+                validation_results = cached["validation_results"]
+                self.rule_outputs = cached["rule_outputs"]
+                self._pending_exceptions = [
+                    {**exception, "job_id": job.id} for exception in cached.get("exceptions", [])
+                ]
+                self._quarantine = cached.get("quarantine", [])
+            else:
+                original_schema = await self._get_dataframe_schema(df)
+                original_row_count = len(df)
+
+                if progress is not None:
+                    # Each rule is one chunk of the job; a cancel request stops it between rules.
+                    progress.start("transform", rows_total=len(df) * len(compiled_rules), chunks_total=len(compiled_rules))
+                with profiler:
+                    for rule in compiled_rules:
+                        rows_in = len(df)
+                        df = await profiler.run(rule.rule_type, rule.bind(self), df, rule.parameters)
+                        if progress is not None:
+                            progress.advance(rows=rows_in)
+
+                    if settings.auto_optimize_dtypes and "memory_optimization" not in self.rule_outputs:
+                        # Runs after every rule so categoricals never reach a rule that writes new values.
+                        df = await profiler.run("optimize_dtypes", self._optimize_dtypes, df, {})
+                    else:
+                        profile_dataframe(df, refresh=True)
+                processed_schema = await self._get_dataframe_schema(df)
+
+                validation_results = await self._validate_processed_data(df, constraints)
+
+                if cache_key:
+                    self.result_cache.put(cache_key, {
+                        "processed_df": df,
+                        "original_schema": original_schema,
+                        "processed_schema": processed_schema,
+                        "validation_results": validation_results,
+                        "rule_outputs": self.rule_outputs,
+                        "exceptions": self._pending_exceptions,
+                        "quarantine": self._quarantine
+                    })
+
+            quarantine_summary = self._record_quarantine(job.id)
+
+            await self.exception_service.report_exceptions_bulk(self._pending_exceptions)
 
             await self.lineage_service.track_transformation(
                 job_id=job.id,
                 transformation_rules=[rule.rule_type for rule in transformation_rules],
                 input_schema=original_schema,
-                output_schema=processed_schema
+                output_schema=processed_schema,
+                metadata={
+                    "cache_hit": cached is not None,
+                    "cache_key": cache_key
+                }
             )
 
             result = {
                 "processed_data": df.to_dict('records'),
                 "validation_results": validation_results,
                 "row_count": len(df),
-                "original_row_count": len(pd.DataFrame(input_data.get("data", input_data))),
+                "original_row_count": original_row_count,
                 "transformation_summary": {
                     "rules_applied": len(transformation_rules),
                     "rules_list": [rule.rule_type for rule in transformation_rules]
-                }
+                },
+                "rule_outputs": self.rule_outputs,
+                "quarantine": quarantine_summary
             }
 
             job.status = JobStatus.COMPLETED
             job.completed_at = datetime.utcnow()
             job.output_data = result
+            job.execution_profile = {
+                **profiler.report(),
+                "cache_hit": cached is not None,
+                "input_row_count": original_row_count,
+                "output_row_count": len(df)
+            }
             job.transformation_rules = {
                 "rules": [rule.dict() for rule in transformation_rules],
                 "applied_at": datetime.utcnow().isoformat()
             }
-            
+            if progress is not None:
+                progress.confirm(self.db)
             self.db.commit()
 
+            for dedup_index in self._pending_dedup_indexes:
+                dedup_index.commit()
+            if progress is not None:
+                progress.finish()
+
             return result
 
+        except LeaseLostError:
+            # The job belongs to another worker now: leave its state to them.
+            self.db.rollback()
+            raise
+
+        except JobCancelledError as e:
+            # Nothing of the run is kept: pending dedup keys and quarantined rows are dropped with it.
+            self.db.rollback()
+            job.status = JobStatus.CANCELLED
+            job.error_message = str(e)
+            job.completed_at = datetime.utcnow()
+            if profiler is not None:
+                job.execution_profile = profiler.report()
+            self.db.commit()
+            return {"status": "cancelled"}
+
         except Exception as e:
+            # A failed flush leaves the session unusable until it is rolled back.
+            self.db.rollback()
             job.status = JobStatus.FAILED
             job.error_message = str(e)
             job.completed_at = datetime.utcnow()
+            if profiler is not None:
+                job.execution_profile = profiler.report()
             self.db.commit()
 
             await self.exception_service.report_exception(
                 job_id=job.id,
                 exception_type="transformation_error",
                 message=str(e),
-                severity="high"
+                severity=ExceptionSeverity.HIGH
             )
 
             return {
@@ -102,14 +222,186 @@ class DataProcessingService:
                 "error": str(e)
             }
 
-    async def retry_job(self, job: ProcessingJob) -> ProcessingJob:
+    async def preview_transformation_rules(
+        self,
+        job: ProcessingJob,
+        transformation_rules: List[TransformationRuleCreate],
+        head_rows: int = 50,
+        sample_rows: int = 450,
+        seed: int = 0
+    ) -> Dict[str, Any]:
+        compiled_rules = rule_registry.compile(transformation_rules)
+        started = time.perf_counter()
+        self._reset_run_state(job)
+
+        df, total_rows = self._sample_input(job_payload(job), head_rows, sample_rows, seed)
+        sample_size = len(df)
+
+        profiler = RuleProfiler()
+        with profiler:
+            for rule in compiled_rules:
+                df = await profiler.run(rule.rule_type, rule.bind(self), df, rule.parameters)
+
+        # Preview never persists dedup keys, job state or lineage.
+        self._pending_dedup_indexes = []
+
+        return {
+            "rows": df.astype(object).where(df.notna(), None).to_dict('records'),
+            "columns": [str(column) for column in df.columns],
+            "total_row_count": total_rows,
+            "sample_row_count": sample_size,
+            "output_sample_row_count": len(df),
+            "estimated_output_row_count": round(len(df) / sample_size * total_rows) if sample_size else 0,
+            "quarantine": quarantine.summarize(self._quarantine),
+            "rule_timings": profiler.entries,
+            "rule_outputs": self.rule_outputs,
+            "data_issues": [
+                {key: issue[key] for key in ("exception_type", "message", "metadata")}
+                for issue in self._pending_exceptions
+            ],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    async def summarize_rule_profiles(self, limit: int = 1000) -> Dict[str, Any]:
+        jobs = self.db.query(ProcessingJob.execution_profile).filter(
+            ProcessingJob.execution_profile.isnot(None)
+        ).order_by(ProcessingJob.id.desc()).limit(limit).all()
+
+        rules: Dict[str, Dict[str, Any]] = {}
+        for (profile,) in jobs:
+            for entry in profile.get("rules", []):
+                stats = rules.setdefault(entry["rule_type"], {
+                    "runs": 0, "failures": 0, "total_wall_ms": 0.0, "max_wall_ms": 0.0,
+                    "total_cpu_ms": 0.0, "rows_in": 0
+                })
+                stats["runs"] += 1
+                stats["failures"] += int(bool(entry.get("failed")))
+                stats["total_wall_ms"] += entry["wall_ms"]
+                stats["max_wall_ms"] = max(stats["max_wall_ms"], entry["wall_ms"])
+                stats["total_cpu_ms"] += entry["cpu_ms"]
+                stats["rows_in"] += entry["rows_in"]
+
+        for stats in rules.values():
+            stats["avg_wall_ms"] = round(stats["total_wall_ms"] / stats["runs"], 3)
+            stats["ms_per_1k_rows"] = round(stats["total_wall_ms"] / stats["rows_in"] * 1000, 3) if stats["rows_in"] else None
+            stats["total_wall_ms"] = round(stats["total_wall_ms"], 3)
+            stats["total_cpu_ms"] = round(stats["total_cpu_ms"], 3)
+
+        return {
+            "jobs_sampled": len(jobs),
+            "rules": dict(sorted(rules.items(), key=lambda item: item[1]["total_wall_ms"], reverse=True))
+        }
+
+    def _reset_run_state(self, job: ProcessingJob):
+        self.current_job = job
+        self.rule_outputs = {}
+        self._pending_dedup_indexes = []
+        self._pending_exceptions = []
+        self._quarantine = []
+
+    def _on_error(self, parameters: Dict[str, Any]) -> str:
+        on_error = parameters.get("on_error") or ("quarantine" if settings.quarantine_invalid_rows else "coerce")
+        if on_error not in ("quarantine", "coerce", "fail"):
+            raise ValueError(f"Unknown on_error mode: {on_error}")
+        return on_error
+
+    def _split_invalid_rows(
+        self,
+        df: pd.DataFrame,
+        invalid: pd.Series,
+        on_error: str,
+        reason: str,
+        rule_type: str,
+        column: str = None
+    ) -> pd.DataFrame:
+        if on_error != "quarantine" or not invalid.any():
+            return df
+        self._quarantine.append(quarantine.tag_rows(df[invalid], reason, rule_type, column))
+        return df[~invalid].copy()
+
+    def _record_quarantine(self, job_id: int) -> Dict[str, Any]:
+        summary = quarantine.summarize(self._quarantine)
+        if not summary:
+            return {"row_count": 0, "path": None, "reasons": {}}
+
+        path = quarantine.write_quarantine(job_id, self._quarantine)
+        for reason, details in summary.items():
+            self._pending_exceptions.append({
+                "job_id": job_id,
+                "exception_type": "quarantined_rows",
+                "message": f"{details['row_count']} rows quarantined: {reason}",
+                "severity": ExceptionSeverity.MEDIUM,
+                "metadata": {"reason": reason, "quarantine_path": path, **details}
+            })
+
+        return {
+            "row_count": sum(details["row_count"] for details in summary.values()),
+            "path": path,
+            "reasons": {reason: details["row_count"] for reason, details in summary.items()}
+        }
+
+    def _sample_input(self, input_data: Any, head_rows: int, sample_rows: int, seed: int):
+        records = input_data.get("data", input_data) if isinstance(input_data, dict) else input_data
+        if not isinstance(records, list):
+            records = pd.DataFrame(records).to_dict('records')
+
+        total_rows = len(records)
+        head_rows = max(0, min(head_rows, total_rows, settings.preview_max_rows))
+        sample_rows = max(0, min(sample_rows, total_rows - head_rows, settings.preview_max_rows - head_rows))
+
+        # First N rows for the analyst's eye plus a seeded random sample of the rest,
+        # so the same request always previews the same rows.
+        positions = np.arange(head_rows)
+        if sample_rows:
+            rng = np.random.default_rng(seed)
+            tail = head_rows + np.sort(rng.choice(total_rows - head_rows, size=sample_rows, replace=False))
+            positions = np.concatenate([positions, tail])
+
+        return pd.DataFrame([records[i] for i in positions]), total_rows
+
+    async def _cache_rules_payload(
+        self,
+        compiled_rules: CompiledRuleSet,
+        constraints: List[Dict[str, Any]] = None,
+        source_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        payload = compiled_rules.payload()
+        # Settings that rules fall back on, and the source whose learned datetime formats they use.
+        payload.append({"rule_type": "defaults", "parameters": {
+            "source_id": source_id,
+            "on_error": self._on_error({}),
+            "auto_optimize_dtypes": settings.auto_optimize_dtypes
+        }})
+        if constraints:
+            # Constraint results are part of the cached validation, so they key the entry too.
+            payload.append({"rule_type": "constraints", "parameters": constraints})
+
+        # Lookups depend on the reference data too, so a new dataset version is a new cache entry.
+        datasets = {rule.parameters["dataset"] for rule in compiled_rules if rule.rule_type == "lookup"}
+        if constraints:
+            datasets.update(compile_constraints(constraints).reference_datasets)
+        versions = {
+            dataset: await self.reference_data_service.get_version(dataset)
+            for dataset in sorted(datasets)
+        }
+        if versions:
+            payload.append({"rule_type": "reference_versions", "parameters": versions})
+        return payload
+
+    async def retry_job(self, job: ProcessingJob, retry_reason: str = "manual_retry") -> ProcessingJob:
         new_job = ProcessingJob(
-            name=f"Retry - {job.name}",
+            name=f"Retry - {job.root_job.name if job.root_job else job.name}",
             description=f"Retry of job {job.id}",
             source_id=job.source_id,
+            job_type=job.job_type,
             status=JobStatus.PENDING,
-            input_data=job.input_data,
+            # The payload stays on the first job of the chain; retries only reference it.
+            root_job_id=job.root_job_id or job.id,
+            retry_of_id=job.id,
+            retry_count=(job.retry_count or 0) + 1,
             transformation_rules=job.transformation_rules,
+            lane=job.lane,
+            priority=job.priority,
             created_by=job.created_by
         )
         
@@ -122,22 +414,103 @@ class DataProcessingService:
             job_id=new_job.id,
             metadata={
                 "retry_of_job": job.id,
-                "retry_reason": "manual_retry",
+                "root_job": new_job.root_job_id,
+                "retry_count": new_job.retry_count,
+                "retry_reason": retry_reason,
                 "original_error": job.error_message
             }
         )
 
         return new_job
 
+    @rule_registry.rule(
+        "remove_duplicates",
+        RemoveDuplicatesParameters,
+        # Cross-batch dedup depends on the persistent index, not just on the input and rules.
+        cacheable=lambda parameters: not parameters["cross_batch"],
+        incremental="row"
+    )
     async def _remove_duplicates(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
         subset_columns = parameters.get("subset_columns")
         keep = parameters.get("keep", "first")
         
         if subset_columns:
-            return df.drop_duplicates(subset=subset_columns, keep=keep)
+            df = df.drop_duplicates(subset=subset_columns, keep=keep)
+        else:
+            df = df.drop_duplicates(keep=keep)
+
+        if parameters.get("cross_batch"):
+            df = await self._remove_previously_loaded(df, subset_columns, parameters)
+
+        return df
+
+    async def _remove_previously_loaded(
+        self,
+        df: pd.DataFrame,
+        subset_columns: List[str],
+        parameters: Dict[str, Any]
+    ) -> pd.DataFrame:
+        if not self.current_job or self.current_job.source_id is None:
+            raise ValueError("Cross-batch deduplication requires a job linked to a data source")
+
+        dedup_index = DedupIndex(
+            source_id=self.current_job.source_id,
+            key_columns=subset_columns,
+            ttl_days=parameters.get("ttl_days"),
+            max_entries=parameters.get("max_entries")
+        ).load()
+
+        row_hashes = DedupIndex.hash_rows(df, subset_columns)
+        seen = dedup_index.contains(row_hashes)
+        dedup_index.add(row_hashes[~seen])
+        self._pending_dedup_indexes.append(dedup_index)
+
+        stats = self.rule_outputs.setdefault("cross_batch_dedup", {"rows_checked": 0, "rows_removed": 0})
+        stats["rows_checked"] += len(df)
+        stats["rows_removed"] += int(seen.sum())
+
+        return df[~seen]
+
+    @rule_registry.rule("fuzzy_dedup", FuzzyDedupParameters)
+    async def _fuzzy_dedup(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+        columns = parameters["columns"]
+        if isinstance(columns, str):
+            columns = [columns]
+        action = parameters.get("action", "drop")
+
+        labels, stats = find_clusters(
+            df,
+            columns,
+            threshold=float(parameters.get("threshold", 0.85)),
+            blocking=parameters.get("blocking"),
+            weights=parameters.get("weights"),
+            max_block_size=int(parameters.get("max_block_size", 1000))
+        )
+        clusters = describe_clusters(df, labels, columns)
+
+        rows_before = len(df)
+        if action == "mark":
+            df[parameters.get("cluster_column", "match_cluster")] = pd.Series(labels, index=df.index).where(labels >= 0)
         else:
-            return df.drop_duplicates(keep=keep)
+            # Keep the first row of each cluster; unmatched rows all stay.
+            label_series = pd.Series(labels, index=df.index)
+            df = df[(labels < 0) | ~label_series.duplicated(keep="first").to_numpy()]
 
+        self.rule_outputs["fuzzy_matches"] = {
+            **stats,
+            "cluster_count": int(len(np.unique(labels[labels >= 0]))),
+            "rows_in_clusters": int((labels >= 0).sum()),
+            "rows_removed": rows_before - len(df),
+            "clusters": clusters
+        }
+        return df
+
+    @rule_registry.rule(
+        "handle_nulls",
+        HandleNullsParameters,
+        # Forward fill carries values across rows, so it needs the rows before the delta.
+        incremental=lambda parameters: None if parameters["strategy"] == "forward_fill" else "row"
+    )
     async def _handle_nulls(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
         strategy = parameters.get("strategy", "drop")
         columns = parameters.get("columns")
@@ -165,6 +538,7 @@ class DataProcessingService:
         else:
             return df
 
+    @rule_registry.rule("normalize_text", NormalizeTextParameters, incremental="row")
     async def _normalize_text(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
         columns = parameters.get("columns", [])
         operations = parameters.get("operations", ["lower", "strip"])
@@ -182,27 +556,80 @@ class DataProcessingService:
 
         return df
 
+    @rule_registry.rule("validate_data_types", ValidateDataTypesParameters, incremental="row")
     async def _validate_data_types(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
         type_mappings = parameters.get("type_mappings", {})
-        
+        on_error = self._on_error(parameters)
+
         for column, target_type in type_mappings.items():
-            if column in df.columns:
-                try:
-                    if target_type == "int":
-                        df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int64')
-                    elif target_type == "float":
-                        df[column] = pd.to_numeric(df[column], errors='coerce')
-                    elif target_type == "datetime":
-                        df[column] = pd.to_datetime(df[column], errors='coerce')
-                    elif target_type == "string":
-                        df[column] = df[column].astype(str)
-                except Exception:
-                    pass
+            if column not in df.columns:
+                continue
+
+            series = df[column]
+            date_format = None
+            if target_type in ("int", "float"):
+                converted = pd.to_numeric(series, errors='coerce')
+                invalid = series.notna() & converted.isna()
+                if target_type == "int":
+                    invalid |= converted.notna() & (converted % 1 != 0)
+                if invalid.any() and series.dtype == object:
+                    # Blank strings are missing values, not bad numbers.
+                    invalid &= series.astype(str).str.strip() != ""
+                converted = converted.where(~invalid)
+                if target_type == "int":
+                    converted = converted.astype('Int64')
+            elif target_type == "datetime":
+                source_id = self.current_job.source_id if self.current_job else None
+                converted, invalid, date_format = parse_datetime_column(series, source_id=source_id, column=column)
+            elif target_type == "string":
+                df[column] = series.astype(str)
+                continue
+            else:
+                continue
+
+            if invalid.any():
+                if on_error == "fail":
+                    raise ValueError(
+                        f"{int(invalid.sum())} values in column '{column}' are not valid {target_type} values"
+                    )
+                if on_error == "coerce":
+                    self._report_coerced_values(series, invalid, column, target_type, date_format)
+
+            df = self._split_invalid_rows(df, invalid, on_error, f"invalid_{target_type}", "validate_data_types", column)
+            df[column] = converted
 
         return df
 
+    def _report_coerced_values(
+        self,
+        series: pd.Series,
+        invalid: pd.Series,
+        column: str,
+        target_type: str,
+        date_format: str = None
+    ):
+        if target_type == "datetime":
+            exception_type = "invalid_date_format"
+            message = f"{int(invalid.sum())} values in column '{column}' could not be parsed as dates"
+        else:
+            exception_type = f"invalid_{target_type}_value"
+            message = f"{int(invalid.sum())} values in column '{column}' could not be converted to {target_type}"
+
+        metadata = {"column": column, **summarize_invalid_dates(series, invalid)}
+        if target_type == "datetime":
+            metadata["inferred_format"] = date_format
+        self._pending_exceptions.append({
+            "job_id": self.current_job.id if self.current_job else None,
+            "exception_type": exception_type,
+            "message": message,
+            "severity": ExceptionSeverity.MEDIUM,
+            "metadata": metadata
+        })
+
+    @rule_registry.rule("filter_rows", FilterRowsParameters, incremental="row")
     async def _filter_rows(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
         conditions = parameters.get("conditions", [])
+        on_error = self._on_error(parameters)
         
         for condition in conditions:
             column = condition.get("column")
@@ -210,14 +637,26 @@ class DataProcessingService:
             value = condition.get("value")
             
             if column in df.columns:
+                if operator in ("greater_than", "less_than"):
+                    # Text that cannot be compared with a numeric bound used to raise mid-rule and fail the job.
+                    uncomparable = self._uncomparable_rows(df[column], value)
+                    if uncomparable.any() and on_error == "fail":
+                        raise ValueError(
+                            f"{int(uncomparable.sum())} values in column '{column}' cannot be compared with {value!r}"
+                        )
+                    df = self._split_invalid_rows(df, uncomparable, on_error, "filter_uncomparable", "filter_rows", column)
+                    numeric_bound = isinstance(value, (int, float)) and not isinstance(value, bool)
+                    # Numeric text ("5", "10") never compares with a number as-is, even when every value is valid.
+                    values = pd.to_numeric(df[column], errors='coerce') if numeric_bound and df[column].dtype == object else df[column]
+
                 if operator == "equals":
                     df = df[df[column] == value]
                 elif operator == "not_equals":
                     df = df[df[column] != value]
                 elif operator == "greater_than":
-                    df = df[df[column] > value]
+                    df = df[values > value]
                 elif operator == "less_than":
-                    df = df[df[column] < value]
+                    df = df[values < value]
                 elif operator == "contains":
                     df = df[df[column].astype(str).str.contains(str(value), na=False)]
                 elif operator == "not_null":
@@ -227,6 +666,12 @@ class DataProcessingService:
 
         return df
 
+    def _uncomparable_rows(self, series: pd.Series, value: Any) -> pd.Series:
+        if series.dtype != object or not isinstance(value, (int, float)) or isinstance(value, bool):
+            return pd.Series(False, index=series.index)
+        return series.notna() & pd.to_numeric(series, errors='coerce').isna()
+
+    @rule_registry.rule("aggregate_data", AggregateDataParameters, incremental="reducer")
     async def _aggregate_data(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
         group_by = parameters.get("group_by", [])
         aggregations = parameters.get("aggregations", {})
@@ -236,30 +681,132 @@ class DataProcessingService:
         else:
             return df
 
+    @rule_registry.rule("expression", ExpressionParameters, incremental="row")
+    async def _derive_columns(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+        expressions = dict(parameters.get("expressions", {}))
+        if parameters.get("column") and parameters.get("expression"):
+            expressions[parameters["column"]] = parameters["expression"]
+
+        on_error = self._on_error(parameters)
+
+        for column, expression in expressions.items():
+            evaluate = compile_expression(expression)
+            missing = [name for name in evaluate.columns if name not in df.columns]
+            if missing:
+                raise ExpressionError(f"Unknown columns {missing} in expression: {expression}")
+
+            try:
+                df[column] = evaluate(df)
+            except (ExpressionError, TypeError, ValueError, ArithmeticError):
+                if on_error == "fail":
+                    raise
+                failing = self._failing_rows(evaluate, df)
+                if failing.all():
+                    raise
+                if on_error == "quarantine":
+                    df = self._split_invalid_rows(df, failing, on_error, "expression_error", "expression", column)
+                    df[column] = evaluate(df)
+                else:
+                    df[column] = evaluate(df[~failing]).reindex(df.index)
+
+        return df
+
+    def _failing_rows(self, evaluate, df: pd.DataFrame) -> pd.Series:
+        # Expressions are row-wise, so bisecting isolates the bad rows in O(bad * log n) evaluations.
+        failing = np.zeros(len(df), dtype=bool)
+        pending = [(0, len(df))]
+        while pending:
+            start, stop = pending.pop()
+            try:
+                evaluate(df.iloc[start:stop])
+            except (ExpressionError, TypeError, ValueError, ArithmeticError):
+                if stop - start == 1:
+                    failing[start] = True
+                else:
+                    middle = (start + stop) // 2
+                    pending.extend([(start, middle), (middle, stop)])
+        return pd.Series(failing, index=df.index)
+
+    @rule_registry.rule("lookup", LookupParameters, incremental="row")
+    async def _lookup(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+        on = parameters.get("on")
+        if isinstance(on, str):
+            on = [on]
+        if not parameters.get("dataset") or not on:
+            raise ValueError("Lookup rule requires 'dataset' and 'on' parameters")
+
+        df, stats = await self.reference_data_service.lookup(
+            df,
+            dataset=parameters["dataset"],
+            on=on,
+            columns=parameters.get("columns"),
+            prefix=parameters.get("prefix", ""),
+            how=parameters.get("how", "left")
+        )
+        self.rule_outputs.setdefault("lookups", []).append(stats)
+        return df
+
+    @rule_registry.rule("optimize_dtypes", OptimizeDtypesParameters, incremental="row")
+    async def _optimize_dtypes(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+        profile_dataframe(df, refresh=True)
+        df, report = optimize_dtypes(df)
+        self.rule_outputs["memory_optimization"] = report
+        return df
+
+    async def _check_constraints(self, df: pd.DataFrame, constraints: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = await compile_constraints(constraints).evaluate(df, self.reference_data_service)
+
+        # One exception per failing constraint, carrying counts and samples, not one per row.
+        for result in results:
+            if result["passed"]:
+                continue
+            self._pending_exceptions.append({
+                "job_id": self.current_job.id if self.current_job else None,
+                "exception_type": "constraint_violation",
+                "message": (
+                    f"Constraint '{result['name']}' failed for {result['failed_count']} rows"
+                    if result["error"] is None else f"Constraint '{result['name']}' could not run: {result['error']}"
+                ),
+                "severity": ExceptionSeverity(result["severity"]),
+                "metadata": result
+            })
+        return results
+
+    @rule_registry.rule("sort", SortParameters)
+    async def _sort(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+        df, stats = sort_frame(
+            df,
+            by=parameters.get("by", []),
+            ascending=parameters.get("ascending", True)
+        )
+        self.rule_outputs["sort"] = stats
+        return df
+
+    @rule_registry.rule("top_n", TopNParameters, incremental="reducer")
+    async def _top_n(self, df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+        return top_n(df, by=parameters["by"], n=int(parameters["n"]), ascending=parameters.get("ascending", False))
+
     async def _get_dataframe_schema(self, df: pd.DataFrame) -> Dict[str, Any]:
-        schema = {
-            "columns": [],
-            "row_count": len(df)
-        }
-        
-        for column in df.columns:
-            col_info = {
-                "name": column,
-                "type": str(df[column].dtype),
-                "null_count": df[column].isnull().sum(),
-                "unique_count": df[column].nunique()
-            }
-            schema["columns"].append(col_info)
-        
-        return schema
+        return profile_dataframe(df).to_schema()
+
+    async def _load_constraints(self, job: ProcessingJob) -> List[Dict[str, Any]]:
+        if job.source_id is None:
+            return []
+        source = self.db.query(DataSource).filter(DataSource.id == job.source_id).first()
+        return list(source.constraints or []) if source else []
 
-    async def _validate_processed_data(self, df: pd.DataFrame) -> Dict[str, Any]:
+    async def _validate_processed_data(
+        self,
+        df: pd.DataFrame,
+        constraints: List[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        profile = profile_dataframe(df)
         validation_results = {
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "null_counts": df.isnull().sum().to_dict(),
-            "data_types": df.dtypes.astype(str).to_dict(),
-            "duplicate_rows": df.duplicated().sum(),
+            "total_rows": profile.row_count,
+            "total_columns": len(profile.columns),
+            "null_counts": profile.null_counts,
+            "data_types": profile.data_types,
+            "duplicate_rows": profile.duplicate_rows,
             "validation_passed": True,
             "issues": []
         }
@@ -268,9 +815,18 @@ class DataProcessingService:
             validation_results["issues"].append(f"Found {validation_results['duplicate_rows']} duplicate rows")
         
         high_null_columns = [col for col, count in validation_results["null_counts"].items() 
-                           if count > len(df) * 0.5]
+                           if count > profile.row_count * 0.5]
         if high_null_columns:
             validation_results["issues"].append(f"High null percentage in columns: {high_null_columns}")
+
+        if constraints:
+            validation_results["constraints"] = await self._check_constraints(df, constraints)
+            for result in validation_results["constraints"]:
+                if not result["passed"]:
+                    validation_results["issues"].append(
+                        f"Constraint '{result['name']}' failed for {result['failed_count']} rows"
+                        if result["error"] is None else f"Constraint '{result['name']}' could not run: {result['error']}"
+                    )
         
         if validation_results["issues"]:
             validation_results["validation_passed"] = False
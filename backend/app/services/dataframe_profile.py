@@ -0,0 +1,130 @@
+import weakref
+from typing import Dict, Any, Optional
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+
+_DISTINCT_SAMPLE_TARGET = 4096
+
+_profiles: Dict[int, "DataFrameProfile"] = {}
+
+
+class DataFrameProfile:
+    """Column statistics for a DataFrame, computed in one pass and reused.
+
+    Schema snapshots, validation and lineage all read from the same profile
+    instead of recomputing null counts, dtypes and distinct counts.
+    """
+
+    def __init__(self, df: pd.DataFrame, exact_unique: Optional[bool] = None):
+        if exact_unique is None:
+            exact_unique = len(df) <= settings.profile_exact_unique_max_rows
+
+        self.row_count = len(df)
+        self.fingerprint = _fingerprint(df)
+        self.unique_estimated = not exact_unique
+
+        null_counts = df.isna().sum()
+        self.columns: Dict[str, Dict[str, Any]] = {}
+        for column in df.columns:
+            series = df[column]
+            self.columns[column] = {
+                "name": column,
+                "type": str(series.dtype),
+                "null_count": int(null_counts[column]),
+                "unique_count": _nunique(series) if exact_unique else _estimate_nunique(series)
+            }
+
+        self._row_hashes: Optional[np.ndarray] = None
+        self._df_ref = weakref.ref(df)
+
+    @property
+    def row_hashes(self) -> np.ndarray:
+        if self._row_hashes is None:
+            self._row_hashes = hash_rows(self._df_ref())
+        return self._row_hashes
+
+    @property
+    def duplicate_rows(self) -> int:
+        if self.row_count == 0:
+            return 0
+        return int(self.row_count - len(pd.unique(self.row_hashes)))
+
+    @property
+    def null_counts(self) -> Dict[str, int]:
+        return {name: info["null_count"] for name, info in self.columns.items()}
+
+    @property
+    def data_types(self) -> Dict[str, str]:
+        return {name: info["type"] for name, info in self.columns.items()}
+
+    def update_dtypes(self, df: pd.DataFrame):
+        # Dtype-only changes keep null and distinct counts, so patch instead of re-profiling.
+        for column in df.columns:
+            self.columns[column]["type"] = str(df[column].dtype)
+        self.fingerprint = _fingerprint(df)
+        self._row_hashes = None
+
+    def to_schema(self) -> Dict[str, Any]:
+        return {
+            "columns": list(self.columns.values()),
+            "row_count": self.row_count,
+            "unique_counts_estimated": self.unique_estimated
+        }
+
+
+def profile_dataframe(
+    df: pd.DataFrame,
+    refresh: bool = False,
+    exact_unique: Optional[bool] = None
+) -> DataFrameProfile:
+    # Rules may mutate a frame in place, so callers pass refresh=True after running them.
+    key = id(df)
+    profile = _profiles.get(key)
+    if profile is None or refresh or profile.fingerprint != _fingerprint(df):
+        if profile is None:
+            weakref.finalize(df, _profiles.pop, key, None)
+        profile = DataFrameProfile(df, exact_unique=exact_unique)
+        _profiles[key] = profile
+    return profile
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    try:
+        return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+    except TypeError:
+        # Nested JSON values (lists, dicts) are unhashable; hash their text form instead.
+        text_columns = {column: str for column in df.columns if df[column].dtype == object}
+        return pd.util.hash_pandas_object(df.astype(text_columns), index=False).to_numpy(dtype=np.uint64)
+
+
+def _hash_series(series: pd.Series) -> np.ndarray:
+    try:
+        return pd.util.hash_pandas_object(series, index=False).to_numpy(dtype=np.uint64)
+    except TypeError:
+        return pd.util.hash_pandas_object(series.astype(str), index=False).to_numpy(dtype=np.uint64)
+
+
+def _nunique(series: pd.Series) -> int:
+    try:
+        return int(series.nunique())
+    except TypeError:
+        return int(series.astype(str).nunique())
+
+
+def _estimate_nunique(series: pd.Series) -> int:
+    # Distinct sampling on the value hash: a value is either fully in or fully out of the
+    # sample, so distinct(sample) / rate is unbiased and needs no full-column hash table.
+    hashes = _hash_series(series.dropna())
+    rate = min(1.0, _DISTINCT_SAMPLE_TARGET * 16 / max(len(hashes), 1))
+    while rate < 1.0:
+        sampled = hashes[hashes < np.uint64(rate * 2 ** 64)]
+        distinct = len(pd.unique(sampled))
+        if distinct >= _DISTINCT_SAMPLE_TARGET:
+            return min(len(hashes), int(distinct / rate))
+        rate = min(1.0, rate * 16)
+    return int(len(pd.unique(hashes)))
+
+
+def _fingerprint(df: pd.DataFrame):
+    return (df.shape, tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes))
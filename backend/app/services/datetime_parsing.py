@@ -0,0 +1,161 @@
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2 only has the private location
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+CANDIDATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y/%m/%d",
+    "%Y%m%d",
+    "%y%m%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d/%m/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%d-%b-%Y",
+    "%d %b %Y",
+    "%b %d, %Y",
+]
+
+SAMPLE_SIZE = 500
+MIN_FORMAT_MATCH_RATIO = 0.5
+REINFER_BELOW_MATCH_RATIO = 0.9
+MAX_CACHED_FORMATS = 10_000
+
+_format_cache: "OrderedDict[Tuple[Optional[int], str], str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _sample_strings(series: pd.Series) -> pd.Series:
+    values = series.dropna()
+    if len(values) > SAMPLE_SIZE:
+        values = values.iloc[np.linspace(0, len(values) - 1, SAMPLE_SIZE).astype(int)]
+    return values.astype(str).str.strip()
+
+
+def infer_datetime_format(series: pd.Series) -> Optional[str]:
+    sample = _sample_strings(series)
+    if sample.empty:
+        return None
+
+    candidates = []
+    with warnings.catch_warnings():
+        # The guess is only one candidate among many; its dayfirst hint is noise here.
+        warnings.simplefilter("ignore", UserWarning)
+        guessed = guess_datetime_format(sample.iloc[0])
+    if guessed:
+        candidates.append(guessed)
+    candidates.extend(fmt for fmt in CANDIDATE_FORMATS if fmt not in candidates)
+
+    best_format, best_ratio = None, 0.0
+    for fmt in candidates:
+        ratio = pd.to_datetime(sample, format=fmt, errors="coerce").notna().mean()
+        if ratio > best_ratio:
+            best_format, best_ratio = fmt, ratio
+        if ratio == 1.0:
+            break
+
+    return best_format if best_ratio >= MIN_FORMAT_MATCH_RATIO else None
+
+
+def _parse_with_format(series: pd.Series, fmt: str) -> pd.Series:
+    # Trade and value dates repeat heavily, so parse each distinct string once.
+    codes, uniques = pd.factorize(series)
+    if len(uniques) > len(series) // 2:
+        return pd.to_datetime(series, format=fmt, errors="coerce")
+    parsed = pd.DatetimeIndex(pd.to_datetime(pd.Series(uniques, dtype=object), format=fmt, errors="coerce"))
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index, name=series.name)
+
+
+def get_cached_format(source_id: Optional[int], column: str) -> Optional[str]:
+    with _cache_lock:
+        fmt = _format_cache.get((source_id, column))
+        if fmt is not None:
+            _format_cache.move_to_end((source_id, column))
+        return fmt
+
+
+def _cache_format(source_id: Optional[int], column: str, fmt: str):
+    with _cache_lock:
+        _format_cache[(source_id, column)] = fmt
+        _format_cache.move_to_end((source_id, column))
+        while len(_format_cache) > MAX_CACHED_FORMATS:
+            _format_cache.popitem(last=False)
+
+
+def parse_datetime_column(
+    series: pd.Series,
+    source_id: Optional[int] = None,
+    column: Optional[str] = None
+) -> Tuple[pd.Series, pd.Series, Optional[str]]:
+    """Parse a column with one fixed format and fall back only for rows that miss it.
+
+    Returns the parsed values, a mask of rows that could not be parsed at all
+    and the format used on the fast path.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series, pd.Series(False, index=series.index), None
+    if pd.api.types.is_numeric_dtype(series):
+        parsed = pd.to_datetime(series, errors="coerce")
+        return parsed, series.notna() & parsed.isna(), None
+
+    present = series.notna()
+    column = column if column is not None else str(series.name)
+
+    # Jobs without a source share nothing, so a guessed format is only reused within a source.
+    fmt = get_cached_format(source_id, column) if source_id is not None else None
+    parsed = _parse_with_format(series, fmt) if fmt else None
+    if parsed is None or parsed.notna().sum() < present.sum() * REINFER_BELOW_MATCH_RATIO:
+        # No cached format yet, or the feed changed format: infer again from this batch.
+        fmt = infer_datetime_format(series)
+        if fmt:
+            if source_id is not None:
+                _cache_format(source_id, column, fmt)
+            parsed = _parse_with_format(series, fmt)
+        else:
+            parsed = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+
+    missed = present & parsed.isna()
+    if missed.any():
+        # Blank strings are missing values, not bad dates.
+        missed &= series.astype(str).str.strip() != ""
+        present &= ~(series.astype(str).str.strip() == "")
+    if missed.any():
+        fallback = pd.to_datetime(series[missed], format="mixed", errors="coerce")
+        if fallback.dtype == parsed.dtype:
+            parsed = parsed.copy()
+            parsed.loc[missed] = fallback
+
+    return parsed, present & parsed.isna(), fmt
+
+
+def detect_datetime_columns(df: pd.DataFrame) -> Dict[str, str]:
+    detected = {}
+    for column in df.columns:
+        if df[column].dtype == object:
+            fmt = infer_datetime_format(df[column])
+            if fmt:
+                detected[column] = fmt
+    return detected
+
+
+def summarize_invalid_dates(series: pd.Series, invalid: pd.Series, sample_size: int = 5) -> Dict[str, object]:
+    rows = series[invalid]
+    return {
+        "invalid_count": int(invalid.sum()),
+        "sample_values": [str(value) for value in rows.head(sample_size).tolist()],
+        "sample_row_indexes": [int(index) if isinstance(index, (int, np.integer)) else str(index)
+                               for index in rows.head(sample_size).index.tolist()]
+    }
@@ -0,0 +1,161 @@
+import os
+import time
+import fcntl
+import hashlib
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+
+_BLOOM_HASHES = 4
+_MIN_BLOOM_BITS = 1 << 16
+
+
+def _key_string(value) -> str:
+    if isinstance(value, (float, np.floating)) and np.isfinite(value) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _key_strings(column: pd.Series) -> pd.Series:
+    if pd.api.types.is_float_dtype(column) or column.dtype == object:
+        return column.map(_key_string)
+    return column.astype(str)
+
+
+class DedupIndex:
+    """Persistent set of hashed row keys already loaded for a data source.
+
+    Lookups go through a bloom filter and are confirmed against the sorted
+    hash array. ``add`` only stages hashes; ``commit`` persists them once the
+    job has succeeded.
+    """
+
+    def __init__(
+        self,
+        source_id: int,
+        key_columns: Optional[List[str]] = None,
+        ttl_days: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        index_dir: Optional[str] = None
+    ):
+        self.source_id = source_id
+        self.key_columns = sorted(key_columns) if key_columns else None
+        self.ttl_days = ttl_days if ttl_days is not None else settings.dedup_index_ttl_days
+        self.max_entries = max_entries if max_entries is not None else settings.dedup_index_max_entries
+        self.index_dir = index_dir or os.path.join(settings.staging_dir, "dedup")
+
+        key_signature = ",".join(self.key_columns) if self.key_columns else "*"
+        key_digest = hashlib.sha1(key_signature.encode()).hexdigest()[:12]
+        self.path = os.path.join(self.index_dir, f"source_{source_id}_{key_digest}.npz")
+
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._seen_at = np.empty(0, dtype=np.int64)
+        self._bloom = np.zeros(_MIN_BLOOM_BITS // 8, dtype=np.uint8)
+        self._pending = np.empty(0, dtype=np.uint64)
+        self._loaded = False
+
+    @staticmethod
+    def hash_rows(df: pd.DataFrame, columns: Optional[List[str]] = None) -> np.ndarray:
+        keys = df[sorted(columns)] if columns else df[sorted(df.columns)]
+        # Hash a normalised string form so a key loaded as int one day and float the next
+        # (e.g. because one value was missing) still matches.
+        keys = keys.apply(_key_strings)
+        return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+    def load(self) -> "DedupIndex":
+        if os.path.exists(self.path):
+            with np.load(self.path) as stored:
+                self._hashes = stored["hashes"]
+                self._seen_at = stored["seen_at"]
+                self._bloom = stored["bloom"]
+        self._loaded = True
+        return self
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        if not self._loaded:
+            self.load()
+
+        if len(self._hashes) == 0 or len(hashes) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+
+        maybe = self._bloom_contains(self._bloom, hashes)
+        candidates = hashes[maybe]
+        positions = np.searchsorted(self._hashes, candidates)
+        positions[positions == len(self._hashes)] = 0
+        found = np.zeros(len(hashes), dtype=bool)
+        matched = self._hashes[positions] == candidates
+        if self.ttl_days:
+            # Entries past the TTL no longer count, even before a commit prunes them from the file.
+            matched &= self._seen_at[positions] >= int(time.time()) - self.ttl_days * 86400
+        found[maybe] = matched
+        return found
+
+    def add(self, hashes: np.ndarray):
+        self._pending = np.concatenate([self._pending, hashes.astype(np.uint64)])
+
+    def commit(self) -> int:
+        if len(self._pending) == 0:
+            return 0
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Re-read under the lock so concurrent jobs for the same source merge rather than overwrite.
+                self.load()
+                now = int(time.time())
+                hashes = np.concatenate([self._hashes, self._pending])
+                seen_at = np.concatenate([self._seen_at, np.full(len(self._pending), now, dtype=np.int64)])
+
+                if self.ttl_days:
+                    live = seen_at >= now - self.ttl_days * 86400
+                    hashes, seen_at = hashes[live], seen_at[live]
+
+                # Keep the most recent sighting of each hash, then the newest max_entries of those.
+                order = np.lexsort((-seen_at, hashes))
+                hashes, seen_at = hashes[order], seen_at[order]
+                first = np.ones(len(hashes), dtype=bool)
+                first[1:] = hashes[1:] != hashes[:-1]
+                hashes, seen_at = hashes[first], seen_at[first]
+
+                if self.max_entries and len(hashes) > self.max_entries:
+                    newest = np.sort(np.argsort(-seen_at, kind="stable")[:self.max_entries])
+                    hashes, seen_at = hashes[newest], seen_at[newest]
+
+                bloom = self._build_bloom(hashes)
+                tmp_path = f"{self.path}.tmp.npz"
+                np.savez(tmp_path, hashes=hashes, seen_at=seen_at, bloom=bloom)
+                os.replace(tmp_path, self.path)
+
+                added = len(self._pending)
+                self._hashes, self._seen_at, self._bloom = hashes, seen_at, bloom
+                self._pending = np.empty(0, dtype=np.uint64)
+                return added
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _build_bloom(self, hashes: np.ndarray) -> np.ndarray:
+        n_bits = max(_MIN_BLOOM_BITS, len(hashes) * settings.dedup_bloom_bits_per_entry)
+        n_bits = 1 << int(n_bits - 1).bit_length()
+        bloom = np.zeros(n_bits // 8, dtype=np.uint8)
+        positions = self._bloom_positions(hashes, n_bits)
+        np.bitwise_or.at(bloom, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        return bloom
+
+    @classmethod
+    def _bloom_contains(cls, bloom: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        n_bits = len(bloom) * 8
+        positions = cls._bloom_positions(hashes, n_bits)
+        bits = (bloom[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1
+        return bits.reshape(_BLOOM_HASHES, len(hashes)).all(axis=0)
+
+    @staticmethod
+    def _bloom_positions(hashes: np.ndarray, n_bits: int) -> np.ndarray:
+        # Kirsch-Mitzenmacher double hashing: position_i = h1 + i * h2.
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        mask = np.uint64(n_bits - 1)
+        return np.concatenate([
+            (h1 + np.uint64(i) * h2) & mask for i in range(_BLOOM_HASHES)
+        ]).astype(np.int64)
@@ -1,8 +1,10 @@
 from typing import Dict, Any, List
+import pandas as pd
 from sqlalchemy.orm import Session
 from app.models.exception import DataException, ExceptionSeverity
-from app.models.processing_job import ProcessingJob
+from app.models.processing_job import ProcessingJob, job_payload
 from app.services.notification_service import NotificationService
+from app.services.datetime_parsing import detect_datetime_columns
 from datetime import datetime
 
 class ExceptionService:
@@ -41,6 +43,31 @@ class ExceptionService:
         
         return exception
 
+    async def report_exceptions_bulk(self, exceptions: List[Dict[str, Any]]) -> List[DataException]:
+        records = [
+            DataException(
+                job_id=exception["job_id"],
+                exception_type=exception["exception_type"],
+                message=exception["message"],
+                severity=exception["severity"],
+                additional_metadata=exception.get("metadata") or {},
+                timestamp=datetime.utcnow(),
+                resolved=False
+            )
+            for exception in exceptions
+        ]
+        if not records:
+            return records
+
+        self.db.add_all(records)
+        self.db.commit()
+
+        for record in records:
+            if record.severity in [ExceptionSeverity.HIGH, ExceptionSeverity.CRITICAL]:
+                await self.notification_service.send_exception_alert(record)
+
+        return records
+
     async def resolve_exception(
         self,
         exception_id: int,
@@ -178,7 +205,7 @@ class ExceptionService:
             elif suggestion["action"] == "remove_duplicates":
                 await self._auto_remove_duplicates(job, correction_metadata)
             elif suggestion["action"] == "parse_dates":
-                await self._auto_parse_dates(job, correction_metadata)
+                correction_metadata = await self._auto_parse_dates(job, correction_metadata)
 
             await self.report_exception(
                 job_id=job.id,
@@ -253,20 +280,23 @@ class ExceptionService:
         
         await processing_service.apply_transformation_rules(job, [rule])
 
-    async def _auto_parse_dates(self, job: ProcessingJob, metadata: Dict[str, Any]):
+    async def _auto_parse_dates(self, job: ProcessingJob, metadata: Dict[str, Any]) -> Dict[str, Any]:
         from app.services.data_processing_service import DataProcessingService
         from app.schemas.processing import TransformationRuleCreate
         
         processing_service = DataProcessingService(self.db)
+
+        input_data = job_payload(job) or {}
+        records = input_data.get("data", input_data) if isinstance(input_data, dict) else input_data
+        date_columns = detect_datetime_columns(pd.DataFrame(records))
         
         rule = TransformationRuleCreate(
             rule_type="validate_data_types",
             parameters={
-                "type_mappings": {
-                    "date_columns": "datetime"
-                }
+                "type_mappings": {column: "datetime" for column in date_columns}
             },
             description="Auto parse dates"
         )
         
         await processing_service.apply_transformation_rules(job, [rule])
+        return {**metadata, "date_formats": date_columns}
@@ -0,0 +1,326 @@
+import ast
+import operator
+from functools import lru_cache
+from typing import Any, Callable, Dict, List
+import numpy as np
+import pandas as pd
+
+MAX_EXPRESSION_LENGTH = 4096
+MAX_EXPRESSION_NODES = 512
+# Literal arithmetic is folded at compile time; results past these sizes are rejected
+# rather than left to hang the worker (or the API, through previews).
+MAX_CONSTANT_BITS = 4096
+MAX_CONSTANT_LENGTH = MAX_EXPRESSION_LENGTH
+
+CompiledExpression = Callable[[pd.DataFrame], Any]
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+_NOT_CONSTANT = object()
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _result_too_large(op_type: type, left: Any, right: Any) -> bool:
+    """Whether Python arithmetic on these operands could build a huge int or string."""
+    if op_type is ast.Pow and _is_int(left) and _is_int(right) and right > 0 and abs(left) > 1:
+        return right * abs(left).bit_length() > MAX_CONSTANT_BITS
+    if op_type is ast.Mult:
+        for repeated, count in ((left, right), (right, left)):
+            if not _is_int(count):
+                continue
+            if isinstance(repeated, str):
+                return len(repeated) * count > MAX_CONSTANT_LENGTH
+            if _is_text_series(repeated) and count > MAX_CONSTANT_LENGTH:
+                return bool(repeated.map(lambda value: isinstance(value, str)).any())
+    if op_type is ast.Pow and _is_int(right) and right > MAX_CONSTANT_BITS:
+        # Object columns hold Python ints, which would be raised one by one without bound.
+        return isinstance(left, pd.Series) and left.dtype == object
+    return False
+
+
+def _is_text_series(value: Any) -> bool:
+    return isinstance(value, pd.Series) and (value.dtype == object or isinstance(value.dtype, pd.StringDtype))
+
+
+def _as_series(value: Any, df: pd.DataFrame) -> pd.Series:
+    if isinstance(value, pd.Series):
+        return value
+    return pd.Series(value, index=df.index)
+
+
+def _as_mask(value: Any, df: pd.DataFrame) -> pd.Series:
+    return _as_series(value, df).fillna(False).astype(bool)
+
+
+def _as_text(value: Any, df: pd.DataFrame) -> pd.Series:
+    series = _as_series(value, df)
+    return series.astype("string")
+
+
+def _concat(df, *args):
+    result = _as_text(args[0], df).fillna("")
+    for arg in args[1:]:
+        result = result + _as_text(arg, df).fillna("")
+    return result
+
+
+def _coalesce(df, *args):
+    result = _as_series(args[0], df)
+    for arg in args[1:]:
+        result = result.fillna(_as_series(arg, df)) if isinstance(arg, pd.Series) else result.fillna(arg)
+    return result
+
+
+def _if_else(df, condition, when_true, when_false):
+    mask = _as_mask(condition, df)
+    return _as_series(when_true, df).where(mask, _as_series(when_false, df))
+
+
+def _round(df, value, digits=0):
+    return _as_series(value, df).round(int(digits))
+
+
+def _substr(df, value, start, length=None):
+    text = _as_text(value, df)
+    start = int(start)
+    return text.str.slice(start, None if length is None else start + int(length))
+
+
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "abs": lambda df, x: _as_series(x, df).abs(),
+    "round": _round,
+    "lower": lambda df, x: _as_text(x, df).str.lower(),
+    "upper": lambda df, x: _as_text(x, df).str.upper(),
+    "strip": lambda df, x: _as_text(x, df).str.strip(),
+    "length": lambda df, x: _as_text(x, df).str.len(),
+    "substr": _substr,
+    "replace": lambda df, x, old, new: _as_text(x, df).str.replace(str(old), str(new), regex=False),
+    "concat": _concat,
+    "coalesce": _coalesce,
+    "if_else": _if_else,
+    "is_null": lambda df, x: _as_series(x, df).isna(),
+    "not_null": lambda df, x: _as_series(x, df).notna(),
+    "to_number": lambda df, x: pd.to_numeric(_as_series(x, df), errors="coerce"),
+    "to_string": lambda df, x: _as_text(x, df),
+    "to_date": lambda df, x: pd.to_datetime(_as_series(x, df), errors="coerce"),
+    "year": lambda df, x: pd.to_datetime(_as_series(x, df), errors="coerce").dt.year,
+    "month": lambda df, x: pd.to_datetime(_as_series(x, df), errors="coerce").dt.month,
+    "day": lambda df, x: pd.to_datetime(_as_series(x, df), errors="coerce").dt.day,
+}
+
+
+class _Compiler:
+    def __init__(self, text: str):
+        self.text = text
+        self.columns: List[str] = []
+
+    def compile(self, node: ast.AST) -> CompiledExpression:
+        method = getattr(self, f"_compile_{type(node).__name__}", None)
+        if method is None:
+            raise ExpressionError(f"Unsupported syntax '{type(node).__name__}' in expression: {self.text}")
+        return method(node)
+
+    def _compile_Expression(self, node: ast.Expression) -> CompiledExpression:
+        return self.compile(node.body)
+
+    def _compile_Constant(self, node: ast.Constant) -> CompiledExpression:
+        if not isinstance(node.value, (int, float, str, bool, type(None))):
+            raise ExpressionError(f"Unsupported literal {node.value!r} in expression: {self.text}")
+        value = node.value
+        return lambda df: value
+
+    def _column(self, name: str) -> CompiledExpression:
+        self.columns.append(name)
+
+        def evaluate(df: pd.DataFrame):
+            if name not in df.columns:
+                raise ExpressionError(f"Unknown column '{name}' in expression: {self.text}")
+            return df[name]
+        return evaluate
+
+    def _compile_Name(self, node: ast.Name) -> CompiledExpression:
+        return self._column(node.id)
+
+    def _fold(self, node: ast.AST) -> Any:
+        """The value of a literal-only subexpression, or _NOT_CONSTANT."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool, type(None))):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self._fold(node.operand)
+            if isinstance(operand, (int, float)):
+                return -operand if isinstance(node.op, ast.USub) else +operand
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            left, right = self._fold(node.left), self._fold(node.right)
+            if left is not _NOT_CONSTANT and right is not _NOT_CONSTANT:
+                return self._apply(type(node.op), left, right)
+        return _NOT_CONSTANT
+
+    def _apply(self, op_type: type, left: Any, right: Any) -> Any:
+        if _result_too_large(op_type, left, right):
+            raise ExpressionError(f"Result of literal arithmetic is too large in expression: {self.text}")
+        try:
+            value = _BINARY_OPERATORS[op_type](left, right)
+        except (ArithmeticError, TypeError, ValueError) as e:
+            raise ExpressionError(f"Invalid literal arithmetic in expression: {self.text}") from e
+        if _is_int(value) and value.bit_length() > MAX_CONSTANT_BITS:
+            raise ExpressionError(f"Result of literal arithmetic is too large in expression: {self.text}")
+        return value
+
+    def _compile_BinOp(self, node: ast.BinOp) -> CompiledExpression:
+        op = _BINARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Unsupported operator in expression: {self.text}")
+        folded = self._fold(node)
+        if folded is not _NOT_CONSTANT:
+            return lambda df: folded
+        left, right = self.compile(node.left), self.compile(node.right)
+        op_type = type(node.op)
+
+        def evaluate(df: pd.DataFrame):
+            left_value, right_value = left(df), right(df)
+            if _result_too_large(op_type, left_value, right_value):
+                raise ExpressionError(f"Result of arithmetic is too large in expression: {self.text}")
+            return op(left_value, right_value)
+        return evaluate
+
+    def _compile_UnaryOp(self, node: ast.UnaryOp) -> CompiledExpression:
+        folded = self._fold(node)
+        if folded is not _NOT_CONSTANT:
+            return lambda df: folded
+        operand = self.compile(node.operand)
+        if isinstance(node.op, ast.USub):
+            return lambda df: -operand(df)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if isinstance(node.op, ast.Not):
+            return lambda df: ~_as_mask(operand(df), df)
+        raise ExpressionError(f"Unsupported operator in expression: {self.text}")
+
+    def _compile_BoolOp(self, node: ast.BoolOp) -> CompiledExpression:
+        values = [self.compile(value) for value in node.values]
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+
+        def evaluate(df: pd.DataFrame):
+            result = _as_mask(values[0](df), df)
+            for value in values[1:]:
+                result = combine(result, _as_mask(value(df), df))
+            return result
+        return evaluate
+
+    def _compile_Compare(self, node: ast.Compare) -> CompiledExpression:
+        comparisons = []
+        left = self.compile(node.left)
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                comparisons.append((left, self._membership(comparator, negate=isinstance(op, ast.NotIn))))
+            else:
+                compare = _COMPARE_OPERATORS.get(type(op))
+                if compare is None:
+                    raise ExpressionError(f"Unsupported comparison in expression: {self.text}")
+                right = self.compile(comparator)
+                comparisons.append((left, lambda df, l, compare=compare, right=right: compare(l, right(df))))
+                left = right
+
+        def evaluate(df: pd.DataFrame):
+            result = None
+            for operand, compare in comparisons:
+                mask = _as_mask(compare(df, operand(df)), df)
+                result = mask if result is None else result & mask
+            return result
+        return evaluate
+
+    def _membership(self, node: ast.AST, negate: bool):
+        if not isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            raise ExpressionError(f"'in' expects a literal list in expression: {self.text}")
+        values = []
+        for element in node.elts:
+            if not isinstance(element, ast.Constant):
+                raise ExpressionError(f"'in' lists may only contain literals in expression: {self.text}")
+            values.append(element.value)
+
+        def evaluate(df: pd.DataFrame, operand):
+            mask = _as_series(operand, df).isin(values)
+            return ~mask if negate else mask
+        return evaluate
+
+    def _compile_IfExp(self, node: ast.IfExp) -> CompiledExpression:
+        condition, body, orelse = self.compile(node.test), self.compile(node.body), self.compile(node.orelse)
+        return lambda df: _if_else(df, condition(df), body(df), orelse(df))
+
+    def _compile_Call(self, node: ast.Call) -> CompiledExpression:
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ExpressionError(f"Only plain function calls are allowed in expression: {self.text}")
+
+        name = node.func.id
+        if name == "col":
+            if len(node.args) != 1 or not isinstance(node.args[0], ast.Constant) or not isinstance(node.args[0].value, str):
+                raise ExpressionError(f"col() takes a single column name in expression: {self.text}")
+            return self._column(node.args[0].value)
+
+        function = _FUNCTIONS.get(name)
+        if function is None:
+            raise ExpressionError(f"Unknown function '{name}' in expression: {self.text}")
+        args = [self.compile(arg) for arg in node.args]
+
+        def evaluate(df: pd.DataFrame):
+            try:
+                return function(df, *[arg(df) for arg in args])
+            except TypeError as e:
+                raise ExpressionError(f"Invalid arguments to {name}() in expression: {self.text}") from e
+        return evaluate
+
+
+@lru_cache(maxsize=512)
+def compile_expression(text: str) -> CompiledExpression:
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression exceeds {MAX_EXPRESSION_LENGTH} characters")
+
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression '{text}': {e.msg}") from e
+
+    if sum(1 for _ in ast.walk(tree)) > MAX_EXPRESSION_NODES:
+        raise ExpressionError(f"Expression is too complex: {text}")
+
+    compiler = _Compiler(text)
+    compiled = compiler.compile(tree)
+
+    def evaluate(df: pd.DataFrame) -> pd.Series:
+        result = compiled(df)
+        if isinstance(result, np.ndarray):
+            return pd.Series(result, index=df.index)
+        result = _as_series(result, df)
+        if isinstance(result.dtype, pd.StringDtype):
+            # Keep derived text columns as plain objects like the rest of the frame.
+            result = result.astype(object).where(result.notna(), None)
+        return result
+
+    evaluate.columns = tuple(dict.fromkeys(compiler.columns))
+    return evaluate
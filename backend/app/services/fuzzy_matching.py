@@ -0,0 +1,187 @@
+import re
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+BLOCKING_STRATEGIES = ("soundex", "sorted_token", "ngram")
+DEFAULT_STOP_TERMS = ("ltd", "limited", "inc", "incorporated", "plc", "llc", "llp", "corp", "corporation",
+                      "co", "company", "gmbh", "ag", "sa", "nv", "bv", "the")
+MAX_REPORTED_CLUSTERS = 1000
+
+_SOUNDEX_CODES = {c: str(d) for d, letters in enumerate(
+    ["aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r"]) for c in letters}
+
+
+def normalize_text(value: Any, stop_terms: Tuple[str, ...] = DEFAULT_STOP_TERMS) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    tokens = re.sub(r"[^a-z0-9]+", " ", str(value).lower()).split()
+    return " ".join(token for token in tokens if token not in stop_terms)
+
+
+def soundex(word: str) -> str:
+    letters = [c for c in word.lower() if c.isalpha()]
+    if not letters:
+        return ""
+    code, previous = letters[0].upper(), _SOUNDEX_CODES.get(letters[0])
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c)
+        if digit and digit != "0" and digit != previous:
+            code += digit
+        if c not in "hw":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def blocking_keys(text: str, strategy: str, ngram_size: int = 3, prefix_length: int = 6) -> List[str]:
+    tokens = text.split()
+    if not tokens:
+        return []
+    if strategy == "soundex":
+        return [soundex(tokens[0])]
+    if strategy == "sorted_token":
+        return ["".join(sorted(tokens))[:prefix_length]]
+    if strategy == "ngram":
+        compact = "".join(tokens)
+        return list({compact[i:i + ngram_size] for i in range(max(1, len(compact) - ngram_size + 1))})
+    raise ValueError(f"Unknown blocking strategy: {strategy}")
+
+
+class UnionFind:
+    def __init__(self, size: int):
+        self.parent = np.arange(size)
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def _candidate_pairs(keys_per_record: List[List[str]], max_block_size: int) -> Tuple[np.ndarray, Dict[str, int]]:
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for record, keys in enumerate(keys_per_record):
+        for key in keys:
+            blocks[key].append(record)
+
+    left, right = [], []
+    skipped = 0
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) > max_block_size:
+            # Very common keys (a frequent n-gram) would bring back the quadratic blow-up.
+            skipped += 1
+            continue
+        members = np.asarray(members)
+        i, j = np.triu_indices(len(members), k=1)
+        left.append(members[i])
+        right.append(members[j])
+
+    if not left:
+        return np.empty((0, 2), dtype=np.int64), {"blocks": len(blocks), "oversized_blocks_skipped": skipped}
+    pairs = np.unique(np.stack([np.concatenate(left), np.concatenate(right)], axis=1), axis=0)
+    return pairs, {"blocks": len(blocks), "oversized_blocks_skipped": skipped}
+
+
+def _pair_similarity(texts: List[str], pairs: np.ndarray) -> np.ndarray:
+    vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 3))
+    matrix = vectorizer.fit_transform(texts)
+    # Rows are L2-normalised, so the row-wise dot product of each pair is its cosine similarity.
+    return np.asarray(matrix[pairs[:, 0]].multiply(matrix[pairs[:, 1]]).sum(axis=1)).ravel()
+
+
+def find_clusters(
+    df: pd.DataFrame,
+    columns: List[str],
+    threshold: float = 0.85,
+    blocking: Optional[List[str]] = None,
+    weights: Optional[Dict[str, float]] = None,
+    max_block_size: int = 1000,
+    stop_terms: Tuple[str, ...] = DEFAULT_STOP_TERMS
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Return a cluster label per row (-1 for unmatched rows) and match statistics."""
+    blocking = blocking or ["soundex", "sorted_token"]
+    unknown = [strategy for strategy in blocking if strategy not in BLOCKING_STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown blocking strategies: {unknown}")
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"Fuzzy dedup columns not found: {missing}")
+
+    # Work on distinct normalised records; exact repeats collapse before any scoring.
+    normalized = {}
+    for column in columns:
+        codes, uniques = pd.factorize(df[column].astype(object))
+        texts = np.array([normalize_text(value, stop_terms) for value in uniques] + [""], dtype=object)
+        normalized[column] = texts[codes]
+    normalized = pd.DataFrame(normalized)
+    record_ids = normalized.groupby(columns, sort=False).ngroup().to_numpy()
+    records = normalized.drop_duplicates().reset_index(drop=True)
+    primary = records[columns[0]].tolist()
+
+    keys_per_record = [
+        [f"{strategy}:{key}" for strategy in blocking for key in blocking_keys(text, strategy)]
+        for text in primary
+    ]
+    pairs, block_stats = _candidate_pairs(keys_per_record, max_block_size)
+
+    weights = weights or {column: 1.0 for column in columns}
+    if any(weight < 0 for weight in weights.values()):
+        raise ValueError("Fuzzy match weights must not be negative")
+    total_weight = sum(weights.get(column, 0.0) for column in columns)
+    if total_weight <= 0:
+        raise ValueError("Fuzzy match weights must give the match columns a total weight above zero")
+    similarity = np.zeros(len(pairs))
+    if len(pairs):
+        for column in columns:
+            if weights.get(column, 0.0):
+                similarity += weights[column] * _pair_similarity(records[column].tolist(), pairs)
+        similarity /= total_weight
+    matched = pairs[similarity >= threshold]
+
+    union_find = UnionFind(len(records))
+    for a, b in matched:
+        union_find.union(int(a), int(b))
+    roots = np.array([union_find.find(i) for i in range(len(records))])
+
+    row_roots = roots[record_ids]
+    labels, _ = pd.factorize(row_roots)
+    sizes = np.bincount(labels)
+    labels = np.where(sizes[labels] > 1, labels, -1)
+
+    # Blank records never match anything, including each other.
+    labels[np.asarray(primary, dtype=object)[record_ids] == ""] = -1
+
+    return labels, {
+        "candidate_pairs": int(len(pairs)),
+        "matched_pairs": int(len(matched)),
+        "distinct_records": int(len(records)),
+        **block_stats
+    }
+
+
+def describe_clusters(df: pd.DataFrame, labels: np.ndarray, columns: List[str]) -> List[Dict[str, Any]]:
+    clustered = pd.Series(labels, index=df.index)
+    clustered = clustered[clustered >= 0]
+    clusters = []
+    for label, members in clustered.groupby(clustered, sort=False).groups.items():
+        if len(clusters) >= MAX_REPORTED_CLUSTERS:
+            break
+        rows = df.loc[members, columns]
+        clusters.append({
+            "cluster_id": int(label),
+            "size": len(members),
+            "rows": [str(index) for index in members],
+            "values": rows.astype(object).where(rows.notna(), None).to_dict("records")
+        })
+    return clusters
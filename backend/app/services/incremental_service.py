@@ -0,0 +1,379 @@
+import os
+import pickle
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import pandas as pd
+from sqlalchemy import or_, func, text, tuple_
+from sqlalchemy.orm import Session
+from app.models.data_source import DataSource
+from app.models.processing_job import ProcessingJob, JobStatus, job_payload
+from app.schemas.processing import TransformationRuleCreate
+from app.services.data_processing_service import DataProcessingService
+from app.services.dataframe_profile import profile_dataframe
+from app.services.sorting import top_n
+from app.services.rule_registry import rule_registry, CompiledRule, CompiledRuleSet, RuleValidationError
+from app.services.transformation_cache import TransformationCache
+from app.services.job_lease import LeaseLostError
+from app.services.job_progress import JobProgress
+from app.core.config import settings
+
+INCREMENTAL_JOB_TYPE = "incremental"
+
+# Partial aggregates that can be combined across batches, and how each is combined.
+_AGGREGATE_PARTS = {
+    "sum": ("sum",),
+    "count": ("count",),
+    "min": ("min",),
+    "max": ("max",),
+    "mean": ("sum", "count"),
+    "first": ("first",),
+    "last": ("last",),
+}
+_MERGE_PARTS = {"sum": "sum", "count": "sum", "min": "min", "max": "max", "first": "first", "last": "last"}
+
+
+class IncrementalPlan:
+    """A standing rule set split around its single optional reducer."""
+
+    def __init__(self, compiled: CompiledRuleSet):
+        self.before: List[CompiledRule] = []
+        self.reducer: Optional[CompiledRule] = None
+        self.after: List[CompiledRule] = []
+
+        errors = []
+        for position, rule in enumerate(compiled):
+            mode = rule.spec.incremental_mode(rule.parameters)
+            if mode == "reducer" and self.reducer is None:
+                if rule.rule_type == "aggregate_data":
+                    errors.extend(f"rule {position} (aggregate_data): {error}" for error in _aggregate_errors(rule.parameters))
+                self.reducer = rule
+            elif mode == "reducer":
+                errors.append(f"rule {position} ({rule.rule_type}): only one aggregating rule is allowed incrementally")
+            elif mode == "row":
+                (self.after if self.reducer else self.before).append(rule)
+            else:
+                errors.append(f"rule {position} ({rule.rule_type}): needs the full history and cannot run incrementally")
+        if errors:
+            raise RuleValidationError(errors)
+
+
+def _aggregation_items(parameters: Dict[str, Any]) -> Tuple[List[Tuple[str, str]], bool]:
+    items, single = [], True
+    for column, functions in parameters["aggregations"].items():
+        if isinstance(functions, (list, tuple)):
+            single = False
+            items.extend((column, function) for function in functions)
+        else:
+            items.append((column, functions))
+    return items, single
+
+
+def _aggregate_errors(parameters: Dict[str, Any]) -> List[str]:
+    if not parameters["group_by"] or not parameters["aggregations"]:
+        return ["incremental aggregation needs 'group_by' and 'aggregations'"]
+    items, _ = _aggregation_items(parameters)
+    return [
+        f"aggregation '{function}' on '{column}' cannot be merged across batches"
+        for column, function in items if function not in _AGGREGATE_PARTS
+    ]
+
+
+def partial_aggregate(df: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+    items, _ = _aggregation_items(parameters)
+    parts = {
+        f"{column}__{part}": pd.NamedAgg(column=column, aggfunc=part)
+        for column, function in items for part in _AGGREGATE_PARTS[function]
+    }
+    return df.groupby(parameters["group_by"], sort=False).agg(**parts).reset_index()
+
+
+def merge_partials(state: Optional[pd.DataFrame], partial: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+    if state is None or state.empty:
+        return partial
+    # State goes first so "first" keeps the oldest value and "last" the newest.
+    combined = pd.concat([state, partial], ignore_index=True)
+    merge = {column: _MERGE_PARTS[column.rsplit("__", 1)[1]] for column in combined.columns
+             if column not in parameters["group_by"]}
+    return combined.groupby(parameters["group_by"], sort=False).agg(merge).reset_index()
+
+
+def finalize_aggregate(state: pd.DataFrame, parameters: Dict[str, Any]) -> pd.DataFrame:
+    items, single = _aggregation_items(parameters)
+    result = state[parameters["group_by"]].copy()
+    for column, function in items:
+        name = column if single else f"{column}_{function}"
+        if function == "mean":
+            result[name] = state[f"{column}__sum"] / state[f"{column}__count"].where(state[f"{column}__count"] > 0)
+        else:
+            result[name] = state[f"{column}__{function}"]
+    return result.sort_values(parameters["group_by"], kind="mergesort").reset_index(drop=True)
+
+
+class IncrementalProcessingService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.processing_service = DataProcessingService(db)
+
+    def compile_plan(self, standing_rules: List[Dict[str, Any]]) -> Tuple[CompiledRuleSet, IncrementalPlan]:
+        rules = [TransformationRuleCreate(**rule) for rule in standing_rules]
+        compiled = rule_registry.compile(rules)
+        return compiled, IncrementalPlan(compiled)
+
+    async def queue_run(self, source: DataSource, user_id: Optional[int] = None) -> ProcessingJob:
+        """Check the source can run incrementally and queue the run for a worker."""
+        from app.services.job_queue import JobQueue
+
+        self._check_rules(source)
+        job = ProcessingJob(
+            name=f"Incremental - {source.name}",
+            description="Incremental run over new batches",
+            source_id=source.id,
+            job_type=INCREMENTAL_JOB_TYPE,
+            status=JobStatus.PENDING,
+            created_by=user_id
+        )
+        self.db.add(job)
+        self.db.commit()
+        await JobQueue(self.db).enqueue_incremental(job)
+        return job
+
+    async def run(self, job_id: int, progress: Optional[JobProgress] = None) -> Dict[str, Any]:
+        """Fold the source's new batches into its state as the given job.
+
+        The source row stays locked from the read of the watermark until the watermark,
+        state pointer and result job commit together, so two runs can never fold the same
+        batches in twice; nothing in between commits.
+        """
+        job = self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+        if not job:
+            return {"status": "missing"}
+        source = self.db.query(DataSource).filter(DataSource.id == job.source_id).with_for_update().first()
+
+        service = self.processing_service
+        service._reset_run_state(job)
+        try:
+            compiled, plan, rules_hash = self._check_rules(source)
+            state_info = source.incremental_state or {}
+            job.started_at = job.started_at or datetime.utcnow()
+
+            batches, delta, watermark, position = self._collect_delta(source)
+            if not batches:
+                job.status = JobStatus.COMPLETED
+                job.completed_at = datetime.utcnow()
+                job.output_data = {"status": "up_to_date", "watermark": source.incremental_watermark, "batch_job_ids": []}
+                if progress is not None:
+                    progress.confirm(self.db)
+                self.db.commit()
+                return job.output_data
+
+            job.description = f"Incremental run over {len(batches)} new batches"
+            job.input_data = {"batch_job_ids": batches}
+            delta_rows = len(delta)
+            if not delta.empty:
+                for rule in plan.before:
+                    parameters = rule.parameters
+                    if rule.rule_type == "remove_duplicates":
+                        # Dedup state across increments is the per-source hash index.
+                        parameters = {**parameters, "cross_batch": True}
+                    delta = await rule.bind(service)(delta, parameters)
+
+            state = self._load_state(state_info)
+            if plan.reducer is not None:
+                state = self._reduce(plan.reducer, state, delta)
+                output = self._reducer_output(plan.reducer, state)
+                if not output.empty:
+                    for rule in plan.after:
+                        output = await rule.bind(service)(output, rule.parameters)
+            else:
+                output = delta
+
+            profile_dataframe(output, refresh=True)
+            quarantine_summary = service._record_quarantine(job.id)
+
+            result = {
+                "processed_data": output.astype(object).where(output.notna(), None).to_dict('records'),
+                "row_count": len(output),
+                "delta_row_count": delta_rows,
+                "batch_job_ids": batches,
+                "watermark": watermark,
+                "state_row_count": len(state) if state is not None else 0,
+                "rule_outputs": service.rule_outputs,
+                "quarantine": quarantine_summary
+            }
+
+            new_state_info = {
+                "rules_hash": rules_hash,
+                "reducer": plan.reducer.rule_type if plan.reducer else None,
+                "state_row_count": result["state_row_count"],
+                "updated_at": datetime.utcnow().isoformat(),
+                "version": state_info.get("version", 0) + 1,
+                "position": position,
+                "path": None
+            }
+            if state is not None:
+                new_state_info["path"] = self._write_state(source.id, new_state_info["version"], state)
+
+            # Watermark, state pointer and the result job commit together; the old state file
+            # is only removed afterwards, so a crash in between never loses or double-counts a batch.
+            source.incremental_watermark = watermark
+            source.incremental_state = new_state_info
+            job.status = JobStatus.COMPLETED
+            job.completed_at = datetime.utcnow()
+            job.output_data = result
+            job.transformation_rules = {"rules": compiled.payload(), "incremental": True}
+            if progress is not None:
+                progress.confirm(self.db)
+            self.db.commit()
+
+            # Reported once the run has committed: reporting commits, which would release the source lock.
+            await service.exception_service.report_exceptions_bulk(service._pending_exceptions)
+            for dedup_index in service._pending_dedup_indexes:
+                dedup_index.commit()
+            if state_info.get("path") and state_info["path"] != new_state_info["path"]:
+                try:
+                    os.remove(state_info["path"])
+                except OSError:
+                    pass
+
+            await service.lineage_service.track_transformation(
+                job_id=job.id,
+                transformation_rules=[rule.rule_type for rule in compiled],
+                input_schema={"batch_job_ids": batches, "row_count": delta_rows},
+                output_schema=profile_dataframe(output).to_schema(),
+                metadata={"incremental": True, "watermark": watermark}
+            )
+            return {"status": "completed", "job_id": job.id, **result}
+
+        except LeaseLostError:
+            self.db.rollback()
+            raise
+
+        except Exception as e:
+            self.db.rollback()
+            job.status = JobStatus.FAILED
+            job.error_message = str(e)
+            job.completed_at = datetime.utcnow()
+            self.db.commit()
+            return {"status": "failed", "job_id": job.id, "error": str(e)}
+
+    def _check_rules(self, source: DataSource) -> Tuple[CompiledRuleSet, IncrementalPlan, str]:
+        if not source.standing_rules:
+            raise ValueError("Data source has no standing rules")
+        compiled, plan = self.compile_plan(source.standing_rules)
+        rules_hash = TransformationCache.rules_hash(compiled.payload())
+        if (source.incremental_state or {}).get("rules_hash") not in (None, rules_hash):
+            raise ValueError("Standing rules changed since the last run; reset the incremental state first")
+        return compiled, plan, rules_hash
+
+    async def reset(self, source: DataSource):
+        path = (source.incremental_state or {}).get("path")
+        source.incremental_watermark = None
+        source.incremental_state = None
+        self.db.commit()
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def _collect_delta(self, source: DataSource) -> Tuple[List[int], pd.DataFrame, Optional[int], Optional[List[int]]]:
+        """New batches in the order their transactions started, up to the commit horizon.
+
+        Job ids are handed out before commit, so a batch whose transaction commits late can
+        carry a lower id than one already processed. Batches are instead read by inserting
+        transaction, and only from transactions older than every one still open, so none can
+        appear behind the position afterwards.
+        """
+        order = (func.coalesce(ProcessingJob.insert_txid, 0), ProcessingJob.id)
+        query = self.db.query(ProcessingJob).filter(
+            ProcessingJob.source_id == source.id,
+            or_(ProcessingJob.job_type.is_(None), ProcessingJob.job_type != INCREMENTAL_JOB_TYPE),
+            # Pipeline steps re-read rows an earlier batch already delivered.
+            ProcessingJob.input_job_id.is_(None),
+            ProcessingJob.pipeline_run_id.is_(None)
+        )
+        position = (source.incremental_state or {}).get("position")
+        if position is None and source.incremental_watermark is not None:
+            # Sources last run before positions were recorded only have a job id.
+            position = [0, source.incremental_watermark]
+        if position is not None:
+            query = query.filter(tuple_(*order) > tuple_(*position))
+        horizon = self._commit_horizon()
+        if horizon is not None:
+            query = query.filter(order[0] < horizon)
+        jobs = query.order_by(*order).limit(settings.incremental_max_batches).all()
+
+        batches, frames = [], []
+        watermark = source.incremental_watermark
+        for job in jobs:
+            records = self._batch_records(job)
+            if records is None:
+                # An upload still being parsed holds the position back so it is not skipped.
+                break
+            batches.append(job.id)
+            watermark = job.id
+            position = [job.insert_txid or 0, job.id]
+            if records:
+                frames.append(pd.DataFrame(records))
+
+        delta = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return batches, delta, watermark, position
+
+    def _commit_horizon(self) -> Optional[int]:
+        if self.db.get_bind().dialect.name != "postgresql":
+            # SQLite has a single writer, so ids already commit in order.
+            return None
+        # Every transaction below the snapshot's xmin has committed or aborted.
+        return self.db.execute(text("SELECT txid_snapshot_xmin(txid_current_snapshot())")).scalar()
+
+    def _batch_records(self, job: ProcessingJob) -> Optional[List[Dict[str, Any]]]:
+        input_data = job_payload(job)
+        if isinstance(input_data, dict) and "file_path" in input_data:
+            if job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+                return None
+            input_data = (job.output_data or {}).get("processed_data") if job.status == JobStatus.COMPLETED else None
+        elif job.root_job_id is not None:
+            # A retry of an inline batch shares its payload with the original, which was already counted.
+            return []
+
+        if input_data is None:
+            return []
+        if isinstance(input_data, dict):
+            return input_data["data"] if "data" in input_data else [input_data]
+        return list(input_data)
+
+    def _reduce(
+        self,
+        reducer: CompiledRule,
+        state: Optional[pd.DataFrame],
+        delta: pd.DataFrame
+    ) -> Optional[pd.DataFrame]:
+        parameters = reducer.parameters
+        if delta.empty:
+            return state
+        if reducer.rule_type == "aggregate_data":
+            return merge_partials(state, partial_aggregate(delta, parameters), parameters)
+
+        # top_n: the previous top rows plus the delta always contain the new top rows.
+        combined = delta if state is None else pd.concat([state, delta], ignore_index=True)
+        return top_n(combined, by=parameters["by"], n=parameters["n"], ascending=parameters["ascending"])
+
+    def _reducer_output(self, reducer: CompiledRule, state: Optional[pd.DataFrame]) -> pd.DataFrame:
+        if state is None or state.empty:
+            return pd.DataFrame()
+        if reducer.rule_type == "aggregate_data":
+            return finalize_aggregate(state, reducer.parameters)
+        return state.reset_index(drop=True)
+
+    def _load_state(self, state_info: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        path = state_info.get("path")
+        if not path:
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def _write_state(self, source_id: int, version: int, state: pd.DataFrame) -> str:
+        directory = os.path.join(settings.staging_dir, "incremental")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"source_{source_id}_v{version}.pkl")
+        with open(f"{path}.tmp", "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+        return path
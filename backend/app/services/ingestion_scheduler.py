@@ -0,0 +1,132 @@
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from celery.schedules import crontab
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+from app.models.data_source import DataSource
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.job_queue import JobQueue
+from app.core.config import settings
+
+SCHEDULED_PULL_JOB_TYPE = "scheduled_pull"
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_cron(expression: str) -> crontab:
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError(f"Cron expression '{expression}' must have 5 fields: minute hour day-of-month month day-of-week")
+    minute, hour, day_of_month, month_of_year, day_of_week = fields
+    try:
+        return crontab(minute=minute, hour=hour, day_of_month=day_of_month,
+                       month_of_year=month_of_year, day_of_week=day_of_week)
+    except Exception as e:
+        raise ValueError(f"Invalid cron expression '{expression}': {e}")
+
+
+def jitter_offset(source_id: int, schedule: Dict[str, Any]) -> int:
+    """A fixed per-source delay, so sources on the same schedule spread out instead of firing together.
+
+    Derived from the source id rather than drawn at random, so it is the same after a restart.
+    """
+    window = schedule.get("jitter_seconds")
+    if window is None:
+        window = settings.schedule_default_jitter_seconds
+    if schedule.get("interval_seconds"):
+        window = min(window, schedule["interval_seconds"] - 1)
+    if window <= 0:
+        return 0
+    return zlib.crc32(f"source:{source_id}".encode()) % (window + 1)
+
+
+def next_run_time(schedule: Dict[str, Any], after: datetime, offset: int = 0) -> datetime:
+    """The first (jittered) run time strictly after `after`."""
+    base_after = after - timedelta(seconds=offset)
+    if schedule.get("interval_seconds"):
+        # Aligned to the epoch rather than to when the schedule was saved, so every
+        # scheduler computes the same slots.
+        interval = schedule["interval_seconds"]
+        slots = int((base_after - _EPOCH).total_seconds() // interval) + 1
+        base = _EPOCH + timedelta(seconds=slots * interval)
+    else:
+        cron = parse_cron(schedule["cron"])
+        cron.nowfun = lambda: base_after
+        base = base_after + cron.remaining_estimate(base_after)
+    return base.replace(microsecond=0) + timedelta(seconds=offset)
+
+
+class IngestionScheduler:
+    """Starts pulls for active sources whose schedule is due.
+
+    The next run time is stored on the source and advanced in the same transaction that
+    creates the run's job, so a restart neither fires a slot twice nor loses one. Slots
+    missed while the scheduler was down are coalesced into a single run.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.job_queue = JobQueue(db)
+
+    def schedule_source(self, source: DataSource, now: Optional[datetime] = None):
+        """Set the first run after the schedule was saved; clears it when the schedule is removed."""
+        if not source.schedule:
+            source.next_run_at = None
+            return
+        source.next_run_at = next_run_time(
+            source.schedule, now or datetime.utcnow(), jitter_offset(source.id, source.schedule)
+        )
+
+    async def tick(self, now: Optional[datetime] = None) -> Dict[str, List[int]]:
+        now = now or datetime.utcnow()
+        due = self.db.query(DataSource).filter(
+            DataSource.is_active == True,
+            DataSource.schedule.isnot(None),
+            DataSource.next_run_at <= now
+        ).order_by(DataSource.next_run_at).limit(settings.ingestion_scheduler_batch_size).with_for_update(
+            skip_locked=True
+        ).all()
+
+        started, skipped = [], []
+        for source in due:
+            state = dict(source.schedule_state or {})
+            scheduled_for = source.next_run_at
+            if self._previous_run_active(state.get("last_job_id")):
+                state["skipped_runs"] = state.get("skipped_runs", 0) + 1
+                state["last_skipped_at"] = scheduled_for.isoformat()
+                skipped.append(source.id)
+            else:
+                job = ProcessingJob(
+                    name=f"Scheduled Pull - {source.name}",
+                    description=f"Scheduled pull for {scheduled_for.isoformat()}",
+                    source_id=source.id,
+                    job_type=SCHEDULED_PULL_JOB_TYPE,
+                    status=JobStatus.PENDING,
+                    input_data={"scheduled_for": scheduled_for.isoformat()},
+                    lane="bulk"
+                )
+                self.db.add(job)
+                self.db.flush()
+                state["last_job_id"] = job.id
+                state["last_run_at"] = scheduled_for.isoformat()
+                started.append(job)
+            source.schedule_state = state
+            source.next_run_at = next_run_time(source.schedule, now, jitter_offset(source.id, source.schedule))
+        self.db.commit()
+
+        for job in started:
+            await self.job_queue.enqueue_task(job, "etl.pull_source", job.id)
+        return {"started": [job.id for job in started], "skipped": skipped}
+
+    def _previous_run_active(self, job_id: Optional[int]) -> bool:
+        if job_id is None:
+            return False
+        # Retries of the previous run count as the previous run. A job that was created but
+        # never queued (the scheduler died in between) does not block the schedule.
+        return self.db.query(ProcessingJob.id).filter(
+            or_(ProcessingJob.id == job_id, ProcessingJob.root_job_id == job_id),
+            or_(
+                ProcessingJob.status == JobStatus.RUNNING,
+                and_(ProcessingJob.status == JobStatus.PENDING, ProcessingJob.task_id.isnot(None))
+            )
+        ).first() is not None
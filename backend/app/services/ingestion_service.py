@@ -1,14 +1,17 @@
 import os
 import json
 import aiofiles
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, Optional
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
-from app.models.processing_job import ProcessingJob, JobStatus
+from app.models.processing_job import ProcessingJob, JobStatus, job_payload
 from app.models.data_source import DataSource
 from app.schemas.ingestion import DataIngestionRequest, SwiftMessageRequest
 from app.services.schema_detection_service import SchemaDetectionService
 from app.services.lineage_service import DataLineageService
+from app.services.job_lease import JobLease, LeaseLostError
+from app.services.job_progress import JobProgress, JobCancelledError
 from app.core.config import settings
 
 class IngestionService:
@@ -30,6 +33,7 @@ class IngestionService:
             source_id=request.source_id,
             status=JobStatus.PENDING,
             input_data=request.data,
+            lane="interactive",
             created_by=user_id
         )
         self.db.add(job)
@@ -66,6 +70,8 @@ class IngestionService:
                 "receiver": request.receiver,
                 "metadata": request.metadata
             },
+            # Payment messages must not queue behind batch reprocessing.
+            lane="realtime",
             created_by=user_id
         )
         self.db.add(job)
@@ -114,6 +120,7 @@ class IngestionService:
                 "file_size": file.size,
                 "content_type": file.content_type
             },
+            lane="bulk",
             created_by=user_id
         )
         self.db.add(job)
@@ -133,7 +140,69 @@ class IngestionService:
 
         return job
 
-    async def process_uploaded_file(self, job_id: int):
+    async def pull_source(self, job_id: int, lease: Optional[JobLease] = None, progress: Optional[JobProgress] = None):
+        """Fetch a file from the source's connection and ingest it like an upload."""
+        job = self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+        if not job:
+            return
+        source = self.db.query(DataSource).filter(DataSource.id == job.source_id).first()
+        payload = dict(job_payload(job) or {})
+
+        # A job resumed after a worker died keeps the file it already fetched, so its checkpoint still applies.
+        if not (payload.get("file_path") and os.path.exists(payload["file_path"])):
+            try:
+                if source is None:
+                    raise ValueError("Data source not found")
+                payload["file_path"] = await self._fetch_source(source.connection_config or {}, job)
+            except Exception as e:
+                self.db.rollback()
+                job.status = JobStatus.FAILED
+                job.error_message = f"Pull failed: {e}"
+                self.db.commit()
+                return
+            job.input_data = payload
+            self.db.commit()
+
+            await self.lineage_service.track_data_ingestion(
+                source_id=job.source_id,
+                job_id=job.id,
+                metadata={
+                    "ingestion_type": "scheduled_pull",
+                    "scheduled_for": payload.get("scheduled_for"),
+                    "file_path": payload["file_path"],
+                    "file_size": os.path.getsize(payload["file_path"])
+                }
+            )
+
+        await self.process_uploaded_file(job_id, lease=lease, progress=progress)
+
+    async def _fetch_source(self, connection: Dict[str, Any], job: ProcessingJob) -> str:
+        connection_type = connection.get("type")
+        if connection_type == "file":
+            if not os.path.exists(connection.get("path") or ""):
+                raise ValueError(f"File not found: {connection.get('path')}")
+            return connection["path"]
+        if connection_type in ("http", "https"):
+            import httpx
+            url = connection["url"]
+            extension = "." + connection["format"] if connection.get("format") else os.path.splitext(url.split("?")[0])[1]
+            file_path = os.path.join(settings.upload_dir, f"pull_{job.source_id}_{job.id}{extension or '.json'}")
+            # Streamed to disk: pulled files can be far larger than memory.
+            async with httpx.AsyncClient(timeout=settings.pull_timeout_seconds) as client:
+                async with client.stream(
+                    connection.get("method", "GET"),
+                    url,
+                    headers=connection.get("headers"),
+                    params=connection.get("params")
+                ) as response:
+                    response.raise_for_status()
+                    async with aiofiles.open(file_path, "wb") as f:
+                        async for block in response.aiter_bytes():
+                            await f.write(block)
+            return file_path
+        raise ValueError(f"Unsupported connection type for scheduled pulls: {connection_type!r}")
+
+    async def process_uploaded_file(self, job_id: int, lease: Optional[JobLease] = None, progress: Optional[JobProgress] = None):
         job = self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
         if not job:
             return
@@ -142,10 +211,12 @@ class IngestionService:
             job.status = JobStatus.RUNNING
             self.db.commit()
 
-            file_path = job.input_data.get("file_path")
+            file_path = job_payload(job).get("file_path")
             file_extension = os.path.splitext(file_path)[1].lower()
 
-            if file_extension == '.csv':
+            if file_extension == '.csv' and lease is not None:
+                data = await self._process_csv_file_checkpointed(file_path, job, lease, progress)
+            elif file_extension == '.csv':
                 data = await self._process_csv_file(file_path)
             elif file_extension in ['.json']:
                 data = await self._process_json_file(file_path)
@@ -162,13 +233,33 @@ class IngestionService:
 
             job.status = JobStatus.COMPLETED
             job.output_data = {"processed_data": data, "schema": detected_schema.schema_data}
-            
+            job.checkpoint = None
+            if progress is not None:
+                progress.finish()
+                progress.confirm(self.db)
+
+        except LeaseLostError:
+            # The job belongs to another worker now: leave its state and staged chunks to them.
+            self.db.rollback()
+            raise
+        except JobCancelledError as e:
+            self.db.rollback()
+            job.status = JobStatus.CANCELLED
+            job.completed_at = datetime.utcnow()
+            job.checkpoint = None
+            job.error_message = str(e)
         except Exception as e:
+            # A failed flush leaves the session unusable; without this the job stays RUNNING.
+            self.db.rollback()
             job.status = JobStatus.FAILED
             job.error_message = str(e)
         
         self.db.commit()
 
+        staged_path = self._staged_chunks_path(job.id)
+        if job.status in (JobStatus.COMPLETED, JobStatus.CANCELLED) and os.path.exists(staged_path):
+            os.remove(staged_path)
+
     async def get_job_status(self, job_id: int):
         job = self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
         if not job:
@@ -181,7 +272,9 @@ class IngestionService:
             "created_at": job.created_at,
             "started_at": job.started_at,
             "completed_at": job.completed_at,
-            "error_message": job.error_message
+            "error_message": job.error_message,
+            "progress": job.progress,
+            "cancel_requested": job.cancel_requested_at is not None
         }
 
     async def _parse_swift_message(self, message_content: str, message_type: str) -> Dict[str, Any]:
@@ -211,6 +304,70 @@ class IngestionService:
             "row_count": len(df)
         }
 
+    async def _process_csv_file_checkpointed(
+        self,
+        file_path: str,
+        job: ProcessingJob,
+        lease: JobLease,
+        progress: Optional[JobProgress] = None
+    ) -> Dict[str, Any]:
+        import pandas as pd
+        # Parsed chunks are appended to a staging file and checkpointed, so a job picked up
+        # again after a worker dies continues after the last completed chunk.
+        staged_path = self._staged_chunks_path(job.id)
+        checkpoint = job.checkpoint if (job.checkpoint or {}).get("path") == staged_path else {}
+        rows_done = checkpoint.get("rows_done", 0)
+        chunks_done = checkpoint.get("chunks_done", 0)
+        columns = checkpoint.get("columns")
+
+        if progress is not None:
+            progress.start("ingest", rows_total=self._estimate_rows(file_path), rows_done=rows_done, chunks_done=chunks_done)
+
+        os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+        with open(staged_path, "a+b") as f:
+            # Anything past the checkpointed offset is a chunk that was written but never committed.
+            f.truncate(checkpoint.get("offset", 0))
+            f.seek(0, os.SEEK_END)
+            reader = pd.read_csv(file_path, chunksize=settings.ingestion_chunk_rows, skiprows=range(1, rows_done + 1))
+            for chunk in reader:
+                columns = chunk.columns.tolist()
+                lines = chunk.to_json(orient="records", lines=True, double_precision=15)
+                f.write((lines if lines.endswith("\n") else lines + "\n").encode())
+                f.flush()
+                os.fsync(f.fileno())
+                rows_done += len(chunk)
+                chunks_done += 1
+                lease.checkpoint({
+                    "stage": "ingest",
+                    "path": staged_path,
+                    "offset": f.tell(),
+                    "rows_done": rows_done,
+                    "chunks_done": chunks_done,
+                    "columns": columns
+                })
+                if progress is not None:
+                    # Between chunks: a cancel request stops the job here, after its last checkpoint.
+                    progress.advance(rows=len(chunk))
+
+        with open(staged_path, "r") as f:
+            data = [json.loads(line) for line in f if line.strip()]
+        return {
+            "columns": columns or [],
+            "data": data,
+            "row_count": len(data)
+        }
+
+    def _estimate_rows(self, file_path: str) -> int:
+        # Counting newlines is far cheaper than parsing; quoted line breaks make it an estimate.
+        lines = 0
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                lines += block.count(b"\n")
+        return max(lines - 1, 0)
+
+    def _staged_chunks_path(self, job_id: int) -> str:
+        return os.path.join(settings.staging_dir, "ingest", f"job_{job_id}.ndjson")
+
     async def _process_json_file(self, file_path: str) -> Dict[str, Any]:
         async with aiofiles.open(file_path, 'r') as f:
             content = await f.read()
@@ -0,0 +1,214 @@
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from uuid import uuid4
+from sqlalchemy import update, or_, and_
+from sqlalchemy.orm import Session
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.lineage_service import DataLineageService
+from app.core.config import settings
+
+
+class LeaseLostError(RuntimeError):
+    pass
+
+
+def worker_identity() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+class JobLease:
+    """Exclusive ownership of a running job, kept alive by a heartbeat thread.
+
+    Lease updates go through their own short sessions so they never wait on, or commit,
+    the job's working session.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        job_id: int,
+        owner: Optional[str] = None,
+        lease_seconds: Optional[int] = None,
+        heartbeat_seconds: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.job_id = job_id
+        self.owner = owner or worker_identity()
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds or settings.job_heartbeat_seconds
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "JobLease":
+        self._thread = threading.Thread(target=self._heartbeat_loop, name=f"lease-{self.job_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.release()
+        return False
+
+    def acquire(self) -> bool:
+        now = datetime.utcnow()
+        # Unowned queued jobs, or jobs whose owner stopped renewing. The check and the claim
+        # are one UPDATE, so of two workers given the same job only one gets it; moving it to
+        # RUNNING also keeps stale-dispatch release from publishing it again.
+        claimable = and_(
+            ProcessingJob.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+            or_(
+                and_(ProcessingJob.status == JobStatus.PENDING, ProcessingJob.lease_owner.is_(None)),
+                ProcessingJob.lease_expires_at < now
+            )
+        )
+        return self._update(
+            claimable,
+            status=JobStatus.RUNNING,
+            lease_owner=self.owner,
+            lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+            heartbeat_at=now,
+            attempts=ProcessingJob.attempts + 1
+        )
+
+    def heartbeat(self) -> bool:
+        now = datetime.utcnow()
+        renewed = self._update(
+            ProcessingJob.lease_owner == self.owner,
+            lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+            heartbeat_at=now
+        )
+        if not renewed:
+            self.lost.set()
+        return renewed
+
+    def checkpoint(self, state: Dict[str, Any]):
+        """Record progress and renew the lease in one write; raises if the lease was lost."""
+        now = datetime.utcnow()
+        if self.lost.is_set() or not self._update(
+            ProcessingJob.lease_owner == self.owner,
+            checkpoint=state,
+            lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+            heartbeat_at=now
+        ):
+            self.lost.set()
+            raise LeaseLostError(f"Lease on job {self.job_id} was lost; another worker may have taken it over")
+
+    def confirm(self, db: Session):
+        """Lock the job's row in the caller's transaction and check the lease is still ours.
+
+        Called just before a job commits its result, so a worker that lost the job to
+        another one cannot overwrite the new owner's state or promote the same rows twice.
+        """
+        owner = db.query(ProcessingJob.lease_owner).filter(ProcessingJob.id == self.job_id).with_for_update().scalar()
+        if self.lost.is_set() or owner != self.owner:
+            self.lost.set()
+            raise LeaseLostError(f"Lease on job {self.job_id} was lost; another worker may have taken it over")
+
+    def settle(self, error: Optional[BaseException] = None, retry_status: Optional[str] = None) -> bool:
+        """Give a job its task left unfinished a final status, so it never holds a lane slot or
+        gets published again. Jobs that recorded their own outcome, or that another worker
+        took over, are left alone."""
+        unfinished = and_(
+            ProcessingJob.lease_owner == self.owner,
+            ProcessingJob.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
+        )
+        outcome = {
+            "error_message": str(error) if error is not None else "Task finished without recording a result",
+            "completed_at": datetime.utcnow()
+        }
+        if retry_status is not None:
+            outcome["retry_status"] = retry_status
+        # A job asked to stop counts as cancelled whichever way its task ended.
+        return self._update(and_(unfinished, ProcessingJob.cancel_requested_at.isnot(None)),
+                            status=JobStatus.CANCELLED, **outcome) \
+            or self._update(unfinished, status=JobStatus.FAILED, **outcome)
+
+    def release(self):
+        self._update(ProcessingJob.lease_owner == self.owner, lease_owner=None, lease_expires_at=None)
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            try:
+                if not self.heartbeat():
+                    return
+            except Exception:
+                # A database blip must not kill the job; the next beat tries again.
+                continue
+
+    def _update(self, condition, **values) -> bool:
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(ProcessingJob)
+                .where(ProcessingJob.id == self.job_id, condition)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            return result.rowcount == 1
+        finally:
+            db.close()
+
+
+class JobLeaseService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.lineage_service = DataLineageService(db)
+
+    async def reap_expired_leases(self, limit: int = 500) -> Dict[str, List[int]]:
+        """Requeue running jobs whose worker stopped heartbeating, or fail them once out of attempts."""
+        from app.services.job_queue import JobQueue
+        from app.services.pipeline_service import PipelineService
+        from app.services.retry_scheduler import RETRY_EXHAUSTED
+
+        expired = self.db.query(ProcessingJob).filter(
+            ProcessingJob.status == JobStatus.RUNNING,
+            ProcessingJob.lease_expires_at < datetime.utcnow()
+        ).order_by(ProcessingJob.lease_expires_at).limit(limit).with_for_update(skip_locked=True).all()
+
+        requeued, failed, cancelled = [], [], set()
+        for job in expired:
+            previous_owner = job.lease_owner
+            job.lease_owner = None
+            job.lease_expires_at = None
+            if job.cancel_requested_at is not None:
+                # Asked to stop before its worker died: finish the cancellation instead of rerunning it.
+                job.status = JobStatus.CANCELLED
+                job.completed_at = datetime.utcnow()
+                failed.append(job.id)
+                cancelled.add(job.id)
+            elif (job.attempts or 0) >= settings.job_max_attempts or not job.task_name:
+                job.status = JobStatus.FAILED
+                job.completed_at = datetime.utcnow()
+                job.error_message = (
+                    f"Worker {previous_owner} stopped heartbeating; "
+                    f"gave up after {job.attempts or 0} attempts"
+                )
+                # Already out of attempts: the retry scheduler must not add its own on top.
+                job.retry_status = RETRY_EXHAUSTED
+                failed.append(job.id)
+            else:
+                requeued.append(job.id)
+        self.db.commit()
+
+        job_queue = JobQueue(self.db)
+        for job in expired:
+            if job.id in requeued:
+                await job_queue.requeue(job)
+
+        for run_id in {job.pipeline_run_id for job in expired if job.id in failed and job.pipeline_run_id}:
+            await PipelineService(self.db).advance(run_id)
+
+        for job_id in requeued + failed:
+            await self.lineage_service.track_workflow_event(
+                job_id=job_id,
+                event_type="job_lease_expired",
+                metadata={"action": "requeued" if job_id in requeued else "cancelled" if job_id in cancelled else "failed"}
+            )
+        return {"requeued": requeued, "failed": failed}
@@ -0,0 +1,106 @@
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.processing_job import ProcessingJob
+from app.services.job_lease import JobLease, LeaseLostError
+from app.core.config import settings
+
+
+class JobCancelledError(RuntimeError):
+    pass
+
+
+class JobProgress:
+    """Rows, chunks and ETA of a running job, and the check for a cancel request.
+
+    Progress is kept in memory and written through its own short session at most every
+    `progress_update_seconds`, so reporting it never commits (or waits on) the job's
+    working session. Cancellation, and the loss of the job's lease, is checked at every
+    chunk boundary.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        job_id: int,
+        update_seconds: Optional[float] = None,
+        lease: Optional[JobLease] = None
+    ):
+        self.session_factory = session_factory
+        self.job_id = job_id
+        self.lease = lease
+        self.update_seconds = settings.progress_update_seconds if update_seconds is None else update_seconds
+        self.state: Dict[str, Any] = {}
+        self._started = None
+        self._rows_at_start = 0
+        self._last_write = None
+
+    def start(self, stage: str, rows_total: Optional[int] = None, chunks_total: Optional[int] = None,
+              rows_done: int = 0, chunks_done: int = 0):
+        self._started = time.monotonic()
+        # Rows done by an earlier attempt do not count towards this attempt's rate.
+        self._rows_at_start = rows_done
+        self.state = {
+            "stage": stage,
+            "rows_done": rows_done,
+            "rows_total": rows_total,
+            "chunks_done": chunks_done,
+            "chunks_total": chunks_total,
+            "rows_per_second": None,
+            "eta_seconds": None
+        }
+        self._write()
+        self.raise_if_cancelled()
+
+    def advance(self, rows: int = 0, chunks: int = 1, rows_done: Optional[int] = None):
+        """Record a finished chunk; raises JobCancelledError if the job was asked to stop."""
+        self.state["rows_done"] = self.state["rows_done"] + rows if rows_done is None else rows_done
+        self.state["chunks_done"] += chunks
+        elapsed = time.monotonic() - self._started
+        rate = (self.state["rows_done"] - self._rows_at_start) / elapsed if elapsed > 0 else None
+        self.state["rows_per_second"] = round(rate, 1) if rate else None
+        if rate and self.state["rows_total"]:
+            self.state["eta_seconds"] = round(max(self.state["rows_total"] - self.state["rows_done"], 0) / rate, 1)
+        if time.monotonic() - self._last_write >= self.update_seconds:
+            self._write()
+        self.raise_if_cancelled()
+
+    def finish(self):
+        self.state["eta_seconds"] = 0.0
+        self._write()
+
+    def confirm(self, db: Session):
+        """Check, in the caller's transaction, that this worker still owns the job before it commits a result."""
+        if self.lease is not None:
+            self.lease.confirm(db)
+
+    def raise_if_cancelled(self):
+        if self.lease is not None and self.lease.lost.is_set():
+            # Another worker owns the job now; stop without writing anything more to it.
+            raise LeaseLostError(f"Lease on job {self.job_id} was lost; another worker may have taken it over")
+        db = self.session_factory()
+        try:
+            requested = db.query(ProcessingJob.cancel_requested_at).filter(ProcessingJob.id == self.job_id).scalar()
+        finally:
+            db.close()
+        if requested is not None:
+            # Leave the progress where the job stopped.
+            self.state["eta_seconds"] = None
+            self._write()
+            raise JobCancelledError(f"Job {self.job_id} was cancelled")
+
+    def _write(self):
+        self._last_write = time.monotonic()
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(ProcessingJob)
+                .where(ProcessingJob.id == self.job_id)
+                .values(progress={**self.state, "updated_at": datetime.utcnow().isoformat()})
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
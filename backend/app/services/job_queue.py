@@ -0,0 +1,116 @@
+from datetime import datetime
+from typing import List
+from uuid import uuid4
+from sqlalchemy.orm import Session
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.models.workflow import ApprovalType
+from app.schemas.processing import TransformationRuleCreate
+from app import tasks
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.services.lane_scheduler import LaneScheduler, DEFAULT_TASK_LANES, publish_job
+
+
+class JobQueue:
+    """Hands processing jobs to the worker pool instead of running them in the API process.
+
+    Jobs are queued in their lane (set on the job, or the task's default) and released to
+    the workers by the LaneScheduler as the lane has capacity.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def enqueue_ingestion(self, job: ProcessingJob) -> str:
+        return await self._enqueue(job, tasks.process_uploaded_file, job.id)
+
+    async def enqueue_transformation(
+        self,
+        job: ProcessingJob,
+        rules: List[TransformationRuleCreate],
+        capture_cprofile: bool = False
+    ) -> str:
+        return await self._enqueue(
+            job, tasks.apply_transformation_rules, job.id, [rule.dict() for rule in rules], capture_cprofile
+        )
+
+    async def enqueue_approved_job(self, job: ProcessingJob, approval_type: ApprovalType) -> str:
+        return await self._enqueue(job, tasks.execute_approved_job, job.id, approval_type.value)
+
+    async def enqueue_incremental(self, job: ProcessingJob) -> str:
+        return await self._enqueue(job, tasks.run_incremental, job.id)
+
+    async def enqueue_task(self, job: ProcessingJob, task_name: str, *args) -> str:
+        return await self._enqueue(job, celery_app.tasks[task_name], *args)
+
+    async def requeue(self, job: ProcessingJob) -> str:
+        """Publish a job again with the task and arguments it was first queued with."""
+        return await self._enqueue(job, celery_app.tasks[job.task_name], *(job.task_args or []), resume=True)
+
+    async def cancel(self, job: ProcessingJob) -> str:
+        """Cancel a queued job outright, or ask a running one to stop at its next chunk boundary."""
+        from app.services.pipeline_service import PipelineService
+
+        if job.status == JobStatus.RUNNING:
+            job.cancel_requested_at = job.cancel_requested_at or datetime.utcnow()
+            self.db.commit()
+            return "cancelling"
+        if job.status != JobStatus.PENDING:
+            raise ValueError(f"Job is already {job.status.value}")
+
+        # Not started: a worker that still receives it finds it no longer pending and skips it.
+        job.status = JobStatus.CANCELLED
+        job.cancel_requested_at = datetime.utcnow()
+        job.completed_at = job.cancel_requested_at
+        job.error_message = f"Job {job.id} was cancelled"
+        self.db.commit()
+
+        if job.pipeline_run_id is not None:
+            await PipelineService(self.db).advance(job.pipeline_run_id)
+        if job.lane is not None and job.dispatched_at is not None:
+            await LaneScheduler(self.db).dispatch(job.lane)
+        return "cancelled"
+
+    def stage_transformation(self, job: ProcessingJob, rules: List[TransformationRuleCreate]):
+        """Mark a transformation queued as part of the caller's transaction; release() it after commit."""
+        self._stage(job, tasks.apply_transformation_rules, job.id, [rule.dict() for rule in rules], False)
+
+    def stage_approved_job(self, job: ProcessingJob, approval_type: ApprovalType):
+        """Mark an approved job queued as part of the caller's transaction; release() it after commit."""
+        self._stage(job, tasks.execute_approved_job, job.id, approval_type.value)
+
+    async def release(self, jobs: List[ProcessingJob]):
+        """Hand committed, queued jobs to the workers."""
+        if settings.fair_scheduling_enabled:
+            for lane in sorted({job.lane for job in jobs}):
+                await LaneScheduler(self.db).dispatch(lane)
+            return
+        for job in jobs:
+            job.dispatched_at = job.queued_at
+        self.db.commit()
+        for job in jobs:
+            publish_job(job)
+
+    async def _enqueue(self, job: ProcessingJob, task, *args, resume: bool = False) -> str:
+        self._stage(job, task, *args, resume=resume)
+        # Commit before publishing so a fast worker never loads the job before it is queued.
+        self.db.commit()
+        await self.release([job])
+        return job.task_id
+
+    def _stage(self, job: ProcessingJob, task, *args, resume: bool = False):
+        if not resume:
+            # A fresh request starts over; a requeue keeps its attempt count and checkpoint.
+            job.attempts = 0
+            job.checkpoint = None
+        job.status = JobStatus.PENDING
+        job.task_id = str(uuid4())
+        job.task_name = task.name
+        job.task_args = list(args)
+        job.lane = job.lane or DEFAULT_TASK_LANES.get(task.name, "bulk")
+        job.priority = job.priority or 0
+        job.queued_at = datetime.utcnow()
+        job.dispatched_at = None
+        job.cancel_requested_at = None
+        job.progress = None
+        job.error_message = None
@@ -0,0 +1,143 @@
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+import numpy as np
+from sqlalchemy import func, or_, and_, text
+from sqlalchemy.orm import Session
+from app.models.data_source import DataSource
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.core.celery_app import celery_app
+from app.core.config import settings
+
+LANES = ("realtime", "interactive", "bulk")
+
+# Lane used when neither the job nor the caller picked one.
+DEFAULT_TASK_LANES = {
+    "etl.process_uploaded_file": "bulk",
+    "etl.pull_source": "bulk",
+    "etl.apply_transformation_rules": "interactive",
+    "etl.execute_approved_job": "bulk",
+    "etl.run_incremental": "bulk",
+}
+
+
+def publish_job(job: ProcessingJob):
+    celery_app.tasks[job.task_name].apply_async(args=job.task_args or [], task_id=job.task_id, queue=job.lane)
+
+
+class LaneScheduler:
+    """Releases queued jobs to their lane's workers, at most the lane's capacity at a time.
+
+    Jobs wait in the database rather than in the broker, so the choice of which job runs next
+    is made when a slot frees up: the source with the fewest in-flight jobs for its weight
+    goes first, and within a source, higher priority and then the oldest job.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def dispatch(self, lane: str) -> List[int]:
+        self._lock_lane(lane)
+        now = datetime.utcnow()
+        in_flight = self._in_flight_by_source(lane)
+        free = settings.lane_concurrency.get(lane, 1) - sum(in_flight.values())
+
+        dispatched = []
+        while free > 0:
+            job = self._next_job(lane, in_flight)
+            if job is None:
+                break
+            job.dispatched_at = now
+            in_flight[job.source_id] = in_flight.get(job.source_id, 0) + 1
+            dispatched.append(job)
+            free -= 1
+        # Commit (and release the lane lock) before publishing; in eager mode the job runs right away.
+        self.db.commit()
+
+        for job in dispatched:
+            publish_job(job)
+        return [job.id for job in dispatched]
+
+    async def dispatch_all(self) -> Dict[str, List[int]]:
+        self._release_stale_dispatches()
+        return {lane: await self.dispatch(lane) for lane in LANES}
+
+    async def lane_metrics(self, window_minutes: int = 15) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        since = now - timedelta(minutes=window_minutes)
+        metrics = {}
+        for lane in LANES:
+            waiting = self.db.query(
+                func.count(ProcessingJob.id), func.min(ProcessingJob.queued_at)
+            ).filter(*self._waiting(lane)).one()
+            waits = np.array([
+                (dispatched - queued).total_seconds()
+                for queued, dispatched in self.db.query(ProcessingJob.queued_at, ProcessingJob.dispatched_at).filter(
+                    ProcessingJob.lane == lane,
+                    ProcessingJob.dispatched_at >= since
+                ).order_by(ProcessingJob.dispatched_at.desc()).limit(5000).all()
+            ])
+            metrics[lane] = {
+                "capacity": settings.lane_concurrency.get(lane, 1),
+                "in_flight": sum(self._in_flight_by_source(lane).values()),
+                "waiting": waiting[0],
+                "oldest_waiting_seconds": (now - waiting[1]).total_seconds() if waiting[1] else 0.0,
+                "queue_wait_seconds": {
+                    "count": int(len(waits)),
+                    "p50": float(np.percentile(waits, 50)) if len(waits) else None,
+                    "p95": float(np.percentile(waits, 95)) if len(waits) else None,
+                    "max": float(waits.max()) if len(waits) else None
+                }
+            }
+        return {"window_minutes": window_minutes, "lanes": metrics}
+
+    def _next_job(self, lane: str, in_flight: Dict[Optional[int], int]) -> Optional[ProcessingJob]:
+        heads = self.db.query(
+            ProcessingJob.source_id, func.min(ProcessingJob.queued_at)
+        ).filter(*self._waiting(lane)).group_by(ProcessingJob.source_id).all()
+        if not heads:
+            return None
+
+        weights = dict(self.db.query(DataSource.id, DataSource.scheduling_weight).filter(
+            DataSource.id.in_([source_id for source_id, _ in heads if source_id is not None])
+        ).all())
+        # Priority only orders jobs within a source; across sources it would let one source starve the rest.
+        source_id, _ = min(heads, key=lambda head: (
+            in_flight.get(head[0], 0) / (weights.get(head[0]) or 1.0),
+            head[1]
+        ))
+        return self.db.query(ProcessingJob).filter(
+            *self._waiting(lane),
+            ProcessingJob.source_id.is_(None) if source_id is None else ProcessingJob.source_id == source_id
+        ).order_by(ProcessingJob.priority.desc(), ProcessingJob.queued_at).with_for_update(skip_locked=True).first()
+
+    def _in_flight_by_source(self, lane: str) -> Dict[Optional[int], int]:
+        return dict(self.db.query(ProcessingJob.source_id, func.count(ProcessingJob.id)).filter(
+            ProcessingJob.lane == lane,
+            or_(
+                ProcessingJob.status == JobStatus.RUNNING,
+                and_(ProcessingJob.status == JobStatus.PENDING, ProcessingJob.dispatched_at.isnot(None))
+            )
+        ).group_by(ProcessingJob.source_id).all())
+
+    def _waiting(self, lane: str):
+        return (
+            ProcessingJob.lane == lane,
+            ProcessingJob.status == JobStatus.PENDING,
+            ProcessingJob.task_name.isnot(None),
+            ProcessingJob.dispatched_at.is_(None)
+        )
+
+    def _lock_lane(self, lane: str):
+        # Serialises dispatchers per lane so two of them cannot both fill the same free slot.
+        if self.db.bind.dialect.name == "postgresql":
+            self.db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": zlib.crc32(f"lane:{lane}".encode())})
+
+    def _release_stale_dispatches(self):
+        # Dispatched but never picked up (lost message): put it back in line.
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.dispatch_timeout_seconds)
+        self.db.query(ProcessingJob).filter(
+            ProcessingJob.status == JobStatus.PENDING,
+            ProcessingJob.dispatched_at < cutoff
+        ).update({"dispatched_at": None}, synchronize_session=False)
+        self.db.commit()
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 from app.models.data_lineage import DataLineage
 from datetime import datetime
@@ -17,7 +17,7 @@ class DataLineageService:
             source_id=source_id,
             job_id=job_id,
             event_type="ingestion",
-            metadata=metadata,
+            additional_metadata=metadata,
             timestamp=datetime.utcnow()
         )
         
@@ -31,18 +31,20 @@ class DataLineageService:
         job_id: int, 
         transformation_rules: List[str],
         input_schema: Dict,
-        output_schema: Dict
+        output_schema: Dict,
+        metadata: Optional[Dict[str, Any]] = None
     ) -> DataLineage:
         metadata = {
             "transformation_rules": transformation_rules,
             "transformation_timestamp": datetime.utcnow().isoformat(),
-            "rules_count": len(transformation_rules)
+            "rules_count": len(transformation_rules),
+            **(metadata or {})
         }
         
         lineage = DataLineage(
             job_id=job_id,
             event_type="transformation",
-            metadata=metadata,
+            additional_metadata=metadata,
             input_schema=input_schema,
             output_schema=output_schema,
             transformation_details={
@@ -66,7 +68,7 @@ class DataLineageService:
         lineage = DataLineage(
             job_id=job_id,
             event_type=event_type,
-            metadata=metadata,
+            additional_metadata=metadata,
             timestamp=datetime.utcnow()
         )
         
@@ -75,6 +77,21 @@ class DataLineageService:
         self.db.refresh(lineage)
         return lineage
 
+    def add_workflow_events(self, events: List[Dict[str, Any]]) -> List[DataLineage]:
+        """Add many workflow events to the caller's transaction; committed with it, in one flush."""
+        now = datetime.utcnow()
+        records = [
+            DataLineage(
+                job_id=event["job_id"],
+                event_type=event["event_type"],
+                additional_metadata=event.get("metadata") or {},
+                timestamp=now
+            )
+            for event in events
+        ]
+        self.db.add_all(records)
+        return records
+
     async def track_data_output(
         self,
         job_id: int,
@@ -90,7 +107,7 @@ class DataLineageService:
         lineage = DataLineage(
             job_id=job_id,
             event_type="output",
-            metadata=metadata,
+            additional_metadata=metadata,
             timestamp=datetime.utcnow()
         )
         
@@ -117,7 +134,7 @@ class DataLineageService:
                 "id": record.id,
                 "event_type": record.event_type,
                 "timestamp": record.timestamp.isoformat(),
-                "metadata": record.metadata
+                "metadata": record.additional_metadata
             }
             
             if record.input_schema:
@@ -150,7 +167,7 @@ class DataLineageService:
                 "job_id": record.job_id,
                 "event_type": record.event_type,
                 "timestamp": record.timestamp.isoformat(),
-                "metadata": record.metadata
+                "metadata": record.additional_metadata
             }
             for record in lineage_records
         ]
@@ -164,10 +181,10 @@ class DataLineageService:
         ).all()
         
         for record in lineage_records:
-            destination = record.metadata.get("destination")
+            destination = (record.additional_metadata or {}).get("destination")
             if destination:
                 downstream_jobs = self.db.query(DataLineage).filter(
-                    DataLineage.metadata.contains({"source": destination})
+                    DataLineage.additional_metadata["source"].as_string() == destination
                 ).all()
                 
                 for downstream in downstream_jobs:
@@ -231,13 +248,15 @@ class DataLineageService:
 
     def _generate_event_description(self, record: DataLineage) -> str:
         event_type = record.event_type
-        metadata = record.metadata or {}
+        metadata = record.additional_metadata or {}
         
         if event_type == "ingestion":
             ingestion_type = metadata.get("ingestion_type", "unknown")
             return f"Data ingested via {ingestion_type}"
         elif event_type == "transformation":
             rules_count = metadata.get("rules_count", 0)
+            if metadata.get("cache_hit"):
+                return f"Applied {rules_count} transformation rules (cached result)"
             return f"Applied {rules_count} transformation rules"
         elif event_type == "output":
             destination = metadata.get("destination", "unknown")
@@ -0,0 +1,77 @@
+from typing import Dict, Any, Tuple
+import numpy as np
+import pandas as pd
+from app.services.dataframe_profile import profile_dataframe
+
+MAX_CATEGORY_RATIO = 0.5
+MAX_CATEGORIES = 10_000
+
+
+def _column_bytes(series: pd.Series) -> int:
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def _downcast_integer(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_extension_array_dtype(series.dtype):
+        # Nullable Int64 from validate_data_types: pick the smallest nullable width that fits.
+        values = series.dropna()
+        if values.empty:
+            return series
+        low, high = values.min(), values.max()
+        for dtype, info in (("Int8", np.iinfo(np.int8)), ("Int16", np.iinfo(np.int16)), ("Int32", np.iinfo(np.int32))):
+            if info.min <= low and high <= info.max:
+                return series.astype(dtype)
+        return series
+    return pd.to_numeric(series, downcast="integer")
+
+
+def _downcast_float(series: pd.Series) -> pd.Series:
+    narrowed = series.astype(np.float32)
+    # Only keep float32 when every value survives the round trip unchanged.
+    if np.array_equal(narrowed.to_numpy(dtype=np.float64), series.to_numpy(dtype=np.float64), equal_nan=True):
+        return narrowed
+    return series
+
+
+def optimize_dtypes(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    profile = profile_dataframe(df)
+    columns: Dict[str, Any] = {}
+
+    for column in df.columns:
+        series = df[column]
+        optimized = series
+
+        if pd.api.types.is_bool_dtype(series.dtype):
+            pass
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            optimized = _downcast_integer(series)
+        elif pd.api.types.is_float_dtype(series.dtype):
+            optimized = _downcast_float(series)
+        elif series.dtype == object and len(series):
+            unique_count = profile.columns[column]["unique_count"]
+            if unique_count <= MAX_CATEGORIES and unique_count <= len(series) * MAX_CATEGORY_RATIO:
+                try:
+                    optimized = series.astype("category")
+                except TypeError:
+                    optimized = series
+
+        before = _column_bytes(series)
+        after = _column_bytes(optimized)
+        if optimized is not series and after < before:
+            df[column] = optimized
+        else:
+            optimized, after = series, before
+
+        columns[str(column)] = {
+            "from_dtype": str(series.dtype),
+            "to_dtype": str(optimized.dtype),
+            "bytes_before": before,
+            "bytes_after": after
+        }
+
+    profile.update_dtypes(df)
+    return df, {
+        "bytes_before": sum(info["bytes_before"] for info in columns.values()),
+        "bytes_after": sum(info["bytes_after"] for info in columns.values()),
+        "columns": columns
+    }
@@ -1,7 +1,7 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models.workflow import WorkflowApproval
 from app.models.exception import DataException
@@ -50,6 +50,27 @@ class NotificationService:
 
         await self._send_email(submitter.email, subject, message)
 
+    async def notify_approval_digest(self, submitter_id: int, approvals: List[WorkflowApproval], comments: Optional[str] = None):
+        """One message per submitter for a batch of decisions instead of one per approval."""
+        submitter = self.db.query(User).filter(User.id == submitter_id).first()
+        if not submitter or not approvals:
+            return
+
+        lines = "\n".join(
+            f"        - Job {approval.job_id} ({approval.approval_type.value}): {approval.state.value}"
+            for approval in approvals
+        )
+        subject = f"Approval decisions: {len(approvals)} request{'s' if len(approvals) != 1 else ''}"
+        message = f"""
+        Decisions were made on {len(approvals)} of your approval requests.
+
+{lines}
+
+        Approver Comments: {comments or 'No comments'}
+        """
+
+        await self._send_email(submitter.email, subject, message)
+
     async def send_exception_alert(self, exception: DataException):
         admins = self.db.query(User).filter(
             User.role == UserRole.ADMIN,
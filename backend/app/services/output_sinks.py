@@ -0,0 +1,215 @@
+import gzip
+import os
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import quote
+import pandas as pd
+from app.models.processing_job import ProcessingJob
+from app.services.promotion_engine import job_frame
+from app.core.config import settings
+
+FORMAT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv", "ndjson": ".ndjson"}
+FORMAT_COMPRESSIONS = {
+    "parquet": ["snappy", "zstd", "gzip", "brotli", "lz4", "none"],
+    "arrow": ["zstd", "lz4", "none"],
+    "csv": ["gzip", "none"],
+    "ndjson": ["gzip", "none"]
+}
+DEFAULT_COMPRESSIONS = {"parquet": "snappy", "arrow": "none", "csv": "none", "ndjson": "none"}
+
+# Hive's name for the partition of null values, understood by Spark, DuckDB and pyarrow.
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def validate_sink(sink: Dict[str, Any]):
+    fmt = sink.get("format", "parquet")
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unknown sink format '{fmt}'")
+    compression = sink.get("compression")
+    if compression is not None and compression not in FORMAT_COMPRESSIONS[fmt]:
+        raise ValueError(f"{fmt} sinks support compression {FORMAT_COMPRESSIONS[fmt]}, not '{compression}'")
+    if fmt in ("parquet", "arrow"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError(f"{fmt} sinks need pyarrow installed")
+
+
+def partition_value(value) -> str:
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return NULL_PARTITION
+    if isinstance(value, pd.Timestamp):
+        value = value.date().isoformat() if value == value.normalize() else value.isoformat()
+    return quote(str(value), safe="")
+
+
+class _PartitionFile:
+    """One partition's file for this job, written under a hidden name until the sink commits."""
+
+    def __init__(self, directory: str, job_id: int, fmt: str, compression: str, schema):
+        suffix = FORMAT_EXTENSIONS[fmt] + (".gz" if compression == "gzip" and fmt in ("csv", "ndjson") else "")
+        self.path = os.path.join(directory, f"job_{job_id}{suffix}")
+        # Dot-prefixed files are skipped by dataset readers, so half-written output is never read.
+        self.tmp_path = os.path.join(directory, f".job_{job_id}{suffix}.tmp")
+        self.fmt = fmt
+        self.compression = compression
+        self.schema = schema
+        self.rows = 0
+        self._writer = None
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, frame: pd.DataFrame, row_group_rows: int):
+        if self.fmt in ("parquet", "arrow"):
+            import pyarrow as pa
+            table = pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+            if self._writer is None:
+                self._writer = self._open_arrow_writer()
+            if self.fmt == "parquet":
+                self._writer.write_table(table, row_group_size=row_group_rows)
+            else:
+                self._writer.write_table(table, max_chunksize=row_group_rows)
+        else:
+            if self._writer is None:
+                self._writer = gzip.open(self.tmp_path, "wt", newline="") if self.compression == "gzip" \
+                    else open(self.tmp_path, "w", newline="")
+            if self.fmt == "csv":
+                frame.to_csv(self._writer, index=False, header=self.rows == 0)
+            else:
+                lines = frame.to_json(orient="records", lines=True, date_format="iso")
+                self._writer.write(lines if lines.endswith("\n") else lines + "\n")
+        self.rows += len(frame)
+
+    def _open_arrow_writer(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self.fmt == "parquet":
+            return pq.ParquetWriter(self.tmp_path, self.schema, compression=self.compression)
+        options = pa.ipc.IpcWriteOptions(compression=None if self.compression == "none" else self.compression)
+        return pa.ipc.new_file(self.tmp_path, self.schema, options=options)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def commit(self) -> int:
+        os.replace(self.tmp_path, self.path)
+        return os.path.getsize(self.path)
+
+    def abort(self):
+        self.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class OutputSinkWriter:
+    """Streams chunks of a job's rows into a Hive-partitioned dataset directory.
+
+    Rows are grouped by the sink's partition columns into `<column>=<value>/job_<id>.<ext>`
+    files under `OUTPUT_DIR/<sink name>`. Each partition buffers rows until a full row group
+    is available, so row groups keep their configured size however the chunks split them.
+    Files stay hidden until `commit`, and a rerun of the same job replaces its own files.
+    """
+
+    def __init__(self, sink: Dict[str, Any], job_id: int, df: pd.DataFrame):
+        validate_sink(sink)
+        self.sink = sink
+        self.job_id = job_id
+        self.fmt = sink.get("format", "parquet")
+        self.compression = sink.get("compression") or DEFAULT_COMPRESSIONS[self.fmt]
+        self.partition_by = sink.get("partition_by") or []
+        self.row_group_rows = sink.get("row_group_rows") or settings.output_row_group_rows
+        self.directory = os.path.join(settings.output_dir, sink["name"])
+        missing = [column for column in self.partition_by if column not in df.columns]
+        if missing:
+            raise ValueError(f"Partition columns not in job {job_id} output: {missing}")
+        self.schema = None
+        if self.fmt in ("parquet", "arrow"):
+            import pyarrow as pa
+            # One schema for every chunk, inferred from the whole frame, so files never disagree.
+            self.schema = pa.Schema.from_pandas(df.drop(columns=self.partition_by), preserve_index=False)
+        self._files: Dict[Tuple, _PartitionFile] = {}
+        self._buffers: Dict[Tuple, List[pd.DataFrame]] = {}
+        self._started = time.perf_counter()
+
+    def write(self, chunk: pd.DataFrame):
+        if not self.partition_by:
+            self._buffer((), chunk)
+            return
+        for values, group in chunk.groupby(self.partition_by, dropna=False, sort=False):
+            key = values if isinstance(values, tuple) else (values,)
+            self._buffer(key, group.drop(columns=self.partition_by))
+
+    def _buffer(self, key: Tuple, frame: pd.DataFrame):
+        buffered = self._buffers.setdefault(key, [])
+        buffered.append(frame)
+        if sum(len(part) for part in buffered) >= self.row_group_rows:
+            self._flush(key)
+
+    def _flush(self, key: Tuple):
+        buffered = self._buffers.pop(key, [])
+        if not buffered:
+            return
+        if key not in self._files:
+            directory = os.path.join(self.directory, *[
+                f"{column}={partition_value(value)}" for column, value in zip(self.partition_by, key)
+            ])
+            self._files[key] = _PartitionFile(directory, self.job_id, self.fmt, self.compression, self.schema)
+        self._files[key].write(pd.concat(buffered, ignore_index=True), self.row_group_rows)
+
+    def close(self):
+        for key in list(self._buffers):
+            self._flush(key)
+        for part in self._files.values():
+            part.close()
+
+    def commit(self) -> Dict[str, Any]:
+        bytes_written = sum(part.commit() for part in self._files.values())
+        rows = sum(part.rows for part in self._files.values())
+        elapsed = time.perf_counter() - self._started
+        return {
+            "sink": self.sink["name"],
+            "path": os.path.abspath(self.directory),
+            "format": self.fmt,
+            "compression": self.compression,
+            "partition_by": self.partition_by,
+            "files": len(self._files),
+            "rows": rows,
+            "bytes_written": bytes_written,
+            "write_seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None
+        }
+
+    def abort(self):
+        self._buffers.clear()
+        for part in self._files.values():
+            part.abort()
+
+
+def write_job_outputs(job: ProcessingJob, sinks: List[Dict[str, Any]], chunk_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Write a job's rows to every sink in one pass over the data.
+
+    Nothing becomes visible until every sink has written all of its files.
+    """
+    df = job_frame(job)
+    if not len(df.columns):
+        raise ValueError(f"Job {job.id} has no rows to write")
+    if "source_id" not in df.columns and any("source_id" in (sink.get("partition_by") or []) for sink in sinks):
+        df = df.assign(source_id=job.source_id)
+
+    writers = []
+    try:
+        for sink in sinks:
+            writers.append(OutputSinkWriter(sink, job.id, df))
+        chunk_rows = chunk_rows or settings.output_chunk_rows
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            for writer in writers:
+                writer.write(chunk)
+        for writer in writers:
+            writer.close()
+        return [writer.commit() for writer in writers]
+    except Exception:
+        for writer in writers:
+            writer.abort()
+        raise
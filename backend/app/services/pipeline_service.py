@@ -0,0 +1,219 @@
+from datetime import datetime
+from graphlib import TopologicalSorter, CycleError
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.models.pipeline import Pipeline, PipelineRun, PipelineRunStatus
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.models.workflow import ApprovalType
+from app.schemas.processing import TransformationRuleCreate
+from app.services.job_queue import JobQueue
+from app.services import data_processing_service  # noqa: F401  (registers the built-in rules)
+from app.services.rule_registry import rule_registry, RuleValidationError
+
+STEP_PENDING = "pending"
+STEP_QUEUED = "queued"
+STEP_COMPLETED = "completed"
+STEP_FAILED = "failed"
+STEP_SKIPPED = "skipped"
+TERMINAL_STEP_STATES = {STEP_COMPLETED, STEP_FAILED, STEP_SKIPPED}
+
+
+def step_input(step: Dict[str, Any]) -> Optional[str]:
+    depends_on = step.get("depends_on") or []
+    return step.get("input") or (depends_on[0] if len(depends_on) == 1 else None)
+
+
+def plan_steps(steps: List[Dict[str, Any]]) -> List[str]:
+    """Validate a pipeline's steps and return their names in dependency order."""
+    errors = []
+    names = [step["name"] for step in steps]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        errors.append(f"duplicate step names: {duplicates}")
+
+    for step in steps:
+        depends_on = step.get("depends_on") or []
+        unknown = [name for name in depends_on if name not in names]
+        if unknown:
+            errors.append(f"step '{step['name']}' depends on unknown steps {unknown}")
+        if step.get("input") and step["input"] not in depends_on:
+            errors.append(f"step '{step['name']}' reads from '{step['input']}', which is not one of its dependencies")
+        elif len(depends_on) > 1 and not step.get("input"):
+            errors.append(f"step '{step['name']}' has several dependencies; set 'input' to the one it reads from")
+        if step.get("step_type", "transform") == "transform":
+            try:
+                rule_registry.compile([TransformationRuleCreate(**rule) for rule in step.get("rules") or []])
+            except RuleValidationError as e:
+                errors.append(f"step '{step['name']}': {e}")
+
+    if not errors:
+        try:
+            order = list(TopologicalSorter({step["name"]: step.get("depends_on") or [] for step in steps}).static_order())
+        except CycleError as e:
+            errors.append(f"dependency cycle: {' -> '.join(e.args[1])}")
+    if errors:
+        raise ValueError("Invalid pipeline: " + "; ".join(errors))
+    return order
+
+
+def critical_path(
+    steps: List[Dict[str, Any]],
+    timings: Dict[str, Tuple[datetime, datetime, datetime]],
+    run_started: datetime
+) -> Dict[str, Any]:
+    """Per-step queue and run times, and the chain of steps that determined the run's duration.
+
+    timings maps each finished step to (queued_at, started_at, completed_at).
+    """
+    depends_on = {step["name"]: step.get("depends_on") or [] for step in steps}
+    per_step = {}
+    for name, (queued, started, completed) in timings.items():
+        per_step[name] = {
+            "queued_ms": round((started - queued).total_seconds() * 1000, 3),
+            "run_ms": round((completed - started).total_seconds() * 1000, 3),
+            "finished_at_ms": round((completed - run_started).total_seconds() * 1000, 3)
+        }
+    if not timings:
+        return {"steps": per_step, "critical_path": [], "critical_path_ms": 0.0}
+
+    # Walk back from the last step to finish, always through the dependency that released it last.
+    path = [max(timings, key=lambda name: timings[name][2])]
+    while True:
+        upstream = [name for name in depends_on[path[-1]] if name in timings]
+        if not upstream:
+            break
+        path.append(max(upstream, key=lambda name: timings[name][2]))
+    path.reverse()
+
+    return {
+        "steps": per_step,
+        "critical_path": path,
+        "critical_path_ms": per_step[path[-1]]["finished_at_ms"]
+    }
+
+
+class PipelineService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.job_queue = JobQueue(db)
+
+    async def start_run(self, pipeline: Pipeline, input_job_id: Optional[int] = None, user_id: Optional[int] = None) -> PipelineRun:
+        plan_steps(pipeline.steps)
+        if input_job_id is None and any(not step.get("depends_on") for step in pipeline.steps):
+            raise ValueError("Pipeline has entry steps; an input_job_id is required to run it")
+        if input_job_id is not None and not self.db.query(ProcessingJob).filter(ProcessingJob.id == input_job_id).first():
+            raise ValueError("Input job not found")
+
+        run = PipelineRun(
+            pipeline_id=pipeline.id,
+            status=PipelineRunStatus.RUNNING,
+            input_job_id=input_job_id,
+            # A snapshot, so editing the pipeline never changes a run in flight.
+            steps=pipeline.steps,
+            step_states={step["name"]: {"status": STEP_PENDING, "job_id": None} for step in pipeline.steps},
+            started_at=datetime.utcnow(),
+            created_by=user_id
+        )
+        self.db.add(run)
+        self.db.commit()
+        self.db.refresh(run)
+
+        await self.advance(run.id)
+        self.db.refresh(run)
+        return run
+
+    async def advance(self, run_id: int):
+        """Record finished steps, queue every step whose inputs are ready and close the run when done.
+
+        Called after each step job finishes; the row lock keeps two branches finishing
+        together from queuing the same downstream step twice.
+        """
+        run = self.db.query(PipelineRun).filter(PipelineRun.id == run_id).with_for_update().first()
+        if not run or run.status != PipelineRunStatus.RUNNING:
+            self.db.commit()
+            return
+
+        jobs = {
+            job.id: job for job in
+            self.db.query(ProcessingJob).filter(ProcessingJob.pipeline_run_id == run.id).all()
+        }
+        states = {name: dict(state) for name, state in run.step_states.items()}
+        for state in states.values():
+            job = jobs.get(state["job_id"])
+            if state["status"] == STEP_QUEUED and job is not None:
+                if job.status == JobStatus.COMPLETED:
+                    state["status"] = STEP_COMPLETED
+                elif job.status in (JobStatus.FAILED, JobStatus.CANCELLED):
+                    state["status"] = STEP_FAILED
+
+        launched = []
+        for name in plan_steps(run.steps):
+            step = next(step for step in run.steps if step["name"] == name)
+            if states[name]["status"] != STEP_PENDING:
+                continue
+            upstream = [states[dependency]["status"] for dependency in step.get("depends_on") or []]
+            if any(status in (STEP_FAILED, STEP_SKIPPED) for status in upstream):
+                states[name]["status"] = STEP_SKIPPED
+            elif all(status == STEP_COMPLETED for status in upstream):
+                job = self._step_job(run, step, states)
+                # Queued in the same transaction as the step state, so a crash before release()
+                # still leaves a job the lane dispatcher will pick up.
+                if step.get("step_type", "transform") == "promote":
+                    self.job_queue.stage_approved_job(job, ApprovalType.DATA_PROMOTION)
+                else:
+                    self.job_queue.stage_transformation(
+                        job, [TransformationRuleCreate(**rule) for rule in step.get("rules") or []]
+                    )
+                states[name] = {"status": STEP_QUEUED, "job_id": job.id}
+                launched.append(job)
+
+        run.step_states = states
+        if all(state["status"] in TERMINAL_STEP_STATES for state in states.values()):
+            self._finish_run(run, states, jobs)
+        # Commit (and release the lock) before publishing: in eager mode the step runs right
+        # away and its own advance() must see it as queued.
+        self.db.commit()
+
+        if launched:
+            await self.job_queue.release(launched)
+
+    def _step_job(self, run: PipelineRun, step: Dict[str, Any], states: Dict[str, Dict[str, Any]]) -> ProcessingJob:
+        input_step = step_input(step)
+        pipeline = self.db.query(Pipeline).filter(Pipeline.id == run.pipeline_id).first()
+        job = ProcessingJob(
+            name=f"{pipeline.name} / {step['name']}",
+            description=f"Step '{step['name']}' of pipeline run {run.id}",
+            source_id=pipeline.source_id,
+            status=JobStatus.PENDING,
+            # Staged data is passed by reference to the upstream job, never copied.
+            input_job_id=states[input_step]["job_id"] if input_step else run.input_job_id,
+            pipeline_run_id=run.id,
+            pipeline_step=step["name"],
+            lane="bulk",
+            created_by=run.created_by
+        )
+        self.db.add(job)
+        self.db.flush()
+        return job
+
+    def _finish_run(self, run: PipelineRun, states: Dict[str, Dict[str, Any]], jobs: Dict[int, ProcessingJob]):
+        run.status = (
+            PipelineRunStatus.COMPLETED
+            if all(state["status"] == STEP_COMPLETED for state in states.values())
+            else PipelineRunStatus.FAILED
+        )
+        run.completed_at = datetime.utcnow()
+
+        timings = {}
+        for name, state in states.items():
+            job = jobs.get(state["job_id"])
+            if job is None or state["status"] not in (STEP_COMPLETED, STEP_FAILED):
+                continue
+            queued = job.queued_at or job.created_at
+            started = job.started_at or queued
+            completed = job.completed_at or job.updated_at or started
+            timings[name] = (queued, started, completed)
+        run.timing = {
+            **critical_path(run.steps, timings, run.started_at),
+            "duration_ms": round((run.completed_at - run.started_at).total_seconds() * 1000, 3)
+        }
@@ -0,0 +1,222 @@
+import io
+import json
+import time
+from typing import Dict, Any, List, Optional, Tuple
+import pandas as pd
+from sqlalchemy import MetaData, Table, Column, Index, inspect, text
+from sqlalchemy.orm import Session
+from app.models import Base
+from app.models.processing_job import ProcessingJob, job_payload
+from app.services.job_progress import JobProgress
+from app.core.config import settings
+
+
+def job_frame(job: ProcessingJob) -> pd.DataFrame:
+    """The rows a job produced, or the rows it carries when it produced none."""
+    output = (job.output_data or {}).get("processed_data")
+    data = output if output is not None else job_payload(job)
+    if isinstance(data, dict) and "data" in data:
+        data = data["data"]
+    return pd.DataFrame(data or [])
+
+
+def validate_target(table: str):
+    """Refuse promotion targets outside the configured schema and allow-list.
+
+    A replace renames and drops the target, so the application's own tables and the
+    engine's staging and retired tables are never valid targets.
+    """
+    schema, _, name = table.rpartition(".")
+    if name in Base.metadata.tables or name.startswith(("_stage_", "_old_")):
+        raise ValueError(f"Table {table} cannot be a promotion target")
+    in_schema = settings.promotion_schema is not None and schema == settings.promotion_schema
+    if not in_schema and table not in settings.promotion_allowed_tables:
+        raise ValueError(
+            f"Promotion target {table} must be in schema {settings.promotion_schema} or in PROMOTION_ALLOWED_TABLES"
+            if settings.promotion_schema else f"Promotion target {table} is not in PROMOTION_ALLOWED_TABLES"
+        )
+
+
+class PromotionEngine:
+    """Loads a job's rows into a target table through a staging table.
+
+    Rows are bulk loaded into the staging table in batches (COPY on PostgreSQL), then
+    moved into the target in a single statement: appended, upserted on the key columns,
+    or swapped in whole by renaming the staging table. Everything runs on the session's
+    connection, so the caller's commit makes the new data and the job's status visible
+    together and a failure leaves the target untouched.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def promote(
+        self,
+        job: ProcessingJob,
+        target: Dict[str, Any],
+        progress: Optional[JobProgress] = None
+    ) -> Dict[str, Any]:
+        validate_target(target["table"])
+        started = time.perf_counter()
+        mode = target.get("mode", "append")
+        keys = target.get("key_columns") or []
+        batch_rows = target.get("batch_rows") or settings.promotion_batch_rows
+
+        df = job_frame(job)
+        if not len(df.columns):
+            raise ValueError(f"Job {job.id} has no rows to promote")
+        if mode == "upsert":
+            # One row per key: ON CONFLICT cannot update the same target row twice in a statement.
+            df = df.drop_duplicates(subset=keys, keep="last")
+
+        conn = self.db.connection()
+        schema, name = self._split(target["table"])
+        if not inspect(conn).has_table(name, schema=schema):
+            self._create_target(conn, df, schema, name, keys)
+        target_table = Table(name, MetaData(), autoload_with=conn, schema=schema)
+        missing = sorted(set(df.columns) - {column.name for column in target_table.columns})
+        if missing:
+            raise ValueError(f"Columns not in target table {target['table']}: {missing}")
+
+        stage = self._create_stage(conn, target_table, f"_stage_{name[:40]}_{job.id}", mode)
+        batches, bytes_loaded = self._load(conn, stage, df, batch_rows, progress)
+        loaded = time.perf_counter()
+
+        if mode == "replace":
+            self._swap(conn, target_table, stage, job.id)
+        else:
+            self._merge(conn, target_table, stage, list(df.columns), keys, target.get("update_columns"), mode)
+            stage.drop(conn)
+        finished = time.perf_counter()
+
+        return {
+            "table": target["table"],
+            "mode": mode,
+            "rows": len(df),
+            "batches": batches,
+            "bytes_loaded": bytes_loaded,
+            "load_seconds": round(loaded - started, 3),
+            "apply_seconds": round(finished - loaded, 3),
+            "rows_per_second": round(len(df) / (finished - started), 1) if finished > started else None,
+            "bulk_copy": conn.dialect.name == "postgresql"
+        }
+
+    def _split(self, table: str) -> Tuple[Optional[str], str]:
+        schema, _, name = table.rpartition(".")
+        return schema or None, name
+
+    def _quote(self, conn, name: str) -> str:
+        return conn.dialect.identifier_preparer.quote(name)
+
+    def _qualified(self, conn, table: Table) -> str:
+        return conn.dialect.identifier_preparer.format_table(table)
+
+    def _create_target(self, conn, df: pd.DataFrame, schema: Optional[str], name: str, keys: List[str]):
+        df.head(0).to_sql(name, conn, schema=schema, index=False)
+        if keys:
+            created = Table(name, MetaData(), autoload_with=conn, schema=schema)
+            Index(f"ux_{name[:40]}_keys", *[created.c[key] for key in keys], unique=True).create(conn)
+
+    def _create_stage(self, conn, target: Table, stage_name: str, mode: str) -> Table:
+        if conn.dialect.name == "postgresql":
+            # A replace swaps the stage in as the target, so it needs the target's indexes and
+            # constraints and must be logged; otherwise it is scratch space.
+            like = "INCLUDING ALL" if mode == "replace" else "INCLUDING DEFAULTS"
+            unlogged = "" if mode == "replace" else "UNLOGGED "
+            stage = Table(stage_name, MetaData(), *[Column(column.name, column.type) for column in target.columns],
+                          schema=target.schema)
+            conn.execute(text(
+                f"CREATE {unlogged}TABLE {self._qualified(conn, stage)} (LIKE {self._qualified(conn, target)} {like})"
+            ))
+            return stage
+        stage = Table(
+            stage_name, MetaData(),
+            *[Column(column.name, column.type, primary_key=column.primary_key) for column in target.columns],
+            schema=target.schema
+        )
+        stage.create(conn)
+        return stage
+
+    def _load(
+        self,
+        conn,
+        stage: Table,
+        df: pd.DataFrame,
+        batch_rows: int,
+        progress: Optional[JobProgress] = None
+    ) -> Tuple[int, Optional[int]]:
+        batches, bytes_loaded = 0, 0
+        if progress is not None:
+            progress.start("promote", rows_total=len(df), chunks_total=-(-len(df) // batch_rows))
+        columns = ", ".join(self._quote(conn, column) for column in df.columns)
+        for start in range(0, len(df), batch_rows):
+            batch = df.iloc[start:start + batch_rows]
+            if conn.dialect.name == "postgresql":
+                buffer = io.StringIO()
+                self._copy_ready(batch).to_csv(buffer, index=False, header=False, na_rep="\\N")
+                bytes_loaded += buffer.tell()
+                buffer.seek(0)
+                with conn.connection.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY {self._qualified(conn, stage)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                        buffer
+                    )
+            else:
+                conn.execute(stage.insert(), batch.astype(object).where(batch.notna(), None).to_dict("records"))
+            batches += 1
+            if progress is not None:
+                progress.advance(rows=len(batch))
+        return batches, bytes_loaded if conn.dialect.name == "postgresql" else None
+
+    def _copy_ready(self, batch: pd.DataFrame) -> pd.DataFrame:
+        # Nested values go in as JSON text rather than Python reprs.
+        nested = [
+            column for column in batch.columns
+            if batch[column].dtype == object and batch[column].map(lambda value: isinstance(value, (dict, list))).any()
+        ]
+        if not nested:
+            return batch
+        batch = batch.copy()
+        for column in nested:
+            batch[column] = batch[column].map(lambda value: json.dumps(value) if isinstance(value, (dict, list)) else value)
+        return batch
+
+    def _merge(
+        self,
+        conn,
+        target: Table,
+        stage: Table,
+        columns: List[str],
+        keys: List[str],
+        update_columns: Optional[List[str]],
+        mode: str
+    ):
+        column_list = ", ".join(self._quote(conn, column) for column in columns)
+        # WHERE true: SQLite cannot otherwise tell an ON CONFLICT clause from a join constraint.
+        statement = (
+            f"INSERT INTO {self._qualified(conn, target)} ({column_list}) "
+            f"SELECT {column_list} FROM {self._qualified(conn, stage)} WHERE true"
+        )
+        if mode == "upsert":
+            updates = [column for column in (update_columns or columns) if column not in keys]
+            conflict = ", ".join(self._quote(conn, key) for key in keys)
+            if updates:
+                assignments = ", ".join(
+                    f"{self._quote(conn, column)} = excluded.{self._quote(conn, column)}" for column in updates
+                )
+                statement += f" ON CONFLICT ({conflict}) DO UPDATE SET {assignments}"
+            else:
+                statement += f" ON CONFLICT ({conflict}) DO NOTHING"
+        conn.execute(text(statement))
+
+    def _swap(self, conn, target: Table, stage: Table, job_id: int):
+        retired = Table(f"_old_{target.name[:40]}_{job_id}", MetaData(), schema=target.schema)
+        conn.execute(text(f"ALTER TABLE {self._qualified(conn, target)} RENAME TO {self._quote(conn, retired.name)}"))
+        conn.execute(text(f"ALTER TABLE {self._qualified(conn, stage)} RENAME TO {self._quote(conn, target.name)}"))
+        conn.execute(text(f"DROP TABLE {self._qualified(conn, retired)}"))
+        if conn.dialect.name != "postgresql":
+            # PostgreSQL copied the indexes with LIKE ... INCLUDING ALL; elsewhere recreate them
+            # under their old names now that the retired table has released them.
+            swapped = Table(target.name, MetaData(), autoload_with=conn, schema=target.schema)
+            for index in target.indexes:
+                Index(index.name, *[swapped.c[column.name] for column in index.columns], unique=index.unique).create(conn)
@@ -0,0 +1,71 @@
+import os
+import json
+from typing import Dict, Any, List, Optional
+import pandas as pd
+from app.core.config import settings
+
+REASON_COLUMN = "_quarantine_reason"
+RULE_COLUMN = "_quarantine_rule"
+COLUMN_COLUMN = "_quarantine_column"
+SOURCE_ROW_COLUMN = "_source_row"
+SAMPLE_SIZE = 5
+
+
+def quarantine_path(job_id: int) -> str:
+    return os.path.join(settings.staging_dir, "quarantine", f"job_{job_id}.jsonl")
+
+
+def tag_rows(rows: pd.DataFrame, reason: str, rule_type: str, column: Optional[str] = None) -> pd.DataFrame:
+    # Rows keep their raw values; the tags say which rule rejected them and why.
+    tagged = rows.copy()
+    tagged[SOURCE_ROW_COLUMN] = rows.index
+    tagged[REASON_COLUMN] = reason
+    tagged[RULE_COLUMN] = rule_type
+    tagged[COLUMN_COLUMN] = column
+    return tagged.reset_index(drop=True)
+
+
+def summarize(frames: List[pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+    if not frames:
+        return {}
+    combined = pd.concat(frames, ignore_index=True)
+
+    summary = {}
+    for reason, rows in combined.groupby(REASON_COLUMN, sort=False):
+        summary[reason] = {
+            "row_count": len(rows),
+            "rules": sorted(rows[RULE_COLUMN].dropna().unique().tolist()),
+            "columns": sorted(rows[COLUMN_COLUMN].dropna().unique().tolist()),
+            "sample_source_rows": [str(row) for row in rows[SOURCE_ROW_COLUMN].head(SAMPLE_SIZE)]
+        }
+    return summary
+
+
+def write_quarantine(job_id: int, frames: List[pd.DataFrame]) -> Optional[str]:
+    if not frames:
+        return None
+
+    path = quarantine_path(job_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    pd.concat(frames, ignore_index=True).to_json(
+        tmp_path, orient="records", lines=True, date_format="iso", default_handler=str
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_quarantine(job_id: int, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    path = quarantine_path(job_id)
+    if not os.path.exists(path):
+        return []
+
+    rows = []
+    with open(path) as f:
+        for position, line in enumerate(f):
+            if position < offset:
+                continue
+            if len(rows) >= limit:
+                break
+            rows.append(json.loads(line))
+    return rows
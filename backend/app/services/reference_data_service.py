@@ -0,0 +1,173 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+from app.models.reference_data import ReferenceDataset
+from app.core.config import settings
+
+
+class ReferenceFrame:
+    def __init__(self, name: str, version: int, key_columns: List[str], records: List[Dict[str, Any]]):
+        self.name = name
+        self.version = version
+        self.key_columns = list(key_columns)
+
+        frame = pd.DataFrame(records)
+        missing = [column for column in self.key_columns if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Reference dataset '{name}' is missing key columns: {missing}")
+
+        # A unique index lets lookups reuse the index's hash engine across jobs.
+        frame = frame.drop_duplicates(subset=self.key_columns, keep="last")
+        self.frame = frame.set_index(self.key_columns if len(self.key_columns) > 1 else self.key_columns[0])
+        self.nbytes = int(self.frame.memory_usage(deep=True).sum() + self.frame.index.memory_usage(deep=True))
+
+    def positions(self, keys: pd.DataFrame) -> np.ndarray:
+        if len(self.key_columns) == 1:
+            return self.frame.index.get_indexer(keys.iloc[:, 0])
+        return self.frame.index.get_indexer(pd.MultiIndex.from_frame(keys))
+
+
+class ReferenceDataCache:
+    """Process-wide LRU of reference frames, bounded by their in-memory size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._frames: "OrderedDict[str, ReferenceFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, version: int) -> Optional[ReferenceFrame]:
+        with self._lock:
+            frame = self._frames.get(name)
+            if frame is None or frame.version != version:
+                return None
+            self._frames.move_to_end(name)
+            return frame
+
+    def put(self, frame: ReferenceFrame):
+        with self._lock:
+            self._frames[frame.name] = frame
+            self._frames.move_to_end(frame.name)
+            total = sum(cached.nbytes for cached in self._frames.values())
+            while total > self.max_bytes and len(self._frames) > 1:
+                _, evicted = self._frames.popitem(last=False)
+                total -= evicted.nbytes
+
+    def invalidate(self, name: str):
+        with self._lock:
+            self._frames.pop(name, None)
+
+
+reference_cache = ReferenceDataCache(max_bytes=settings.reference_cache_max_bytes)
+
+
+class ReferenceDataService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def get_version(self, name: str) -> int:
+        row = self.db.query(ReferenceDataset.version).filter(ReferenceDataset.name == name).first()
+        if not row:
+            raise ValueError(f"Reference dataset not found: {name}")
+        return row.version
+
+    async def get_frame(self, name: str) -> ReferenceFrame:
+        # Only the version is read on a warm cache; the payload is loaded when it changes.
+        version = await self.get_version(name)
+        frame = reference_cache.get(name, version)
+        if frame is not None:
+            return frame
+
+        dataset = self.db.query(ReferenceDataset).filter(ReferenceDataset.name == name).first()
+        frame = ReferenceFrame(dataset.name, dataset.version, dataset.key_columns, dataset.data or [])
+        reference_cache.put(frame)
+        return frame
+
+    async def lookup(
+        self,
+        df: pd.DataFrame,
+        dataset: str,
+        on: List[str],
+        columns: Optional[List[str]] = None,
+        prefix: str = "",
+        how: str = "left"
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        reference = await self.get_frame(dataset)
+        if len(on) != len(reference.key_columns):
+            raise ValueError(
+                f"Lookup on {on} does not match key columns {reference.key_columns} of '{dataset}'"
+            )
+        missing = [column for column in on if column not in df.columns]
+        if missing:
+            raise ValueError(f"Lookup columns not found in data: {missing}")
+
+        columns = columns or list(reference.frame.columns)
+        positions = reference.positions(df[on])
+        matched = positions >= 0
+
+        if how == "inner":
+            df = df[matched].copy()
+            positions = positions[matched]
+
+        found = positions >= 0
+        if len(reference.frame):
+            values = reference.frame[columns].iloc[np.where(found, positions, 0)]
+            if not found.all():
+                values = values.where(np.broadcast_to(found[:, None], values.shape))
+        else:
+            values = pd.DataFrame(np.nan, index=range(len(df)), columns=columns)
+
+        for column in columns:
+            df[f"{prefix}{column}"] = values[column].to_numpy()
+
+        return df, {
+            "dataset": dataset,
+            "version": reference.version,
+            "rows_matched": int(matched.sum()),
+            "rows_unmatched": int((~matched).sum())
+        }
+
+    async def create_dataset(
+        self,
+        name: str,
+        key_columns: List[str],
+        data: List[Dict[str, Any]],
+        description: Optional[str] = None,
+        created_by: Optional[int] = None
+    ) -> ReferenceDataset:
+        ReferenceFrame(name, 1, key_columns, data)
+
+        dataset = ReferenceDataset(
+            name=name,
+            description=description,
+            key_columns=key_columns,
+            data=data,
+            row_count=len(data),
+            version=1,
+            created_by=created_by
+        )
+        self.db.add(dataset)
+        self.db.commit()
+        self.db.refresh(dataset)
+        return dataset
+
+    async def update_dataset(self, dataset: ReferenceDataset, updates: Dict[str, Any]) -> ReferenceDataset:
+        if "description" in updates:
+            dataset.description = updates["description"]
+
+        if updates.get("data") is not None or updates.get("key_columns") is not None:
+            key_columns = updates.get("key_columns") or dataset.key_columns
+            data = updates["data"] if updates.get("data") is not None else dataset.data
+            ReferenceFrame(dataset.name, dataset.version + 1, key_columns, data)
+
+            dataset.key_columns = key_columns
+            dataset.data = data
+            dataset.row_count = len(data)
+            dataset.version = dataset.version + 1
+            reference_cache.invalidate(dataset.name)
+
+        self.db.commit()
+        self.db.refresh(dataset)
+        return dataset
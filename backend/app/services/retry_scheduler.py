@@ -0,0 +1,121 @@
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.job_queue import JobQueue
+from app.services.lineage_service import DataLineageService
+from app.core.config import settings
+
+RETRY_SCHEDULED = "scheduled"
+# Claimed by one tick; no other tick can pick the job up while its retry is being queued.
+RETRY_CLAIMED = "retrying"
+RETRY_DONE = "retried"
+RETRY_EXHAUSTED = "exhausted"
+# Failed in a way a rerun would repeat (e.g. invalid rules); never retried automatically.
+RETRY_NOT_RETRYABLE = "not_retryable"
+
+
+def backoff_delay(retry_count: int, base_seconds: float, max_seconds: float, rng: random.Random = random) -> float:
+    """Exponential backoff with equal jitter: at least half the step, spread over the other half."""
+    step = min(max_seconds, base_seconds * (2 ** retry_count))
+    return step / 2 + rng.uniform(0, step / 2)
+
+
+class RetryScheduler:
+    """Retries failed jobs with jittered exponential backoff and a budget per retry chain."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.job_queue = JobQueue(db)
+        self.lineage_service = DataLineageService(db)
+
+    async def tick(self, now: Optional[datetime] = None) -> Dict[str, List[int]]:
+        now = now or datetime.utcnow()
+        scheduled, exhausted = self.schedule_failed_jobs(now)
+        retried = []
+        for job_id in self._due_job_ids(now):
+            # retry() commits, so a lock taken on the whole batch would not outlive the first
+            # job; each job is claimed on its own instead, and a job another tick claimed is skipped.
+            if not self._claim(job_id, now):
+                continue
+            job = self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+            try:
+                new_job = await self.retry(job, retry_reason="automatic_retry_on_failure")
+            except Exception:
+                self.db.rollback()
+                self._set_claim(job_id, RETRY_CLAIMED, RETRY_SCHEDULED)
+                raise
+            retried.append(new_job.id)
+        return {"scheduled": scheduled, "exhausted": exhausted, "retried": retried}
+
+    def schedule_failed_jobs(self, now: datetime):
+        """Give each newly failed job a retry time, or mark its chain out of budget."""
+        # Only recent failures: enabling the scheduler must not retry the whole failure history at once.
+        failed = self.db.query(ProcessingJob).filter(
+            ProcessingJob.status == JobStatus.FAILED,
+            ProcessingJob.updated_at >= now - timedelta(hours=settings.retry_failed_within_hours),
+            ProcessingJob.retry_status.is_(None),
+            # A failed pipeline step fails its run; the run is what gets rerun.
+            ProcessingJob.pipeline_run_id.is_(None)
+        ).order_by(ProcessingJob.updated_at).limit(settings.retry_batch_size).all()
+
+        scheduled, exhausted = [], []
+        for job in failed:
+            retry_count = job.retry_count or 0
+            # Jobs run inline (e.g. previews) have no task to queue again.
+            if retry_count >= settings.retry_max_attempts or not job.task_name:
+                job.retry_status = RETRY_EXHAUSTED
+                exhausted.append(job.id)
+                continue
+            delay = backoff_delay(retry_count, settings.retry_base_delay_seconds, settings.retry_max_delay_seconds)
+            job.retry_status = RETRY_SCHEDULED
+            job.next_retry_at = now + timedelta(seconds=delay)
+            scheduled.append(job.id)
+        self.db.commit()
+        return scheduled, exhausted
+
+    async def retry(self, job: ProcessingJob, retry_reason: str = "manual_retry") -> ProcessingJob:
+        from app.services.data_processing_service import DataProcessingService
+
+        if not job.task_name:
+            raise ValueError(f"Job {job.id} did not run from the queue and cannot be retried")
+        new_job = await DataProcessingService(self.db).retry_job(job, retry_reason=retry_reason)
+        job.retry_status = RETRY_DONE
+        job.next_retry_at = None
+        self.db.commit()
+
+        # Same task, pointed at the new job; the remaining arguments (rules etc.) are unchanged.
+        await self.job_queue.enqueue_task(new_job, job.task_name, new_job.id, *(job.task_args or [])[1:])
+
+        await self.lineage_service.track_workflow_event(
+            job_id=new_job.id,
+            event_type="auto_retry_initiated" if retry_reason != "manual_retry" else "manual_retry_initiated",
+            metadata={
+                "original_job_id": job.id,
+                "root_job_id": new_job.root_job_id,
+                "retry_count": new_job.retry_count,
+                "retry_reason": retry_reason
+            }
+        )
+        return new_job
+
+    def _due_job_ids(self, now: datetime) -> List[int]:
+        return [job_id for job_id, in self.db.query(ProcessingJob.id).filter(
+            ProcessingJob.retry_status == RETRY_SCHEDULED,
+            ProcessingJob.next_retry_at <= now
+        ).order_by(ProcessingJob.next_retry_at).limit(settings.retry_batch_size).all()]
+
+    def _claim(self, job_id: int, now: datetime) -> bool:
+        return self._set_claim(job_id, RETRY_SCHEDULED, RETRY_CLAIMED, ProcessingJob.next_retry_at <= now)
+
+    def _set_claim(self, job_id: int, current: str, new: str, *conditions) -> bool:
+        result = self.db.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id, ProcessingJob.retry_status == current, *conditions)
+            .values(retry_status=new)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount == 1
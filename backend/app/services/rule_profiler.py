@@ -0,0 +1,95 @@
+import io
+import time
+import pstats
+import cProfile
+import tracemalloc
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+import pandas as pd
+
+CPROFILE_TOP_FUNCTIONS = 40
+
+RuleHandler = Callable[[pd.DataFrame, Dict[str, Any]], Awaitable[pd.DataFrame]]
+
+
+class RuleProfiler:
+    """Records wall time, CPU time, row counts and memory for each rule run."""
+
+    def __init__(self, trace_memory: bool = False, capture_cprofile: bool = False):
+        self.trace_memory = trace_memory or capture_cprofile
+        self.capture_cprofile = capture_cprofile
+        self.entries: List[Dict[str, Any]] = []
+        self._profiler: Optional[cProfile.Profile] = None
+        self._started_tracing = False
+        self._started = None
+
+    def __enter__(self) -> "RuleProfiler":
+        self._started = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.capture_cprofile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._profiler:
+            self._profiler.disable()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.total_wall_ms = round((time.perf_counter() - self._started) * 1000, 3)
+
+    async def run(
+        self,
+        rule_type: str,
+        handler: RuleHandler,
+        df: pd.DataFrame,
+        parameters: Dict[str, Any]
+    ) -> pd.DataFrame:
+        rows_in = len(df)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            memory_before, _ = tracemalloc.get_traced_memory()
+
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        entry = {
+            "position": len(self.entries),
+            "rule_type": rule_type,
+            "rows_in": rows_in,
+            "rows_out": None,
+            "failed": True
+        }
+        try:
+            df = await handler(df, parameters)
+            entry["rows_out"] = len(df)
+            entry["failed"] = False
+            return df
+        finally:
+            # Failed rules are recorded too so the profile shows where a job died.
+            entry["wall_ms"] = round((time.perf_counter() - wall_started) * 1000, 3)
+            entry["cpu_ms"] = round((time.process_time() - cpu_started) * 1000, 3)
+            entry["peak_memory_delta_bytes"] = None
+            entry["bytes_allocated"] = None
+            if self.trace_memory:
+                memory_after, memory_peak = tracemalloc.get_traced_memory()
+                entry["peak_memory_delta_bytes"] = max(0, memory_peak - memory_before)
+                # Net bytes still held once the rule returns, i.e. what it added to the working set.
+                entry["bytes_allocated"] = memory_after - memory_before
+            self.entries.append(entry)
+
+    def report(self) -> Dict[str, Any]:
+        report = {
+            "rules": self.entries,
+            "total_wall_ms": getattr(self, "total_wall_ms", None),
+            "total_rule_wall_ms": round(sum(entry["wall_ms"] for entry in self.entries), 3),
+            "memory_traced": self.trace_memory,
+            "cprofile": None
+        }
+        if self._profiler:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=stream)
+            stats.sort_stats("cumulative").print_stats(CPROFILE_TOP_FUNCTIONS)
+            report["cprofile"] = stream.getvalue()
+        return report
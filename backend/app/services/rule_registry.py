@@ -0,0 +1,188 @@
+import json
+import threading
+from collections import OrderedDict
+from functools import partial
+from importlib.metadata import entry_points
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Type, Union
+import pandas as pd
+from pydantic import BaseModel, ValidationError
+from app.schemas.processing import TransformationRuleCreate
+
+ENTRY_POINT_GROUP = "etl_fastprocessing.rules"
+MAX_COMPILED_RULE_SETS = 256
+
+# Handlers take the running DataProcessingService so they can record rule outputs and quarantine rows.
+RuleHandler = Callable[[Any, pd.DataFrame, Dict[str, Any]], Awaitable[pd.DataFrame]]
+
+# How a rule behaves in incremental runs: "row" rules only look at the rows in front of them,
+# "reducer" rules fold each delta into state kept between runs, None means it needs the full history.
+IncrementalMode = Optional[str]
+
+
+class RuleValidationError(ValueError):
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("Invalid transformation rules: " + "; ".join(errors))
+
+
+class RuleSpec:
+    def __init__(
+        self,
+        name: str,
+        handler: RuleHandler,
+        parameters: Type[BaseModel],
+        cacheable: Union[bool, Callable[[Dict[str, Any]], bool]] = True,
+        description: Optional[str] = None,
+        incremental: Union[IncrementalMode, Callable[[Dict[str, Any]], IncrementalMode]] = None
+    ):
+        self.name = name
+        self.handler = handler
+        self.parameters = parameters
+        self.cacheable = cacheable
+        self.incremental = incremental
+        self.description = description or (handler.__doc__ or "").strip() or None
+
+    def is_cacheable(self, parameters: Dict[str, Any]) -> bool:
+        return self.cacheable(parameters) if callable(self.cacheable) else self.cacheable
+
+    def incremental_mode(self, parameters: Dict[str, Any]) -> IncrementalMode:
+        return self.incremental(parameters) if callable(self.incremental) else self.incremental
+
+
+class CompiledRule:
+    def __init__(self, spec: RuleSpec, parameters: Dict[str, Any]):
+        self.rule_type = spec.name
+        self.spec = spec
+        self.parameters = parameters
+
+    def bind(self, service) -> Callable[[pd.DataFrame, Dict[str, Any]], Awaitable[pd.DataFrame]]:
+        return partial(self.spec.handler, service)
+
+    def dict(self) -> Dict[str, Any]:
+        return {"rule_type": self.rule_type, "parameters": self.parameters}
+
+
+class CompiledRuleSet:
+    def __init__(self, rules: List[CompiledRule]):
+        self.rules = rules
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    @property
+    def cacheable(self) -> bool:
+        return all(rule.spec.is_cacheable(rule.parameters) for rule in self.rules)
+
+    def payload(self) -> List[Dict[str, Any]]:
+        return [rule.dict() for rule in self.rules]
+
+
+class RuleRegistry:
+    """Process-wide registry of transformation rules and their parameter models."""
+
+    def __init__(self, entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        self.entry_point_group = entry_point_group
+        self.load_errors: Dict[str, str] = {}
+        self._specs: Dict[str, RuleSpec] = {}
+        self._compiled: "OrderedDict[tuple, CompiledRuleSet]" = OrderedDict()
+        self._entry_points_loaded = entry_point_group is None
+        self._version = 0
+        self._lock = threading.RLock()
+
+    def register(self, spec: RuleSpec):
+        with self._lock:
+            self._specs[spec.name] = spec
+            # A new or replaced rule changes what every rule set compiles to.
+            self._version += 1
+            self._compiled.clear()
+
+    def unregister(self, name: str):
+        with self._lock:
+            if self._specs.pop(name, None) is not None:
+                self._version += 1
+                self._compiled.clear()
+
+    def rule(
+        self,
+        name: str,
+        parameters: Type[BaseModel],
+        cacheable: Union[bool, Callable[[Dict[str, Any]], bool]] = True,
+        incremental: Union[IncrementalMode, Callable[[Dict[str, Any]], IncrementalMode]] = None
+    ):
+        def decorator(handler: RuleHandler) -> RuleHandler:
+            self.register(RuleSpec(name, handler, parameters, cacheable=cacheable, incremental=incremental))
+            return handler
+        return decorator
+
+    def load_entry_points(self):
+        """Register rules published by installed packages under the entry point group.
+
+        An entry point may name a RuleSpec or a callable that takes the registry.
+        """
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+
+        for entry_point in entry_points(group=self.entry_point_group):
+            try:
+                target = entry_point.load()
+                if isinstance(target, RuleSpec):
+                    self.register(target)
+                else:
+                    target(self)
+            except Exception as e:
+                # One broken plugin must not take the built-in rules down with it.
+                self.load_errors[entry_point.name] = str(e)
+
+    def get(self, name: str) -> Optional[RuleSpec]:
+        self.load_entry_points()
+        return self._specs.get(name)
+
+    def specs(self) -> List[RuleSpec]:
+        self.load_entry_points()
+        return sorted(self._specs.values(), key=lambda spec: spec.name)
+
+    def compile(self, rules: List[TransformationRuleCreate]) -> CompiledRuleSet:
+        self.load_entry_points()
+        key = (
+            self._version,
+            json.dumps([[rule.rule_type, rule.parameters] for rule in rules], sort_keys=True, default=str)
+        )
+        with self._lock:
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self._compiled.move_to_end(key)
+                return compiled
+
+        errors = []
+        compiled_rules = []
+        for position, rule in enumerate(rules):
+            spec = self._specs.get(rule.rule_type)
+            if spec is None:
+                errors.append(f"rule {position} ({rule.rule_type}): unknown rule type")
+                continue
+            try:
+                parameters = spec.parameters(**(rule.parameters or {}))
+            except ValidationError as e:
+                for error in e.errors():
+                    location = ".".join(str(part) for part in error["loc"]) or "parameters"
+                    errors.append(f"rule {position} ({rule.rule_type}): {location}: {error['msg']}")
+                continue
+            compiled_rules.append(CompiledRule(spec, parameters.dict()))
+
+        if errors:
+            raise RuleValidationError(errors)
+
+        compiled = CompiledRuleSet(compiled_rules)
+        with self._lock:
+            self._compiled[key] = compiled
+            while len(self._compiled) > MAX_COMPILED_RULE_SETS:
+                self._compiled.popitem(last=False)
+        return compiled
+
+
+rule_registry = RuleRegistry()
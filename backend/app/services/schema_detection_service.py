@@ -5,6 +5,14 @@ from app.models.schema import DetectedSchema
 import json
 import numpy as np
 
+
+def _json_scalar(value):
+    # Nullable columns return pd.NA for min/max/mean when every value is missing.
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
 class SchemaDetectionService:
     def __init__(self, db: Session):
         self.db = db
@@ -130,20 +138,21 @@ class SchemaDetectionService:
             col_info = {
                 "name": column,
                 "type": self._infer_column_type(col_data),
-                "nullable": col_data.isnull().any(),
-                "unique_values": col_data.nunique(),
+                "nullable": bool(col_data.isnull().any()),
+                "unique_values": int(col_data.nunique()),
                 "sample_values": col_data.dropna().head(5).tolist(),
-                "null_count": col_data.isnull().sum(),
-                "null_percentage": (col_data.isnull().sum() / len(col_data)) * 100
+                "null_count": int(col_data.isnull().sum()),
+                "null_percentage": float(col_data.isnull().sum() / len(col_data)) * 100
             }
             
             if col_info["type"] in ["integer", "float"]:
-                col_info["min_value"] = col_data.min()
-                col_info["max_value"] = col_data.max()
-                col_info["mean_value"] = col_data.mean()
+                col_info["min_value"] = _json_scalar(col_data.min())
+                col_info["max_value"] = _json_scalar(col_data.max())
+                mean_value = _json_scalar(col_data.mean())
+                col_info["mean_value"] = float(mean_value) if mean_value is not None else None
             elif col_info["type"] == "string":
-                col_info["avg_length"] = col_data.astype(str).str.len().mean()
-                col_info["max_length"] = col_data.astype(str).str.len().max()
+                col_info["avg_length"] = float(col_data.astype(str).str.len().mean())
+                col_info["max_length"] = int(col_data.astype(str).str.len().max())
             
             schema["columns"].append(col_info)
         
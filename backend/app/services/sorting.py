@@ -0,0 +1,65 @@
+from typing import Dict, Any, List, Tuple, Union
+import numpy as np
+import pandas as pd
+
+POSITION_COLUMN = "__position"
+
+
+def _normalize_order(by: Union[str, List[str]], ascending: Union[bool, List[bool]]) -> Tuple[List[str], List[bool]]:
+    by = [by] if isinstance(by, str) else list(by)
+    if not by:
+        raise ValueError("Sort requires at least one 'by' column")
+    ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+    if len(ascending) != len(by):
+        raise ValueError("'ascending' must have one entry per 'by' column")
+    return by, ascending
+
+
+def sort_frame(
+    df: pd.DataFrame,
+    by: Union[str, List[str]],
+    ascending: Union[bool, List[bool]] = True
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    by, ascending = _normalize_order(by, ascending)
+    missing = [column for column in by if column not in df.columns]
+    if missing:
+        raise ValueError(f"Sort columns not found: {missing}")
+
+    # Stable, with nulls last in either direction.
+    return df.sort_values(by, ascending=ascending, kind="mergesort", na_position="last"), {
+        "method": "in_memory", "rows": len(df)
+    }
+
+
+def top_n(
+    df: pd.DataFrame,
+    by: Union[str, List[str]],
+    n: int,
+    ascending: Union[bool, List[bool]] = False,
+    chunk_rows: int = 1_000_000
+) -> pd.DataFrame:
+    """The first n rows of the stable sort on `by`, nulls last, without sorting everything."""
+    by, ascending = _normalize_order(by, ascending)
+    missing = [column for column in by if column not in df.columns]
+    if missing:
+        raise ValueError(f"Top-N columns not found: {missing}")
+    if n <= 0:
+        return df.iloc[0:0]
+
+    if len(by) == 1 and pd.api.types.is_numeric_dtype(df[by[0]]) and not pd.api.types.is_bool_dtype(df[by[0]]):
+        # Selection, not a sort: O(n) partitioning with a heap only over the kept rows.
+        select = df.nsmallest if ascending[0] else df.nlargest
+        picked = select(n, by[0], keep="first")
+        if len(picked) < n:
+            # nlargest/nsmallest drop nulls; a sort would fill the remaining places with them.
+            picked = pd.concat([picked, df[df[by[0]].isna()].head(n - len(picked))])
+        return picked
+
+    # Keep a bounded candidate set of at most n rows and fold each chunk into it.
+    candidates = None
+    for start in range(0, len(df), chunk_rows):
+        chunk = df[by].iloc[start:start + chunk_rows].assign(**{POSITION_COLUMN: np.arange(start, min(start + chunk_rows, len(df)))})
+        pool = chunk if candidates is None else pd.concat([candidates, chunk])
+        candidates = pool.sort_values(by, ascending=ascending, kind="mergesort", na_position="last").head(n)
+
+    return df.take(candidates[POSITION_COLUMN].to_numpy())
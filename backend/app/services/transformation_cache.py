@@ -0,0 +1,84 @@
+import os
+import json
+import hashlib
+import pickle
+from typing import Dict, Any, List, Optional
+import pandas as pd
+from app.core.config import settings
+from app.services.dataframe_profile import hash_rows
+
+# Bump when rule behaviour or the cached payload changes, so entries written by older code are never served.
+CACHE_VERSION = 1
+
+
+class TransformationCache:
+    """LRU cache of transformation results in the staging area.
+
+    Entries are keyed by a hash of the input frame and of the normalised rule
+    list. Recency is tracked through file mtimes so the cache is shared by
+    every worker that mounts the same staging directory.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or os.path.join(settings.staging_dir, "transform_cache")
+        self.max_bytes = max_bytes if max_bytes is not None else settings.transform_cache_max_bytes
+
+    @staticmethod
+    def input_hash(df: pd.DataFrame) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+        digest.update(hash_rows(df).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def rules_hash(rules: List[Dict[str, Any]]) -> str:
+        normalised = [
+            {"rule_type": rule["rule_type"], "parameters": rule.get("parameters") or {}}
+            for rule in rules
+        ]
+        payload = json.dumps(normalised, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def key(self, input_hash: str, rules_hash: str) -> str:
+        salt = f"v{CACHE_VERSION}:pandas-{pd.__version__}"
+        return hashlib.sha256(f"{salt}:{input_hash}:{rules_hash}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        os.utime(path)
+        return payload
+
+    def put(self, key: str, payload: Dict[str, Any]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
@@ -1,10 +1,17 @@
-from typing import List, Optional
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 from app.models.workflow import WorkflowApproval, WorkflowState, ApprovalType
-from app.models.processing_job import ProcessingJob, JobStatus
+from app.models.processing_job import ProcessingJob, JobStatus, job_payload
 from app.models.user import User
+from app.models.data_source import DataSource
 from app.services.notification_service import NotificationService
 from app.services.lineage_service import DataLineageService
+from app.services.job_queue import JobQueue
+from app.services.promotion_engine import PromotionEngine
+from app.services.output_sinks import write_job_outputs
+from app.services.job_lease import LeaseLostError
+from app.services.job_progress import JobProgress, JobCancelledError
+from app.core.config import settings
 from datetime import datetime
 
 class WorkflowService:
@@ -12,6 +19,7 @@ class WorkflowService:
         self.db = db
         self.notification_service = NotificationService(db)
         self.lineage_service = DataLineageService(db)
+        self.job_queue = JobQueue(db)
 
     async def submit_for_approval(
         self, 
@@ -83,7 +91,9 @@ class WorkflowService:
             }
         )
 
-        await self._execute_approved_job(approval.job_id, approval.approval_type)
+        job = self.db.query(ProcessingJob).filter(ProcessingJob.id == approval.job_id).first()
+        if job:
+            await self.job_queue.enqueue_approved_job(job, approval.approval_type)
         
         await self.notification_service.notify_approval_decision(approval, "approved")
         
@@ -128,19 +138,110 @@ class WorkflowService:
         
         return True
 
-    async def _execute_approved_job(self, job_id: int, approval_type: ApprovalType):
+    async def bulk_decide(
+        self,
+        approval_ids: List[int],
+        approver_id: int,
+        approve: bool,
+        comments: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Approve or reject many approvals in one transaction.
+
+        Lineage is written in one flush, approved jobs are queued rather than run, and each
+        submitter gets one digest instead of an email per approval.
+        """
+        from app import tasks
+
+        ids = list(dict.fromkeys(approval_ids))
+        if len(ids) > settings.bulk_approval_max_items:
+            raise ValueError(f"At most {settings.bulk_approval_max_items} approvals can be decided at once")
+
+        approvals = self.db.query(WorkflowApproval).filter(
+            WorkflowApproval.id.in_(ids)
+        ).order_by(WorkflowApproval.id).with_for_update().all()
+        found = {approval.id: approval for approval in approvals}
+        skipped = [
+            {"approval_id": approval_id, "reason": "not found"} for approval_id in ids if approval_id not in found
+        ] + [
+            {"approval_id": approval.id, "reason": f"already {approval.state.value}"}
+            for approval in approvals if approval.state != WorkflowState.PENDING
+        ]
+        decided = [approval for approval in approvals if approval.state == WorkflowState.PENDING]
+
+        now = datetime.utcnow()
+        jobs = {
+            job.id: job for job in
+            self.db.query(ProcessingJob).filter(ProcessingJob.id.in_([approval.job_id for approval in decided])).all()
+        }
+        events, queued = [], []
+        for approval in decided:
+            approval.approved_by = approver_id
+            approval.approved_at = now
+            job = jobs.get(approval.job_id)
+            if approve:
+                approval.state = WorkflowState.APPROVED
+                if comments:
+                    approval.comments = f"{approval.comments}\n\nApprover comments: {comments}" if approval.comments else f"Approver comments: {comments}"
+                events.append({
+                    "job_id": approval.job_id,
+                    "event_type": "approval_approved",
+                    "metadata": {"approval_id": approval.id, "approved_by": approver_id, "comments": comments, "bulk": True}
+                })
+                if job is not None and job not in queued:
+                    self.job_queue.stage_approved_job(job, approval.approval_type)
+                    queued.append(job)
+            else:
+                approval.state = WorkflowState.REJECTED
+                approval.comments = f"{approval.comments}\n\nRejection reason: {comments}" if approval.comments else f"Rejection reason: {comments}"
+                events.append({
+                    "job_id": approval.job_id,
+                    "event_type": "approval_rejected",
+                    "metadata": {"approval_id": approval.id, "rejected_by": approver_id, "rejection_reason": comments, "bulk": True}
+                })
+                if job is not None:
+                    job.status = JobStatus.CANCELLED
+        self.lineage_service.add_workflow_events(events)
+        self.db.commit()
+
+        await self.job_queue.release(queued)
+
+        by_submitter: Dict[int, List[int]] = {}
+        for approval in decided:
+            by_submitter.setdefault(approval.submitted_by, []).append(approval.id)
+        for submitter_id, submitter_approvals in by_submitter.items():
+            # Sent from a worker, so a slow mail server never holds up the request.
+            tasks.send_approval_digest.apply_async(args=[submitter_id, submitter_approvals, comments])
+
+        return {
+            "approved" if approve else "rejected": [approval.id for approval in decided],
+            "skipped": skipped,
+            "queued_job_ids": [job.id for job in queued]
+        }
+
+    async def send_approval_digest(self, submitter_id: int, approval_ids: List[int], comments: Optional[str] = None):
+        approvals = self.db.query(WorkflowApproval).filter(
+            WorkflowApproval.id.in_(approval_ids)
+        ).order_by(WorkflowApproval.id).all()
+        await self.notification_service.notify_approval_digest(submitter_id, approvals, comments)
+
+    async def _execute_approved_job(
+        self,
+        job_id: int,
+        approval_type: ApprovalType,
+        progress: Optional[JobProgress] = None
+    ):
         job = self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
         if not job:
             return
 
         if approval_type == ApprovalType.DATA_PROMOTION:
-            await self._promote_data(job)
+            await self._promote_data(job, progress)
         elif approval_type == ApprovalType.JOB_EXECUTION:
-            await self._execute_job(job)
+            await self._execute_job(job, progress)
         elif approval_type == ApprovalType.SCHEMA_CHANGE:
-            await self._apply_schema_changes(job)
+            await self._apply_schema_changes(job, progress)
 
-    async def _promote_data(self, job: ProcessingJob):
+    async def _promote_data(self, job: ProcessingJob, progress: Optional[JobProgress] = None):
         job.status = JobStatus.RUNNING
         self.db.commit()
 
@@ -153,18 +254,57 @@ class WorkflowService:
                 }
             )
 
+            source = self.db.query(DataSource).filter(DataSource.id == job.source_id).first()
+            target = source.promotion_target if source else None
+            stats = {}
+            if target:
+                # Not committed yet: the loaded rows become visible together with the job's completion.
+                stats = await PromotionEngine(self.db).promote(job, target, progress=progress)
+            if progress is not None:
+                # Locks the job's row until the commit below, so the reaper cannot hand the job to
+                # another worker while the sinks are written or before the loaded rows are visible.
+                # No progress is written from here on: its own session would wait on that lock.
+                progress.confirm(self.db)
+            outputs = write_job_outputs(job, source.output_sinks) if source and source.output_sinks else []
+
             job.status = JobStatus.COMPLETED
             job.completed_at = datetime.utcnow()
-            
+
+            if target:
+                await self.lineage_service.track_data_output(
+                    job_id=job.id,
+                    destination=target["table"],
+                    output_metadata=stats
+                )
+            for output in outputs:
+                await self.lineage_service.track_data_output(
+                    job_id=job.id,
+                    destination=output["path"],
+                    output_metadata=output
+                )
+
             await self.lineage_service.track_workflow_event(
                 job_id=job.id,
                 event_type="data_promotion_completed",
                 metadata={
-                    "completion_timestamp": datetime.utcnow().isoformat()
+                    "completion_timestamp": datetime.utcnow().isoformat(),
+                    **stats
                 }
             )
 
+        except LeaseLostError:
+            # The job belongs to another worker now: nothing of this run is kept.
+            self.db.rollback()
+            raise
+
+        except JobCancelledError as e:
+            self.db.rollback()
+            job.status = JobStatus.CANCELLED
+            job.error_message = str(e)
+            job.completed_at = datetime.utcnow()
+
         except Exception as e:
+            self.db.rollback()
             job.status = JobStatus.FAILED
             job.error_message = f"Data promotion failed: {str(e)}"
             
@@ -179,7 +319,7 @@ class WorkflowService:
 
         self.db.commit()
 
-    async def _execute_job(self, job: ProcessingJob):
+    async def _execute_job(self, job: ProcessingJob, progress: Optional[JobProgress] = None):
         job.status = JobStatus.RUNNING
         job.started_at = datetime.utcnow()
         self.db.commit()
@@ -188,11 +328,21 @@ class WorkflowService:
             from app.services.data_processing_service import DataProcessingService
             processing_service = DataProcessingService(self.db)
             
-            if job.transformation_rules:
-                rules = job.transformation_rules.get("rules", [])
+            rules = (job.transformation_rules or {}).get("rules", [])
+            if rules:
                 from app.schemas.processing import TransformationRuleCreate
                 transformation_rules = [TransformationRuleCreate(**rule) for rule in rules]
-                await processing_service.apply_transformation_rules(job, transformation_rules)
+                await processing_service.apply_transformation_rules(job, transformation_rules, progress=progress)
+            else:
+                job.status = JobStatus.COMPLETED
+                job.completed_at = datetime.utcnow()
+                if progress is not None:
+                    progress.confirm(self.db)
+                self.db.commit()
+
+        except LeaseLostError:
+            self.db.rollback()
+            raise
 
         except Exception as e:
             job.status = JobStatus.FAILED
@@ -200,15 +350,33 @@ class WorkflowService:
             job.completed_at = datetime.utcnow()
             self.db.commit()
 
-    async def _apply_schema_changes(self, job: ProcessingJob):
-        await self.lineage_service.track_workflow_event(
-            job_id=job.id,
-            event_type="schema_change_applied",
-            metadata={
-                "schema_changes": job.input_data,
-                "applied_timestamp": datetime.utcnow().isoformat()
-            }
-        )
+    async def _apply_schema_changes(self, job: ProcessingJob, progress: Optional[JobProgress] = None):
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        self.db.commit()
+
+        try:
+            job.status = JobStatus.COMPLETED
+            job.completed_at = datetime.utcnow()
+            if progress is not None:
+                progress.confirm(self.db)
+            await self.lineage_service.track_workflow_event(
+                job_id=job.id,
+                event_type="schema_change_applied",
+                metadata={
+                    "schema_changes": job_payload(job),
+                    "applied_timestamp": datetime.utcnow().isoformat()
+                }
+            )
+        except LeaseLostError:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            job.status = JobStatus.FAILED
+            job.error_message = f"Schema change failed: {str(e)}"
+            job.completed_at = datetime.utcnow()
+            self.db.commit()
 
     async def get_pending_approvals_for_user(self, user_id: int) -> List[WorkflowApproval]:
         user = self.db.query(User).filter(User.id == user_id).first()
@@ -221,30 +389,3 @@ class WorkflowService:
             ).all()
         else:
             return []
-
-    async def auto_retry_failed_jobs(self):
-        failed_jobs = self.db.query(ProcessingJob).filter(
-            ProcessingJob.status == JobStatus.FAILED
-        ).all()
-
-        for job in failed_jobs:
-            retry_count = job.input_data.get("retry_count", 0) if job.input_data else 0
-            if retry_count < 3:
-                from app.services.data_processing_service import DataProcessingService
-                processing_service = DataProcessingService(self.db)
-                
-                new_job = await processing_service.retry_job(job)
-                new_job.input_data = new_job.input_data or {}
-                new_job.input_data["retry_count"] = retry_count + 1
-                new_job.input_data["auto_retry"] = True
-                self.db.commit()
-
-                await self.lineage_service.track_workflow_event(
-                    job_id=new_job.id,
-                    event_type="auto_retry_initiated",
-                    metadata={
-                        "original_job_id": job.id,
-                        "retry_count": retry_count + 1,
-                        "retry_reason": "automatic_retry_on_failure"
-                    }
-                )
@@ -0,0 +1,181 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+from app.core.celery_app import celery_app
+from app.core.database import SessionLocal
+from app.models.processing_job import ProcessingJob
+from app.models.workflow import ApprovalType
+from app.schemas.processing import TransformationRuleCreate
+from app.services.job_lease import JobLease
+from app.services.job_progress import JobProgress
+
+# Replaced in tests so tasks run against the test database.
+session_factory = SessionLocal
+
+
+@contextmanager
+def _session():
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def _leased(job_id: int):
+    lease = JobLease(session_factory, job_id)
+    if not lease.acquire():
+        # Redelivered while another worker still holds the job, or no longer queued.
+        yield None
+        return
+    try:
+        with lease:
+            error = None
+            try:
+                yield lease
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                # Every task path ends the job COMPLETED, FAILED or CANCELLED.
+                lease.settle(error, retry_status=_retry_status(error))
+    finally:
+        _after_job(job_id)
+
+
+def _retry_status(error: Optional[BaseException]) -> Optional[str]:
+    from pydantic import ValidationError
+    from app.services.retry_scheduler import RETRY_NOT_RETRYABLE
+    from app.services.rule_registry import RuleValidationError
+    # Invalid rules or arguments fail the same way on every attempt.
+    return RETRY_NOT_RETRYABLE if isinstance(error, (RuleValidationError, ValidationError)) else None
+
+
+def _after_job(job_id: int):
+    """Advance the job's pipeline run and hand its freed lane slot to the next job."""
+    from app.services.pipeline_service import PipelineService
+    from app.services.lane_scheduler import LaneScheduler
+    with _session() as db:
+        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+        if job is None:
+            return
+        if job.pipeline_run_id is not None:
+            _run(PipelineService(db).advance(job.pipeline_run_id))
+        if job.lane is not None:
+            _run(LaneScheduler(db).dispatch(job.lane))
+
+
+def _run(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Eager mode called from inside an async request handler: the loop is already taken.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def _skipped(job_id: int) -> Dict[str, Any]:
+    return {"job_id": job_id, "status": "skipped"}
+
+
+@celery_app.task(name="etl.process_uploaded_file")
+def process_uploaded_file(job_id: int):
+    from app.services.ingestion_service import IngestionService
+    with _leased(job_id) as lease:
+        if lease is None:
+            return _skipped(job_id)
+        with _session() as db:
+            _run(IngestionService(db).process_uploaded_file(
+                job_id, lease=lease, progress=JobProgress(session_factory, job_id, lease=lease)
+            ))
+
+
+@celery_app.task(name="etl.pull_source")
+def pull_source(job_id: int):
+    from app.services.ingestion_service import IngestionService
+    with _leased(job_id) as lease:
+        if lease is None:
+            return _skipped(job_id)
+        with _session() as db:
+            _run(IngestionService(db).pull_source(
+                job_id, lease=lease, progress=JobProgress(session_factory, job_id, lease=lease)
+            ))
+
+
+@celery_app.task(name="etl.apply_transformation_rules")
+def apply_transformation_rules(job_id: int, rules: List[Dict[str, Any]], capture_cprofile: bool = False):
+    from app.services.data_processing_service import DataProcessingService
+    with _leased(job_id) as lease:
+        if lease is None:
+            return _skipped(job_id)
+        with _session() as db:
+            job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+            transformation_rules = [TransformationRuleCreate(**rule) for rule in rules]
+            result = _run(DataProcessingService(db).apply_transformation_rules(
+                job, transformation_rules, capture_cprofile=capture_cprofile,
+                progress=JobProgress(session_factory, job_id, lease=lease)
+            ))
+            return {"job_id": job_id, "status": job.status.value, "row_count": result.get("row_count")}
+
+
+@celery_app.task(name="etl.execute_approved_job")
+def execute_approved_job(job_id: int, approval_type: str):
+    from app.services.workflow_service import WorkflowService
+    with _leased(job_id) as lease:
+        if lease is None:
+            return _skipped(job_id)
+        with _session() as db:
+            _run(WorkflowService(db)._execute_approved_job(
+                job_id, ApprovalType(approval_type), progress=JobProgress(session_factory, job_id, lease=lease)
+            ))
+
+
+@celery_app.task(name="etl.run_incremental")
+def run_incremental(job_id: int):
+    from app.services.incremental_service import IncrementalProcessingService
+    with _leased(job_id) as lease:
+        if lease is None:
+            return _skipped(job_id)
+        with _session() as db:
+            result = _run(IncrementalProcessingService(db).run(
+                job_id, progress=JobProgress(session_factory, job_id, lease=lease)
+            ))
+            return {"job_id": job_id, "status": result["status"], "row_count": result.get("row_count")}
+
+
+@celery_app.task(name="etl.send_approval_digest")
+def send_approval_digest(submitter_id: int, approval_ids: List[int], comments: Optional[str] = None):
+    from app.services.workflow_service import WorkflowService
+    with _session() as db:
+        _run(WorkflowService(db).send_approval_digest(submitter_id, approval_ids, comments))
+
+
+@celery_app.task(name="etl.schedule_retries")
+def schedule_retries() -> Dict[str, List[int]]:
+    from app.services.retry_scheduler import RetryScheduler
+    with _session() as db:
+        return _run(RetryScheduler(db).tick())
+
+
+@celery_app.task(name="etl.reap_expired_leases")
+def reap_expired_leases() -> Dict[str, List[int]]:
+    from app.services.job_lease import JobLeaseService
+    with _session() as db:
+        return _run(JobLeaseService(db).reap_expired_leases())
+
+
+@celery_app.task(name="etl.dispatch_lanes")
+def dispatch_lanes() -> Dict[str, List[int]]:
+    from app.services.lane_scheduler import LaneScheduler
+    with _session() as db:
+        return _run(LaneScheduler(db).dispatch_all())
+
+
+@celery_app.task(name="etl.run_scheduled_ingestions")
+def run_scheduled_ingestions() -> Dict[str, List[int]]:
+    from app.services.ingestion_scheduler import IngestionScheduler
+    with _session() as db:
+        return _run(IngestionScheduler(db).tick())
@@ -0,0 +1,10 @@
+import pytest
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    # Caches, spill files and indexes must not outlive a test or land in the source tree.
+    monkeypatch.setattr(settings, "staging_dir", str(tmp_path / "staging"))
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "output_dir", str(tmp_path / "output"))
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import tasks
+from app.core.celery_app import celery_app
+from app.models import Base
+from app.models.data_lineage import DataLineage
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.models.user import User
+from app.models.workflow import WorkflowApproval, WorkflowState, ApprovalType
+from app.services.notification_service import NotificationService
+from app.services.workflow_service import WorkflowService
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(tasks, "session_factory", factory)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    session = factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    emails = []
+
+    async def send(self, to_email, subject, message):
+        emails.append((to_email, subject))
+    monkeypatch.setattr(NotificationService, "_send_email", send)
+    return emails
+
+
+def _approvals(db, submitter, count, state=WorkflowState.PENDING):
+    approvals = []
+    for i in range(count):
+        job = ProcessingJob(name=f"month-end {i}", status=JobStatus.COMPLETED)
+        db.add(job)
+        db.flush()
+        approvals.append(WorkflowApproval(job_id=job.id, approval_type=ApprovalType.DATA_PROMOTION,
+                                          state=state, submitted_by=submitter.id))
+    db.add_all(approvals)
+    db.commit()
+    return approvals
+
+
+def _user(db, name):
+    user = User(username=name, email=f"{name}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_bulk_approve_queues_jobs_and_sends_one_digest_per_submitter(db, sent):
+    alice, bob = _user(db, "alice"), _user(db, "bob")
+    pending = _approvals(db, alice, 3) + _approvals(db, bob, 1)
+    decided = _approvals(db, bob, 1, state=WorkflowState.APPROVED)[0]
+
+    result = asyncio.run(WorkflowService(db).bulk_decide(
+        [approval.id for approval in pending] + [decided.id, 9999], approver_id=alice.id, approve=True
+    ))
+
+    assert result["approved"] == [approval.id for approval in pending]
+    assert {item["approval_id"] for item in result["skipped"]} == {decided.id, 9999}
+    assert sorted(email for email, _ in sent) == ["alice@example.com", "bob@example.com"]
+
+    jobs = db.query(ProcessingJob).filter(ProcessingJob.id.in_(result["queued_job_ids"])).all()
+    assert len(jobs) == 4 and {job.status for job in jobs} == {JobStatus.COMPLETED}
+    events = db.query(DataLineage).filter(DataLineage.event_type == "approval_approved").all()
+    assert len(events) == 4 and all(event.additional_metadata["bulk"] for event in events)
+
+
+def test_bulk_reject_cancels_jobs(db, sent):
+    alice = _user(db, "alice")
+    pending = _approvals(db, alice, 2)
+
+    result = asyncio.run(WorkflowService(db).bulk_decide(
+        [approval.id for approval in pending], approver_id=alice.id, approve=False, comments="wrong cut-off"
+    ))
+
+    assert result["rejected"] == [approval.id for approval in pending]
+    assert {approval.state for approval in db.query(WorkflowApproval).all()} == {WorkflowState.REJECTED}
+    assert {job.status for job in db.query(ProcessingJob).all()} == {JobStatus.CANCELLED}
+    assert len(sent) == 1
@@ -0,0 +1,60 @@
+import asyncio
+import pandas as pd
+import pytest
+from app.services.constraint_engine import compile_constraints
+
+
+class FakeReferenceData:
+    def __init__(self, frame):
+        self.frame = frame
+
+    async def get_frame(self, name):
+        return self.frame
+
+
+def test_constraints_report_counts_and_samples():
+    df = pd.DataFrame({
+        "trade_id": [1, 2, 2, 4, None],
+        "amount": [10, -5, 20, "x", 30],
+        "ccy": ["USD", "EUR", "usd", "GBP", "USD"],
+        "bic": ["DEUTDEFF", "BAD", "CHASUS33", "DEUTDEFF", None],
+        "start": [1, 2, 3, 4, 5],
+        "end": [2, 2, 1, 5, 6],
+    })
+    suite = compile_constraints([
+        {"type": "not_null", "column": "trade_id"},
+        {"type": "unique", "column": "trade_id"},
+        {"type": "range", "column": "amount", "min": 0},
+        {"type": "allowed_values", "column": "ccy", "values": ["USD", "EUR", "GBP"]},
+        {"type": "regex", "column": "bic", "pattern": "[A-Z]{6}[A-Z0-9]{2}"},
+        {"type": "cross_column", "name": "end_after_start", "expression": "end >= start"},
+        {"type": "not_null", "column": "missing_column"},
+    ])
+
+    results = {result["name"]: result for result in asyncio.run(suite.evaluate(df))}
+
+    assert results["not_null:trade_id"]["failed_count"] == 1
+    assert results["unique:trade_id"]["failed_count"] == 2
+    assert results["range:amount"]["failed_count"] == 2
+    assert results["allowed_values:ccy"]["sample_failures"][0]["values"]["ccy"] == "usd"
+    assert results["regex:bic"]["failed_count"] == 1
+    assert results["end_after_start"]["sample_failures"][0]["row"] == "2"
+    assert not results["not_null:missing_column"]["passed"]
+    assert results["not_null:missing_column"]["error"]
+
+
+def test_reference_constraint_uses_reference_index():
+    from app.services.reference_data_service import ReferenceFrame
+    reference = FakeReferenceData(ReferenceFrame("ccy", 1, ["code"], [{"code": "USD"}, {"code": "EUR"}]))
+    suite = compile_constraints([{"type": "reference", "column": "ccy", "dataset": "ccy"}])
+
+    result, = asyncio.run(suite.evaluate(pd.DataFrame({"ccy": ["USD", "JPY", None, "EUR"]}), reference))
+
+    assert result["failed_count"] == 1
+
+
+def test_invalid_definitions_are_rejected():
+    with pytest.raises(ValueError):
+        compile_constraints([{"type": "regex", "column": "a", "pattern": "("}])
+    with pytest.raises(ValueError):
+        compile_constraints([{"type": "cross_column", "expression": "a >"}])
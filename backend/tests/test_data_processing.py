@@ -0,0 +1,108 @@
+import asyncio
+from unittest.mock import MagicMock, AsyncMock
+import pandas as pd
+from app.models.processing_job import JobStatus
+from app.schemas.processing import TransformationRuleCreate
+from app.services.data_processing_service import DataProcessingService
+from app.services.quarantine import read_quarantine
+from app.services.rule_registry import rule_registry
+from app.services.transformation_cache import TransformationCache
+from app.core.config import settings
+
+
+def make_job(rows):
+    job = MagicMock(id=1, source_id=1, status=JobStatus.PENDING, output_data=None)
+    job.input_data = {"data": rows}
+    return job
+
+
+def test_preview_is_deterministic_and_leaves_job_untouched():
+    job = make_job([{"name": f" Row{i} ", "amount": i} for i in range(1000)])
+    rules = [
+        TransformationRuleCreate(rule_type="normalize_text", parameters={"columns": ["name"]}),
+        TransformationRuleCreate(rule_type="filter_rows", parameters={
+            "conditions": [{"column": "amount", "operator": "less_than", "value": 500}]
+        }),
+    ]
+    service = DataProcessingService(MagicMock())
+
+    first = asyncio.run(service.preview_transformation_rules(job, rules, head_rows=10, sample_rows=90))
+    second = asyncio.run(service.preview_transformation_rules(job, rules, head_rows=10, sample_rows=90))
+
+    assert first["rows"] == second["rows"]
+    assert first["sample_row_count"] == 100
+    assert first["rows"][0] == {"name": "row0", "amount": 0}
+    assert [timing["rule_type"] for timing in first["rule_timings"]] == ["normalize_text", "filter_rows"]
+    assert 300 < first["estimated_output_row_count"] < 700
+    assert job.status == JobStatus.PENDING
+    assert job.output_data is None
+
+
+def test_invalid_dates_are_reported_once_per_column():
+    job = make_job([{"trade_date": "31/01/2024"}, {"trade_date": "not a date"}, {"trade_date": "15/02/2024"}])
+    service = DataProcessingService(MagicMock())
+    service.current_job = job
+
+    df = asyncio.run(service._validate_data_types(
+        pd.DataFrame(job.input_data["data"]), {"type_mappings": {"trade_date": "datetime"}, "on_error": "coerce"}
+    ))
+
+    assert df["trade_date"].dt.day.tolist()[::2] == [31, 15]
+    assert len(service._pending_exceptions) == 1
+    issue = service._pending_exceptions[0]
+    assert issue["exception_type"] == "invalid_date_format"
+    assert issue["metadata"]["invalid_count"] == 1
+    assert issue["metadata"]["inferred_format"] == "%d/%m/%Y"
+
+
+def test_bad_rows_are_quarantined_and_the_rest_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "staging_dir", str(tmp_path))
+    rows = [{"amount": str(i), "qty": i} for i in range(1000)]
+    rows[10]["amount"] = "n/a"
+    rows[500]["qty"] = "abc"
+    job = make_job(rows)
+    rules = [
+        TransformationRuleCreate(rule_type="validate_data_types", parameters={"type_mappings": {"amount": "float"}}),
+        TransformationRuleCreate(rule_type="expression", parameters={"column": "total", "expression": "qty * 2 + 1"}),
+    ]
+    service = DataProcessingService(MagicMock())
+    service.exception_service.report_exceptions_bulk = AsyncMock()
+    service.lineage_service.track_transformation = AsyncMock()
+
+    result = asyncio.run(service.apply_transformation_rules(job, rules))
+
+    assert result["row_count"] == 998
+    assert result["quarantine"]["reasons"] == {"invalid_float": 1, "expression_error": 1}
+    quarantined = read_quarantine(job.id)
+    assert [row["_source_row"] for row in quarantined] == [10, 500]
+    assert quarantined[0]["amount"] == "n/a"
+    reported = service.exception_service.report_exceptions_bulk.call_args.args[0]
+    assert sorted(issue["metadata"]["reason"] for issue in reported) == ["expression_error", "invalid_float"]
+
+
+def test_numeric_text_filters_against_numeric_bound():
+    service = DataProcessingService(MagicMock())
+    df = asyncio.run(service._filter_rows(
+        pd.DataFrame({"amount": ["5", "10", "20"]}),
+        {"conditions": [{"column": "amount", "operator": "greater_than", "value": 7}]}
+    ))
+    assert df["amount"].tolist() == ["10", "20"]
+
+
+def test_cache_key_covers_setting_defaults_and_source(monkeypatch):
+    service = DataProcessingService(MagicMock())
+    rules = rule_registry.compile([TransformationRuleCreate(rule_type="validate_data_types", parameters={
+        "type_mappings": {"amount": "float"}
+    })])
+
+    def rules_hash(source_id=1):
+        return TransformationCache.rules_hash(asyncio.run(service._cache_rules_payload(rules, None, source_id)))
+
+    monkeypatch.setattr(settings, "quarantine_invalid_rows", True)
+    quarantining = rules_hash()
+    assert rules_hash(source_id=2) != quarantining
+    monkeypatch.setattr(settings, "quarantine_invalid_rows", False)
+    assert rules_hash() != quarantining
+    monkeypatch.setattr(settings, "quarantine_invalid_rows", True)
+    monkeypatch.setattr(settings, "auto_optimize_dtypes", not settings.auto_optimize_dtypes)
+    assert rules_hash() != quarantining
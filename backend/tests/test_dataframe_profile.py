@@ -0,0 +1,28 @@
+import pandas as pd
+from app.services.dataframe_profile import profile_dataframe
+
+
+def test_profile_matches_pandas_stats_and_is_reused():
+    df = pd.DataFrame({"a": [1, 1, None, 3], "b": ["x", "x", "y", "z"]})
+    profile = profile_dataframe(df)
+
+    assert profile_dataframe(df) is profile
+    assert profile.null_counts == {"a": 1, "b": 0}
+    assert profile.columns["b"]["unique_count"] == 3
+    assert profile.duplicate_rows == int(df.duplicated().sum())
+
+
+def test_refresh_picks_up_in_place_changes():
+    df = pd.DataFrame({"a": ["X", "x"]})
+    assert profile_dataframe(df).columns["a"]["unique_count"] == 2
+
+    df["a"] = df["a"].str.lower()
+    assert profile_dataframe(df, refresh=True).columns["a"]["unique_count"] == 1
+
+
+def test_estimated_unique_counts_are_close():
+    df = pd.DataFrame({"k": [i % 50000 for i in range(200000)]})
+    profile = profile_dataframe(df, exact_unique=False)
+
+    assert profile.to_schema()["unique_counts_estimated"] is True
+    assert abs(profile.columns["k"]["unique_count"] - 50000) < 5000
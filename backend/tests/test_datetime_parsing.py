@@ -0,0 +1,27 @@
+import pandas as pd
+from app.services.datetime_parsing import get_cached_format, parse_datetime_column
+
+
+def test_format_is_inferred_and_cached_per_source_and_column():
+    series = pd.Series(["31/01/2024", "01/02/2024", "15/03/2024"] * 10)
+    parsed, invalid, fmt = parse_datetime_column(series, source_id=42, column="value_date")
+
+    assert fmt == "%d/%m/%Y"
+    assert get_cached_format(42, "value_date") == "%d/%m/%Y"
+    assert get_cached_format(43, "value_date") is None
+    assert parsed.iloc[1] == pd.Timestamp("2024-02-01")
+    assert not invalid.any()
+
+
+def test_only_rows_missing_the_format_fall_back():
+    series = pd.Series(["2024-01-31"] * 20 + ["Feb 3 2024", "garbage", None])
+    parsed, invalid, fmt = parse_datetime_column(series, source_id=7, column="trade_date")
+
+    assert fmt == "%Y-%m-%d"
+    assert parsed.iloc[20] == pd.Timestamp("2024-02-03")
+    assert invalid.tolist() == [False] * 21 + [True, False]
+
+
+def test_jobs_without_source_do_not_share_formats():
+    parse_datetime_column(pd.Series(["31/01/2024", "15/02/2024"]), column="d")
+    assert get_cached_format(None, "d") is None
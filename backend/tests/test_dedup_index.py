@@ -0,0 +1,54 @@
+import pandas as pd
+from app.services import dedup_index
+from app.services.dedup_index import DedupIndex
+
+
+def test_committed_rows_are_seen_by_next_batch(tmp_path):
+    yesterday = pd.DataFrame({"trade_id": [1, 2, 3], "amount": [10.0, 20.0, 30.0]})
+    index = DedupIndex(source_id=1, key_columns=["trade_id"], index_dir=str(tmp_path))
+    index.load()
+    assert not index.contains(DedupIndex.hash_rows(yesterday, ["trade_id"])).any()
+    index.add(DedupIndex.hash_rows(yesterday, ["trade_id"]))
+    index.commit()
+
+    today = pd.DataFrame({"trade_id": [3, 4], "amount": [30.0, 40.0]})
+    reloaded = DedupIndex(source_id=1, key_columns=["trade_id"], index_dir=str(tmp_path)).load()
+    assert reloaded.contains(DedupIndex.hash_rows(today, ["trade_id"])).tolist() == [True, False]
+
+
+def test_uncommitted_rows_are_not_persisted(tmp_path):
+    df = pd.DataFrame({"trade_id": [1]})
+    index = DedupIndex(source_id=1, key_columns=["trade_id"], index_dir=str(tmp_path)).load()
+    index.add(DedupIndex.hash_rows(df, ["trade_id"]))
+
+    reloaded = DedupIndex(source_id=1, key_columns=["trade_id"], index_dir=str(tmp_path)).load()
+    assert not reloaded.contains(DedupIndex.hash_rows(df, ["trade_id"])).any()
+
+
+def test_max_entries_evicts_oldest(tmp_path, monkeypatch):
+    index = DedupIndex(source_id=1, key_columns=["k"], max_entries=2, index_dir=str(tmp_path)).load()
+    for seen_at, key in [(1_000, 1), (2_000, 2), (3_000, 3)]:
+        monkeypatch.setattr(dedup_index.time, "time", lambda: seen_at)
+        index.add(DedupIndex.hash_rows(pd.DataFrame({"k": [key]}), ["k"]))
+        index.commit()
+
+    reloaded = DedupIndex(source_id=1, key_columns=["k"], index_dir=str(tmp_path)).load()
+    assert reloaded.contains(DedupIndex.hash_rows(pd.DataFrame({"k": [1, 2, 3]}), ["k"])).tolist() == [False, True, True]
+
+
+def test_expired_keys_are_not_reported_without_a_commit(tmp_path, monkeypatch):
+    df = pd.DataFrame({"k": [1]})
+    index = DedupIndex(source_id=1, key_columns=["k"], ttl_days=1, index_dir=str(tmp_path)).load()
+    monkeypatch.setattr(dedup_index.time, "time", lambda: 1_000)
+    index.add(DedupIndex.hash_rows(df, ["k"]))
+    index.commit()
+
+    monkeypatch.setattr(dedup_index.time, "time", lambda: 1_000 + 2 * 86400)
+    reloaded = DedupIndex(source_id=1, key_columns=["k"], ttl_days=1, index_dir=str(tmp_path)).load()
+    assert not reloaded.contains(DedupIndex.hash_rows(df, ["k"])).any()
+
+
+def test_int_and_float_keys_hash_alike():
+    as_int = DedupIndex.hash_rows(pd.DataFrame({"k": [1, 2]}), ["k"])
+    as_float = DedupIndex.hash_rows(pd.DataFrame({"k": [1.0, 2.0, None]}), ["k"])
+    assert as_int.tolist() == as_float[:2].tolist()
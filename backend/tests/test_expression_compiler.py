@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+from app.services.expression_compiler import ExpressionError, compile_expression
+
+
+@pytest.fixture
+def trades():
+    return pd.DataFrame({
+        "amount": [100.0, 250.0, None],
+        "fx_rate": [1.1, 0.9, 1.0],
+        "ccy": ["eur", "gbp", None],
+        "book": ["A", "B", "C"],
+    })
+
+
+def test_arithmetic_and_string_functions(trades):
+    assert compile_expression("amount * fx_rate")(trades).round(2).tolist()[:2] == [110.0, 225.0]
+    assert compile_expression('concat(upper(ccy), "/", book)')(trades).tolist() == ["EUR/A", "GBP/B", "/C"]
+
+
+def test_conditionals_and_membership(trades):
+    assert compile_expression("amount if amount > 150 else 0")(trades).tolist() == [0.0, 250.0, 0.0]
+    assert compile_expression('ccy in ["eur", "usd"] or book == "C"')(trades).tolist() == [True, False, True]
+
+
+def test_compiled_expressions_are_cached():
+    assert compile_expression("amount + 1") is compile_expression("amount + 1")
+
+
+@pytest.mark.parametrize("text", ['__import__("os")', "amount.__class__", "[a for a in b]", "amount +"])
+def test_unsafe_or_invalid_expressions_are_rejected(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+
+def test_unknown_column_is_reported(trades):
+    with pytest.raises(ExpressionError, match="missing"):
+        compile_expression("missing * 2")(trades)
+
+
+@pytest.mark.parametrize("text", ["10 ** 10 ** 10", '"a" * 10 ** 10', "(-2) ** 10 ** 9 + amount", "1 / 0"])
+def test_oversized_literal_arithmetic_is_rejected_at_compile_time(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+
+def test_text_column_repetition_is_bounded(trades):
+    assert compile_expression("2 ** 10 + amount")(trades).tolist()[:2] == [1124.0, 1274.0]
+    with pytest.raises(ExpressionError, match="too large"):
+        compile_expression("book * 10 ** 10")(trades)
@@ -0,0 +1,45 @@
+import asyncio
+from unittest.mock import MagicMock
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+from app.schemas.rule_parameters import FuzzyDedupParameters
+from app.services.fuzzy_matching import find_clusters, soundex
+from app.services.data_processing_service import DataProcessingService
+
+
+COUNTERPARTIES = pd.DataFrame({
+    "name": ["Acme Ltd", "ACME Limited", "Acme Ltd.", "Globex Corp", "Globex Corporation", "Initech", None, None],
+    "city": ["London", "London", "london", "Paris", "Paris", "Berlin", None, None],
+})
+
+
+def test_soundex_codes():
+    assert soundex("Robert") == soundex("Rupert") == "R163"
+    assert soundex("Tymczak") == "T522"
+
+
+def test_near_duplicates_cluster_and_blanks_do_not():
+    labels, stats = find_clusters(COUNTERPARTIES, ["name", "city"], threshold=0.8)
+
+    assert labels[0] == labels[1] == labels[2] >= 0
+    assert labels[3] == labels[4] >= 0 and labels[3] != labels[0]
+    assert labels[5] == labels[6] == labels[7] == -1
+    assert stats["distinct_records"] == 4
+
+
+def test_fuzzy_dedup_rule_keeps_one_row_per_cluster():
+    service = DataProcessingService(MagicMock())
+
+    df = asyncio.run(service._fuzzy_dedup(COUNTERPARTIES.copy(), {"columns": ["name"], "threshold": 0.8}))
+
+    assert df.index.tolist() == [0, 3, 5, 6, 7]
+    assert service.rule_outputs["fuzzy_matches"]["cluster_count"] == 2
+    assert service.rule_outputs["fuzzy_matches"]["clusters"][0]["rows"] == ["0", "1", "2"]
+
+
+def test_zero_weights_are_rejected():
+    with pytest.raises(ValidationError):
+        FuzzyDedupParameters(columns=["name", "city"], weights={"name": 0, "city": 0})
+    with pytest.raises(ValueError, match="weight"):
+        find_clusters(COUNTERPARTIES, ["name"], weights={"city": 1.0})
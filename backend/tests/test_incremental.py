@@ -0,0 +1,140 @@
+import asyncio
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import tasks
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.models import Base
+from app.models.data_source import DataSource, SourceType
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.incremental_service import (
+    IncrementalProcessingService, partial_aggregate, merge_partials, finalize_aggregate, INCREMENTAL_JOB_TYPE
+)
+from app.services.rule_registry import RuleValidationError
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(tasks, "session_factory", factory)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    session = factory()
+    yield session
+    session.close()
+
+
+def _run(db, source):
+    job = ProcessingJob(name="incremental", source_id=source.id, job_type=INCREMENTAL_JOB_TYPE, status=JobStatus.RUNNING)
+    db.add(job)
+    db.commit()
+    return asyncio.run(IncrementalProcessingService(db).run(job.id))
+
+
+def test_merged_partials_match_full_aggregation():
+    parameters = {"group_by": ["region"], "aggregations": {"amount": ["sum", "mean", "max", "count"]}}
+    df = pd.DataFrame({"region": ["a", "b", "a", "c", "b", "a"], "amount": [1.0, 2.0, 3.0, 4.0, None, 5.0]})
+
+    state = None
+    for chunk in (df.iloc[:2], df.iloc[2:5], df.iloc[5:]):
+        state = merge_partials(state, partial_aggregate(chunk, parameters), parameters)
+    incremental = finalize_aggregate(state, parameters)
+
+    full = df.groupby("region").agg({"amount": ["sum", "mean", "max", "count"]})
+    full.columns = [f"{column}_{function}" for column, function in full.columns]
+    pd.testing.assert_frame_equal(incremental, full.reset_index(), check_dtype=False)
+
+
+def test_plan_rejects_rules_that_need_full_history(db):
+    service = IncrementalProcessingService(db)
+    with pytest.raises(RuleValidationError, match="sort"):
+        service.compile_plan([{"rule_type": "sort", "parameters": {"by": "amount"}}])
+    with pytest.raises(RuleValidationError, match="cannot be merged"):
+        service.compile_plan([{"rule_type": "aggregate_data",
+                               "parameters": {"group_by": ["region"], "aggregations": {"amount": "median"}}}])
+
+
+def test_run_only_processes_new_batches(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "staging_dir", str(tmp_path))
+    source = DataSource(
+        name="sales",
+        source_type=SourceType.API,
+        standing_rules=[
+            {"rule_type": "filter_rows", "parameters": {"conditions": [{"column": "amount", "operator": "not_null"}]}},
+            {"rule_type": "aggregate_data", "parameters": {"group_by": ["region"], "aggregations": {"amount": "sum"}}},
+        ],
+    )
+    db.add(source)
+    db.commit()
+
+    def add_batch(rows):
+        db.add(ProcessingJob(name="batch", source_id=source.id, status=JobStatus.COMPLETED, input_data={"data": rows}))
+        db.commit()
+
+    add_batch([{"region": "a", "amount": 1}, {"region": "b", "amount": 2}])
+    first = _run(db, source)
+    assert first["delta_row_count"] == 2
+
+    add_batch([{"region": "a", "amount": 5}, {"region": "b", "amount": None}])
+    second = _run(db, source)
+    assert second["delta_row_count"] == 2
+    assert second["processed_data"] == [{"region": "a", "amount": 6.0}, {"region": "b", "amount": 2.0}]
+
+    assert _run(db, source)["status"] == "up_to_date"
+
+
+def test_late_committed_batches_are_read_and_pipeline_steps_skipped(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "staging_dir", str(tmp_path))
+    source = DataSource(name="sales", source_type=SourceType.API, standing_rules=[
+        {"rule_type": "aggregate_data", "parameters": {"group_by": ["region"], "aggregations": {"amount": "sum"}}},
+    ])
+    db.add(source)
+    db.commit()
+
+    first = ProcessingJob(id=2, name="batch", source_id=source.id, status=JobStatus.COMPLETED, insert_txid=100,
+                          input_data={"data": [{"region": "a", "amount": 1}]})
+    db.add(first)
+    db.commit()
+    _run(db, source)
+
+    # A lower id from a transaction that committed after the first run, and a step reading batch 2 again.
+    db.add_all([
+        ProcessingJob(id=1, name="batch", source_id=source.id, status=JobStatus.COMPLETED, insert_txid=101,
+                      input_data={"data": [{"region": "a", "amount": 2}]}),
+        ProcessingJob(id=20, name="step", source_id=source.id, status=JobStatus.COMPLETED, insert_txid=102,
+                      input_job_id=2, pipeline_run_id=1),
+    ])
+    db.commit()
+    second = _run(db, source)
+
+    assert second["batch_job_ids"] == [1]
+    assert second["processed_data"] == [{"region": "a", "amount": 3.0}]
+
+
+def test_queued_run_completes_on_a_worker_and_rejects_changed_rules(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "staging_dir", str(tmp_path))
+    source = DataSource(name="sales", source_type=SourceType.API, standing_rules=[
+        {"rule_type": "aggregate_data", "parameters": {"group_by": ["region"], "aggregations": {"amount": "sum"}}},
+    ])
+    db.add(source)
+    db.commit()
+    db.add(ProcessingJob(name="batch", source_id=source.id, status=JobStatus.COMPLETED,
+                         input_data={"data": [{"region": "a", "amount": 1}]}))
+    db.commit()
+
+    job = asyncio.run(IncrementalProcessingService(db).queue_run(source))
+
+    db.refresh(job)
+    db.refresh(source)
+    assert job.status == JobStatus.COMPLETED and job.task_name == "etl.run_incremental"
+    assert job.output_data["processed_data"] == [{"region": "a", "amount": 1.0}]
+    assert source.incremental_state["version"] == 1
+
+    source.standing_rules = [{"rule_type": "filter_rows", "parameters": {"conditions": []}}]
+    db.commit()
+    with pytest.raises(ValueError, match="reset the incremental state"):
+        asyncio.run(IncrementalProcessingService(db).queue_run(source))
@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import tasks
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.models import Base
+from app.models.data_source import DataSource, SourceType
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.ingestion_scheduler import IngestionScheduler, jitter_offset, next_run_time
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(tasks, "session_factory", factory)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(settings, "staging_dir", str(tmp_path / "staging"))
+    session = factory()
+    yield session
+    session.close()
+
+
+def test_next_run_time_for_cron_and_interval_with_jitter():
+    friday_evening = datetime(2024, 1, 5, 17, 50)
+    weekdays = {"cron": "*/15 9-17 * * mon-fri"}
+    assert next_run_time(weekdays, friday_evening) == datetime(2024, 1, 8, 9, 0)
+    assert next_run_time(weekdays, friday_evening, offset=90) == datetime(2024, 1, 8, 9, 1, 30)
+    assert next_run_time({"interval_seconds": 3600}, datetime(2024, 1, 1, 10, 0)) == datetime(2024, 1, 1, 11, 0)
+
+    with pytest.raises(ValueError):
+        next_run_time({"cron": "0 2 * *"}, friday_evening)
+
+    nightly = {"cron": "0 0 * * *", "jitter_seconds": 600}
+    offsets = {jitter_offset(source_id, nightly) for source_id in range(200)}
+    assert len(offsets) > 100 and max(offsets) <= 600
+
+
+def test_due_source_is_pulled_once_and_skipped_while_still_running(db, tmp_path):
+    data_file = tmp_path / "positions.csv"
+    data_file.write_text("account,amount\nA,1\nB,2\n")
+    source = DataSource(name="positions", source_type=SourceType.BATCH,
+                        connection_config={"type": "file", "path": str(data_file)},
+                        schedule={"interval_seconds": 3600, "jitter_seconds": 0})
+    db.add(source)
+    db.commit()
+    now = datetime(2024, 1, 1, 10, 30)
+    source.next_run_at = now - timedelta(hours=3)  # several slots missed while the scheduler was down
+    db.commit()
+
+    scheduler = IngestionScheduler(db)
+    result = asyncio.run(scheduler.tick(now))
+    assert len(result["started"]) == 1
+    db.refresh(source)
+    assert source.next_run_at == datetime(2024, 1, 1, 11, 0)
+    job = db.query(ProcessingJob).filter(ProcessingJob.id == result["started"][0]).first()
+    assert job.status == JobStatus.COMPLETED and job.output_data["processed_data"]["row_count"] == 2
+
+    # Restarted scheduler, same slot: nothing fires twice.
+    assert asyncio.run(IngestionScheduler(db).tick(now))["started"] == []
+
+    job.status = JobStatus.RUNNING
+    db.commit()
+    result = asyncio.run(scheduler.tick(datetime(2024, 1, 1, 11, 0, 5)))
+    db.refresh(source)
+    assert result == {"started": [], "skipped": [source.id]}
+    assert source.schedule_state["skipped_runs"] == 1
+    assert source.next_run_at == datetime(2024, 1, 1, 12, 0)
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import tasks
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.models import Base
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.models.workflow import ApprovalType
+from app.schemas.processing import TransformationRuleCreate
+from app.services.job_lease import JobLease, JobLeaseService, LeaseLostError
+from app.services.job_queue import JobQueue
+from app.services.lane_scheduler import LaneScheduler
+from app.services.retry_scheduler import RETRY_NOT_RETRYABLE
+from app.services.rule_registry import RuleValidationError
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(tasks, "session_factory", factory)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(settings, "staging_dir", str(tmp_path / "staging"))
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path / "uploads"))
+    return factory
+
+
+def _add_job(db, **fields):
+    job = ProcessingJob(name="job", **fields)
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_lease_is_exclusive_until_it_expires(session_factory):
+    db = session_factory()
+    job = _add_job(db, status=JobStatus.PENDING)
+
+    first = JobLease(session_factory, job.id, owner="worker-a", lease_seconds=60)
+    assert first.acquire()
+    assert not JobLease(session_factory, job.id, owner="worker-b").acquire()
+    db.refresh(job)
+    assert job.status == JobStatus.RUNNING and job.lease_owner == "worker-a"
+
+    db.query(ProcessingJob).filter(ProcessingJob.id == job.id).update(
+        {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+    assert JobLease(session_factory, job.id, owner="worker-b").acquire()
+    with pytest.raises(LeaseLostError):
+        first.checkpoint({"rows_done": 1})
+    db.close()
+
+
+def test_reaper_resumes_ingestion_from_last_checkpoint(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ingestion_chunk_rows", 2)
+    csv_path = tmp_path / "trades.csv"
+    csv_path.write_text("id,amount\n1,10\n2,20\n3,30\n4,40\n5,50\n")
+
+    db = session_factory()
+    job = _add_job(db, status=JobStatus.RUNNING, input_data={"file_path": str(csv_path)},
+                   task_name="etl.process_uploaded_file", attempts=1, lease_owner="dead-worker",
+                   lease_expires_at=datetime.utcnow() - timedelta(minutes=5))
+    job.task_args = [job.id]
+
+    # The dead worker committed one chunk, then crashed halfway through writing the next.
+    staged_path = os.path.join(settings.staging_dir, "ingest", f"job_{job.id}.ndjson")
+    os.makedirs(os.path.dirname(staged_path))
+    committed = '{"id":1,"amount":10}\n{"id":2,"amount":20}\n'
+    with open(staged_path, "w") as f:
+        f.write(committed + '{"id":3,"am')
+    job.checkpoint = {"path": staged_path, "offset": len(committed), "rows_done": 2, "chunks_done": 1,
+                      "columns": ["id", "amount"]}
+    expired = _add_job(db, status=JobStatus.RUNNING, task_name="etl.process_uploaded_file", attempts=3,
+                       lease_owner="dead-worker", lease_expires_at=datetime.utcnow() - timedelta(minutes=5))
+    db.commit()
+
+    outcome = asyncio.run(JobLeaseService(db).reap_expired_leases())
+    assert outcome == {"requeued": [job.id], "failed": [expired.id]}
+
+    db.expire_all()
+    assert job.status == JobStatus.COMPLETED
+    assert job.attempts == 2
+    assert job.lease_owner is None and job.checkpoint is None
+    assert [row["id"] for row in job.output_data["processed_data"]["data"]] == [1, 2, 3, 4, 5]
+    assert expired.status == JobStatus.FAILED
+    db.close()
+
+
+def _run_queued(session_factory, enqueue):
+    db = session_factory()
+    job = _add_job(db, status=JobStatus.COMPLETED)
+    asyncio.run(enqueue(JobQueue(db), job))
+    db.expire_all()
+    return db, db.query(ProcessingJob).filter(ProcessingJob.id == job.id).one()
+
+
+def test_schema_change_task_finishes_job_and_frees_its_lane_slot(session_factory):
+    db, job = _run_queued(session_factory, lambda queue, job: queue.enqueue_approved_job(job, ApprovalType.SCHEMA_CHANGE))
+
+    assert job.status == JobStatus.COMPLETED and job.lease_owner is None
+    assert LaneScheduler(db)._in_flight_by_source(job.lane) == {}
+    db.close()
+
+
+def test_task_that_fails_before_touching_the_job_marks_it_failed(session_factory):
+    bad_rule = TransformationRuleCreate(rule_type="sort", parameters={})
+    db = session_factory()
+    job = _add_job(db, status=JobStatus.COMPLETED)
+    with pytest.raises(RuleValidationError):
+        # Eager mode re-raises the task's error here; a worker would just record it.
+        asyncio.run(JobQueue(db).enqueue_transformation(job, [bad_rule]))
+    db.expire_all()
+
+    assert job.status == JobStatus.FAILED and "sort" in job.error_message
+    assert job.retry_status == RETRY_NOT_RETRYABLE
+    assert LaneScheduler(db)._in_flight_by_source(job.lane) == {}
+    db.close()
+
+
+def test_worker_that_lost_its_lease_does_not_overwrite_the_new_owner(session_factory, monkeypatch):
+    from sqlalchemy import text
+    from app.models.data_source import DataSource, SourceType
+    from app.services.data_processing_service import DataProcessingService
+    from app.services.job_progress import JobProgress
+    from app.services.workflow_service import WorkflowService
+
+    monkeypatch.setattr(settings, "promotion_allowed_tables", ["ledger"])
+    db = session_factory()
+    source = DataSource(name="ledger", source_type=SourceType.BATCH,
+                        promotion_target={"table": "ledger", "mode": "append"})
+    db.add(source)
+    db.commit()
+    rules = [TransformationRuleCreate(rule_type="normalize_text", parameters={"columns": ["name"]})]
+    transform = _add_job(db, status=JobStatus.PENDING, input_data={"data": [{"name": " A "}]})
+    promotion = _add_job(db, status=JobStatus.PENDING, source_id=source.id, output_data={"processed_data": [{"id": 1}]})
+
+    for job in (transform, promotion):
+        lease = JobLease(session_factory, job.id, owner="worker-a")
+        assert lease.acquire()
+        # The reaper gave the job to another worker while this one was still running it.
+        db.query(ProcessingJob).filter(ProcessingJob.id == job.id).update({"lease_owner": "worker-b"})
+        db.commit()
+        progress = JobProgress(session_factory, job.id, lease=lease)
+        with pytest.raises(LeaseLostError):
+            if job is transform:
+                asyncio.run(DataProcessingService(db).apply_transformation_rules(job, rules, progress=progress))
+            else:
+                asyncio.run(WorkflowService(db)._promote_data(job, progress))
+        db.refresh(job)
+        assert job.status == JobStatus.RUNNING and job.lease_owner == "worker-b" and job.completed_at is None
+
+    assert db.execute(text("SELECT COUNT(*) FROM ledger")).scalar() == 0
+
+    # A lost lease also stops the job at its next progress check.
+    lease = JobLease(session_factory, transform.id, owner="worker-b")
+    lease.lost.set()
+    with pytest.raises(LeaseLostError):
+        JobProgress(session_factory, transform.id, lease=lease).start("transform")
+    db.close()
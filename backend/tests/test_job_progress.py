@@ -0,0 +1,102 @@
+import asyncio
+import os
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import tasks
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.models import Base
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.schemas.processing import TransformationRuleCreate
+from app.services.data_processing_service import DataProcessingService
+from app.services.ingestion_service import IngestionService
+from app.services.job_lease import JobLease
+from app.services.job_progress import JobProgress
+from app.services.job_queue import JobQueue
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(tasks, "session_factory", factory)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(settings, "staging_dir", str(tmp_path / "staging"))
+    monkeypatch.setattr(settings, "ingestion_chunk_rows", 2)
+    return factory
+
+
+def _csv_job(db, tmp_path, rows):
+    path = tmp_path / "trades.csv"
+    path.write_text("id,amount\n" + "".join(f"{i},{i * 10}\n" for i in range(rows)))
+    job = ProcessingJob(name="upload", status=JobStatus.PENDING, input_data={"file_path": str(path)})
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_ingestion_reports_rows_chunks_and_eta(session_factory, tmp_path):
+    db = session_factory()
+    job = _csv_job(db, tmp_path, 5)
+    lease = JobLease(session_factory, job.id)
+    assert lease.acquire()
+
+    asyncio.run(IngestionService(db).process_uploaded_file(
+        job.id, lease=lease, progress=JobProgress(session_factory, job.id, update_seconds=0)
+    ))
+
+    db.refresh(job)
+    assert job.status == JobStatus.COMPLETED
+    assert job.progress["rows_done"] == job.progress["rows_total"] == 5
+    assert job.progress["chunks_done"] == 3 and job.progress["eta_seconds"] == 0.0
+
+
+def test_running_ingestion_stops_at_the_next_chunk_and_drops_staged_rows(session_factory, tmp_path):
+    db = session_factory()
+    job = _csv_job(db, tmp_path, 6)
+    lease = JobLease(session_factory, job.id)
+    assert lease.acquire()
+    checkpoint = lease.checkpoint
+
+    def cancel_after_first_chunk(state):
+        checkpoint(state)
+        other = session_factory()
+        other.query(ProcessingJob).filter(ProcessingJob.id == job.id).update({"cancel_requested_at": datetime.utcnow()})
+        other.commit()
+        other.close()
+
+    lease.checkpoint = cancel_after_first_chunk
+    asyncio.run(IngestionService(db).process_uploaded_file(
+        job.id, lease=lease, progress=JobProgress(session_factory, job.id)
+    ))
+
+    db.refresh(job)
+    assert job.status == JobStatus.CANCELLED
+    assert job.progress["chunks_done"] == 1
+    assert not os.path.exists(os.path.join(settings.staging_dir, "ingest", f"job_{job.id}.ndjson"))
+
+
+def test_cancel_queued_job_and_cancelled_transform(session_factory):
+    db = session_factory()
+    queued = ProcessingJob(name="queued", status=JobStatus.PENDING, input_data=[{"a": 1}])
+    running = ProcessingJob(name="running", status=JobStatus.RUNNING, input_data=[{"a": 1}])
+    db.add_all([queued, running])
+    db.commit()
+
+    assert asyncio.run(JobQueue(db).cancel(queued)) == "cancelled"
+    assert queued.status == JobStatus.CANCELLED
+    with pytest.raises(ValueError):
+        asyncio.run(JobQueue(db).cancel(queued))
+
+    assert asyncio.run(JobQueue(db).cancel(running)) == "cancelling"
+    result = asyncio.run(DataProcessingService(db).apply_transformation_rules(
+        running,
+        [TransformationRuleCreate(rule_type="remove_duplicates", parameters={})],
+        progress=JobProgress(session_factory, running.id)
+    ))
+    assert result == {"status": "cancelled"}
+    assert running.status == JobStatus.CANCELLED and running.completed_at <= datetime.utcnow()
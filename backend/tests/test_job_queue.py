@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import tasks
+from app.core.celery_app import celery_app
+from app.models import Base
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.schemas.processing import TransformationRuleCreate
+from app.services.job_queue import JobQueue
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(tasks, "session_factory", factory)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    return factory
+
+
+def test_enqueued_transformation_runs_on_worker_session(session_factory):
+    db = session_factory()
+    job = ProcessingJob(name="queued", status=JobStatus.COMPLETED,
+                        input_data={"data": [{"name": " A "}, {"name": "b"}, {"name": "b"}]})
+    db.add(job)
+    db.commit()
+
+    rules = [
+        TransformationRuleCreate(rule_type="normalize_text", parameters={"columns": ["name"]}),
+        TransformationRuleCreate(rule_type="remove_duplicates", parameters={}),
+    ]
+    task_id = asyncio.run(JobQueue(db).enqueue_transformation(job, rules))
+
+    db.expire_all()
+    assert job.task_id == task_id
+    assert job.queued_at is not None
+    assert job.status == JobStatus.COMPLETED
+    assert job.output_data["row_count"] == 2
+    db.close()
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.models import Base
+from app.models.data_source import DataSource, SourceType
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services import lane_scheduler
+from app.services.lane_scheduler import LaneScheduler
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    monkeypatch.setattr(settings, "lane_concurrency", {"realtime": 1, "interactive": 1, "bulk": 2})
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def published(monkeypatch):
+    jobs = []
+    monkeypatch.setattr(lane_scheduler, "publish_job", lambda job: jobs.append(job.id))
+    return jobs
+
+
+def _queue(db, source, count, lane="bulk", priority=0, queued_at=None):
+    jobs = [
+        ProcessingJob(name=f"{source.name}-{i}", source_id=source.id, status=JobStatus.PENDING, lane=lane,
+                      priority=priority, task_name="etl.process_uploaded_file", task_args=[i], task_id=f"t-{i}",
+                      queued_at=queued_at or datetime.utcnow() - timedelta(seconds=60 - i))
+        for i in range(count)
+    ]
+    db.add_all(jobs)
+    db.commit()
+    return jobs
+
+
+def test_noisy_source_does_not_take_every_slot(db, published):
+    noisy = DataSource(name="reprocessing", source_type=SourceType.BATCH)
+    quiet = DataSource(name="branch", source_type=SourceType.BATCH)
+    db.add_all([noisy, quiet])
+    db.commit()
+    # The noisy source queued first, and more.
+    _queue(db, noisy, 5, queued_at=datetime.utcnow() - timedelta(minutes=5))
+    quiet_job = _queue(db, quiet, 1)[0]
+
+    dispatched = asyncio.run(LaneScheduler(db).dispatch("bulk"))
+
+    assert len(dispatched) == 2 and quiet_job.id in dispatched
+    # The lane is full: nothing more goes out until a job finishes.
+    assert asyncio.run(LaneScheduler(db).dispatch("bulk")) == []
+    assert published == dispatched
+
+
+def test_lanes_have_separate_capacity_and_priority_goes_first(db, published):
+    source = DataSource(name="payments", source_type=SourceType.SWIFT)
+    db.add(source)
+    db.commit()
+    _queue(db, source, 3)
+    urgent = _queue(db, source, 1, lane="realtime", priority=10)[0]
+    _queue(db, source, 1, lane="realtime")
+
+    scheduler = LaneScheduler(db)
+    assert asyncio.run(scheduler.dispatch("realtime")) == [urgent.id]
+    assert len(asyncio.run(scheduler.dispatch("bulk"))) == 2
+
+    metrics = asyncio.run(scheduler.lane_metrics())["lanes"]
+    assert metrics["realtime"]["in_flight"] == 1 and metrics["realtime"]["waiting"] == 1
+    assert metrics["bulk"]["queue_wait_seconds"]["count"] == 2
+    assert metrics["bulk"]["queue_wait_seconds"]["p95"] >= metrics["bulk"]["queue_wait_seconds"]["p50"] > 0
+
+
+def test_high_priority_source_does_not_starve_others(db, published):
+    urgent = DataSource(name="urgent", source_type=SourceType.BATCH)
+    routine = DataSource(name="routine", source_type=SourceType.BATCH)
+    db.add_all([urgent, routine])
+    db.commit()
+    _queue(db, urgent, 5, priority=10)
+    routine_job = _queue(db, routine, 1, queued_at=datetime.utcnow())[0]
+
+    dispatched = asyncio.run(LaneScheduler(db).dispatch("bulk"))
+
+    assert len(dispatched) == 2 and routine_job.id in dispatched
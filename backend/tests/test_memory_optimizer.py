@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from app.services.dataframe_profile import profile_dataframe
+from app.services.memory_optimizer import optimize_dtypes
+
+
+def test_low_cardinality_text_and_small_numbers_are_narrowed():
+    df = pd.DataFrame({
+        "ccy": ["usd", "eur", "gbp", "usd"] * 250,
+        "qty": np.arange(1000) % 100,
+        "price": np.linspace(0, 1, 1000) / 3,
+        "lots": (np.arange(1000) % 10).astype(float),
+        "trade_id": [f"T{i}" for i in range(1000)],
+    })
+
+    df, report = optimize_dtypes(df)
+
+    assert str(df["ccy"].dtype) == "category"
+    assert df["qty"].dtype == np.int8
+    assert df["price"].dtype == np.float64
+    assert df["lots"].dtype == np.float32
+    assert df["trade_id"].dtype == object
+    assert report["bytes_after"] < report["bytes_before"]
+    assert report["columns"]["ccy"]["bytes_after"] < report["columns"]["ccy"]["bytes_before"]
+    assert profile_dataframe(df).columns["ccy"]["type"] == "category"
+
+
+def test_nullable_integers_keep_their_missing_values():
+    df = pd.DataFrame({"n": pd.array([1, None, 300], dtype="Int64")})
+    df, _ = optimize_dtypes(df)
+    assert str(df["n"].dtype) == "Int16"
+    assert df["n"].isna().tolist() == [False, True, False]
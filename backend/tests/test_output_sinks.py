@@ -0,0 +1,99 @@
+import asyncio
+import gzip
+import json
+import os
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.models import Base
+from app.models.data_lineage import DataLineage
+from app.models.data_source import DataSource, SourceType
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.output_sinks import write_job_outputs, NULL_PARTITION
+from app.services.workflow_service import WorkflowService
+
+ROWS = [
+    {"trade_date": "2024-01-02", "desk": "rates", "amount": 1.0},
+    {"trade_date": "2024-01-03", "desk": "fx", "amount": 2.0},
+    {"trade_date": "2024-01-02", "desk": "fx", "amount": 3.0},
+    {"trade_date": None, "desk": "rates", "amount": 4.0},
+    {"trade_date": "2024-01-03", "desk": "rates", "amount": 5.0},
+]
+
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", str(tmp_path))
+    return tmp_path
+
+
+def _job(rows=ROWS, source_id=None):
+    return ProcessingJob(id=7, name="curate", source_id=source_id, output_data={"processed_data": rows})
+
+
+def _files(root):
+    return sorted(os.path.relpath(os.path.join(path, name), root) for path, _, names in os.walk(root) for name in names)
+
+
+def test_csv_sink_partitions_by_column_across_chunks(output_dir):
+    [stats] = write_job_outputs(_job(), [{"name": "trades", "format": "csv", "partition_by": ["trade_date"],
+                                          "compression": "gzip"}], chunk_rows=2)
+
+    assert _files(output_dir) == [
+        "trades/trade_date=2024-01-02/job_7.csv.gz",
+        "trades/trade_date=2024-01-03/job_7.csv.gz",
+        f"trades/trade_date={NULL_PARTITION}/job_7.csv.gz",
+    ]
+    with gzip.open(output_dir / "trades/trade_date=2024-01-03/job_7.csv.gz", "rt") as handle:
+        frame = pd.read_csv(handle)
+    assert list(frame.columns) == ["desk", "amount"] and frame["amount"].tolist() == [2.0, 5.0]
+    assert stats["rows"] == 5 and stats["files"] == 3
+
+
+def test_ndjson_sink_can_partition_by_source(output_dir):
+    write_job_outputs(_job(source_id=3), [{"name": "trades", "format": "ndjson", "partition_by": ["source_id", "desk"]}])
+
+    with open(output_dir / "trades/source_id=3/desk=fx/job_7.ndjson") as handle:
+        records = [json.loads(line) for line in handle]
+    assert [record["amount"] for record in records] == [2.0, 3.0]
+
+
+def test_failed_sink_leaves_no_files(output_dir):
+    sinks = [{"name": "good", "format": "csv"}, {"name": "bad", "format": "csv", "partition_by": ["missing"]}]
+    with pytest.raises(ValueError):
+        write_job_outputs(_job(), sinks)
+    assert _files(output_dir) == []
+
+
+def test_parquet_sink_sizes_row_groups(output_dir):
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = [{"desk": "rates" if i % 2 else "fx", "amount": float(i)} for i in range(25)]
+    write_job_outputs(_job(rows), [{"name": "trades", "format": "parquet", "partition_by": ["desk"],
+                                     "row_group_rows": 5, "compression": "zstd"}], chunk_rows=3)
+
+    metadata = pq.ParquetFile(output_dir / "trades/desk=fx/job_7.parquet").metadata
+    assert metadata.num_rows == 13 and metadata.row_group(0).num_rows == 5
+
+
+def test_promotion_writes_sinks_and_records_lineage(output_dir):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    source = DataSource(name="trades", source_type=SourceType.API,
+                        output_sinks=[{"name": "trades", "format": "csv", "partition_by": ["desk"]}])
+    db.add(source)
+    db.commit()
+    job = ProcessingJob(name="curate", source_id=source.id, status=JobStatus.PENDING, output_data={"processed_data": ROWS})
+    db.add(job)
+    db.commit()
+
+    asyncio.run(WorkflowService(db)._promote_data(job))
+
+    assert job.status == JobStatus.COMPLETED
+    output = db.query(DataLineage).filter(DataLineage.event_type == "output").one()
+    assert output.additional_metadata["rows"] == 5 and output.additional_metadata["files"] == 2
+    assert output.additional_metadata["destination"] == str(output_dir / "trades")
+    db.close()
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import tasks
+from app.core.celery_app import celery_app
+from app.models import Base
+from app.models.data_source import DataSource, SourceType
+from app.models.pipeline import Pipeline, PipelineRunStatus
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.pipeline_service import PipelineService, plan_steps, critical_path
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(tasks, "session_factory", factory)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    session = factory()
+    yield session
+    session.close()
+
+
+def test_plan_rejects_cycles_and_ambiguous_inputs():
+    with pytest.raises(ValueError, match="cycle"):
+        plan_steps([{"name": "a", "depends_on": ["b"]}, {"name": "b", "depends_on": ["a"]}])
+    with pytest.raises(ValueError, match="set 'input'"):
+        plan_steps([{"name": "a"}, {"name": "b"}, {"name": "c", "depends_on": ["a", "b"]}])
+    assert plan_steps([{"name": "b", "depends_on": ["a"]}, {"name": "a"}]) == ["a", "b"]
+
+
+def test_critical_path_follows_the_dependency_that_finished_last():
+    start = datetime(2024, 1, 1)
+    at = lambda seconds: start + timedelta(seconds=seconds)
+    steps = [
+        {"name": "ingest"},
+        {"name": "fast", "depends_on": ["ingest"]},
+        {"name": "slow", "depends_on": ["ingest"]},
+        {"name": "promote", "depends_on": ["fast", "slow"], "input": "fast"},
+    ]
+    timings = {
+        "ingest": (at(0), at(0), at(2)),
+        "fast": (at(2), at(2), at(3)),
+        "slow": (at(2), at(3), at(9)),
+        "promote": (at(9), at(9), at(10)),
+    }
+    report = critical_path(steps, timings, start)
+    assert report["critical_path"] == ["ingest", "slow", "promote"]
+    assert report["critical_path_ms"] == 10000
+    assert report["steps"]["slow"]["queued_ms"] == 1000
+
+
+def test_run_fans_out_and_joins_passing_data_by_reference(db):
+    source = DataSource(name="trades", source_type=SourceType.API)
+    db.add(source)
+    db.commit()
+    input_job = ProcessingJob(name="upload", source_id=source.id, status=JobStatus.COMPLETED,
+                              input_data={"data": [{"ccy": " eur ", "amount": 1}, {"ccy": "usd", "amount": 2},
+                                                  {"ccy": "usd", "amount": 2}]})
+    pipeline = Pipeline(name="morning", source_id=source.id, steps=[
+        {"name": "clean", "rules": [{"rule_type": "normalize_text", "parameters": {"columns": ["ccy"]}}]},
+        {"name": "dedup", "depends_on": ["clean"], "rules": [{"rule_type": "remove_duplicates", "parameters": {}}]},
+        {"name": "count", "depends_on": ["clean"], "rules": [
+            {"rule_type": "aggregate_data", "parameters": {"group_by": ["ccy"], "aggregations": {"amount": "sum"}}}
+        ]},
+        {"name": "publish", "depends_on": ["dedup", "count"], "input": "dedup", "rules": []},
+    ])
+    db.add_all([input_job, pipeline])
+    db.commit()
+
+    run = asyncio.run(PipelineService(db).start_run(pipeline, input_job.id))
+
+    db.refresh(run)
+    assert run.status == PipelineRunStatus.COMPLETED
+    assert {state["status"] for state in run.step_states.values()} == {"completed"}
+    assert run.timing["critical_path"][0] == "clean" and run.timing["critical_path"][-1] == "publish"
+
+    publish = db.query(ProcessingJob).filter(ProcessingJob.id == run.step_states["publish"]["job_id"]).first()
+    assert publish.input_data is None
+    assert publish.input_job_id == run.step_states["dedup"]["job_id"]
+    assert publish.output_data["processed_data"] == [{"ccy": "eur", "amount": 1}, {"ccy": "usd", "amount": 2}]
+
+
+def test_steps_queued_before_a_crash_are_picked_up_by_the_dispatcher(db, monkeypatch):
+    from app.services.job_queue import JobQueue
+    from app.services.lane_scheduler import LaneScheduler
+
+    input_job = ProcessingJob(name="upload", status=JobStatus.COMPLETED, input_data={"data": [{"ccy": " eur "}]})
+    pipeline = Pipeline(name="morning", steps=[
+        {"name": "clean", "rules": [{"rule_type": "normalize_text", "parameters": {"columns": ["ccy"]}}]}
+    ])
+    db.add_all([input_job, pipeline])
+    db.commit()
+
+    # The process dies after the step state commits but before the job is handed to the workers.
+    async def crash(self, jobs):
+        pass
+    with monkeypatch.context() as patch:
+        patch.setattr(JobQueue, "release", crash)
+        run = asyncio.run(PipelineService(db).start_run(pipeline, input_job.id))
+
+    step_job = db.query(ProcessingJob).filter(ProcessingJob.id == run.step_states["clean"]["job_id"]).first()
+    assert step_job.task_name == "etl.apply_transformation_rules" and step_job.status == JobStatus.PENDING
+
+    asyncio.run(LaneScheduler(db).dispatch_all())
+
+    db.refresh(run)
+    assert run.status == PipelineRunStatus.COMPLETED
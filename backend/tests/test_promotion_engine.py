@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.models import Base
+from app.models.data_lineage import DataLineage
+from app.models.data_source import DataSource, SourceType
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.promotion_engine import PromotionEngine, validate_target
+from app.services.workflow_service import WorkflowService
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "promotion_allowed_tables", ["payments", "balances", "ledger"])
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _job(db, rows, source=None):
+    job = ProcessingJob(name="promote", status=JobStatus.PENDING, source_id=source.id if source else None,
+                        output_data={"processed_data": rows})
+    db.add(job)
+    db.commit()
+    return job
+
+
+def _rows(db, table):
+    return db.execute(text(f"SELECT id, amount FROM {table} ORDER BY id")).fetchall()
+
+
+def test_upsert_updates_existing_keys_and_inserts_new_ones(db):
+    target = {"table": "payments", "mode": "upsert", "key_columns": ["id"], "batch_rows": 2}
+    asyncio.run(PromotionEngine(db).promote(_job(db, [{"id": 1, "amount": 10.0}, {"id": 2, "amount": 20.0}]), target))
+    db.commit()
+
+    stats = asyncio.run(PromotionEngine(db).promote(
+        _job(db, [{"id": 2, "amount": 25.0}, {"id": 3, "amount": 30.0}, {"id": 3, "amount": 35.0}]), target
+    ))
+    db.commit()
+
+    assert _rows(db, "payments") == [(1, 10.0), (2, 25.0), (3, 35.0)]
+    assert stats["rows"] == 2 and stats["batches"] == 1
+    assert not [name for name in inspect(db.connection()).get_table_names() if name.startswith("_stage")]
+
+
+def test_replace_swaps_table_and_keeps_key_index(db):
+    target = {"table": "balances", "mode": "replace", "key_columns": ["id"]}
+    asyncio.run(PromotionEngine(db).promote(_job(db, [{"id": 1, "amount": 1.0}, {"id": 2, "amount": 2.0}]), target))
+    asyncio.run(PromotionEngine(db).promote(_job(db, [{"id": 5, "amount": 5.0}]), target))
+    db.commit()
+
+    assert _rows(db, "balances") == [(5, 5.0)]
+    indexes = inspect(db.connection()).get_indexes("balances")
+    assert [(index["name"], bool(index["unique"])) for index in indexes] == [("ux_balances_keys", True)]
+
+
+def test_promote_data_loads_target_and_records_throughput(db):
+    source = DataSource(name="ledger", source_type=SourceType.API,
+                        promotion_target={"table": "ledger", "mode": "append"})
+    db.add(source)
+    db.commit()
+    job = _job(db, [{"id": 1, "amount": 1.5}], source=source)
+
+    asyncio.run(WorkflowService(db)._promote_data(job))
+
+    assert job.status == JobStatus.COMPLETED
+    assert _rows(db, "ledger") == [(1, 1.5)]
+    output = db.query(DataLineage).filter(DataLineage.event_type == "output").one()
+    assert output.additional_metadata["destination"] == "ledger" and output.additional_metadata["rows"] == 1
+
+
+def test_failed_promotion_leaves_target_untouched(db):
+    source = DataSource(name="ledger", source_type=SourceType.API,
+                        promotion_target={"table": "ledger", "mode": "append"})
+    db.add(source)
+    db.commit()
+    asyncio.run(WorkflowService(db)._promote_data(_job(db, [{"id": 1, "amount": 1.5}], source=source)))
+
+    job = _job(db, [{"id": 2, "amount": 2.5, "unknown": "x"}], source=source)
+    asyncio.run(WorkflowService(db)._promote_data(job))
+
+    assert job.status == JobStatus.FAILED and "unknown" in job.error_message
+    assert _rows(db, "ledger") == [(1, 1.5)]
+
+
+@pytest.mark.parametrize("table", ["processing_jobs", "users", "_stage_payments_1", "audit_log", "public.payments"])
+def test_targets_outside_the_allow_list_or_owned_by_the_app_are_refused(db, table):
+    with pytest.raises(ValueError):
+        asyncio.run(PromotionEngine(db).promote(_job(db, [{"id": 1, "amount": 1.0}]), {"table": table, "mode": "replace"}))
+
+    assert inspect(db.connection()).has_table("processing_jobs")
+
+
+def test_configured_schema_allows_its_tables_but_not_app_table_names(monkeypatch):
+    monkeypatch.setattr(settings, "promotion_schema", "curated")
+    validate_target("curated.payments")
+    with pytest.raises(ValueError):
+        validate_target("curated.processing_jobs")
+    with pytest.raises(ValueError):
+        validate_target("payments")
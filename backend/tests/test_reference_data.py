@@ -0,0 +1,37 @@
+import asyncio
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base
+from app.services.reference_data_service import ReferenceDataService, reference_cache
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_lookup_enriches_rows_and_refreshes_on_new_version(db):
+    service = ReferenceDataService(db)
+    dataset = asyncio.run(service.create_dataset(
+        name="currencies",
+        key_columns=["code"],
+        data=[{"code": "EUR", "decimals": 2}, {"code": "JPY", "decimals": 0}],
+    ))
+    trades = pd.DataFrame({"ccy": ["EUR", "JPY", "XXX"], "amount": [1, 2, 3]})
+
+    enriched, stats = asyncio.run(service.lookup(trades, dataset="currencies", on=["ccy"]))
+    assert enriched["decimals"].tolist()[:2] == [2, 0]
+    assert pd.isna(enriched["decimals"].iloc[2])
+    assert stats["rows_matched"] == 2
+    assert reference_cache.get("currencies", 1) is not None
+
+    asyncio.run(service.update_dataset(dataset, {"data": [{"code": "EUR", "decimals": 3}]}))
+    enriched, stats = asyncio.run(service.lookup(trades, dataset="currencies", on=["ccy"], how="inner"))
+    assert enriched["decimals"].tolist() == [3]
+    assert stats["version"] == 2
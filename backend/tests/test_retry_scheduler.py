@@ -0,0 +1,101 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import tasks
+from app.core.celery_app import celery_app
+from app.models import Base
+from app.core.config import settings
+from app.models.processing_job import ProcessingJob, JobStatus
+from app.services.job_lease import JobLeaseService
+from app.services.retry_scheduler import RetryScheduler, backoff_delay
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(tasks, "session_factory", factory)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    session = factory()
+    yield session
+    session.close()
+
+
+def test_backoff_grows_exponentially_within_jitter_bounds():
+    rng = random.Random(7)
+    delays = [backoff_delay(attempt, 30, 3600, rng) for attempt in range(10)]
+    for attempt, delay in enumerate(delays):
+        step = min(3600, 30 * 2 ** attempt)
+        assert step / 2 <= delay <= step
+    assert max(delays) <= 3600
+
+
+def test_failed_job_is_retried_once_due_and_chain_budget_is_enforced(db):
+    now = datetime.utcnow()
+    original = ProcessingJob(
+        name="nightly", status=JobStatus.FAILED, input_data={"data": [{"name": " A "}]},
+        task_name="etl.apply_transformation_rules",
+        task_args=[None, [{"rule_type": "normalize_text", "parameters": {"columns": ["name"]}}], False]
+    )
+    spent = ProcessingJob(name="spent", status=JobStatus.FAILED, retry_count=3)
+    stale = ProcessingJob(name="stale", status=JobStatus.FAILED, updated_at=now - timedelta(days=7))
+    db.add_all([original, spent, stale])
+    db.commit()
+
+    scheduler = RetryScheduler(db)
+    outcome = asyncio.run(scheduler.tick(now))
+    assert outcome == {"scheduled": [original.id], "exhausted": [spent.id], "retried": []}
+    assert stale.retry_status is None
+
+    outcome = asyncio.run(scheduler.tick(now + timedelta(hours=2)))
+    assert len(outcome["retried"]) == 1
+
+    retry = db.query(ProcessingJob).filter(ProcessingJob.id == outcome["retried"][0]).first()
+    db.refresh(retry)
+    assert retry.input_data is None
+    assert retry.root_job_id == original.id and retry.retry_count == 1
+    assert retry.status == JobStatus.COMPLETED
+    assert retry.output_data["processed_data"] == [{"name": "a"}]
+    assert original.retry_status == "retried"
+
+
+def test_jobs_that_cannot_or_should_not_rerun_are_not_scheduled(db):
+    now = datetime.utcnow()
+    inline = ProcessingJob(name="incremental", status=JobStatus.FAILED)
+    abandoned = ProcessingJob(name="abandoned", status=JobStatus.RUNNING, task_name="etl.process_uploaded_file",
+                              task_args=[1], attempts=settings.job_max_attempts, lease_owner="gone",
+                              lease_expires_at=now - timedelta(minutes=1))
+    db.add_all([inline, abandoned])
+    db.commit()
+
+    asyncio.run(JobLeaseService(db).reap_expired_leases())
+    outcome = asyncio.run(RetryScheduler(db).tick(now + timedelta(minutes=1)))
+
+    assert abandoned.status == JobStatus.FAILED and abandoned.retry_status == "exhausted"
+    assert outcome == {"scheduled": [], "exhausted": [inline.id], "retried": []}
+    with pytest.raises(ValueError):
+        asyncio.run(RetryScheduler(db).retry(inline))
+
+
+def test_overlapping_ticks_retry_a_due_job_once(db, monkeypatch):
+    now = datetime.utcnow()
+    job = ProcessingJob(
+        name="nightly", status=JobStatus.FAILED, input_data={"data": [{"name": "a"}]},
+        task_name="etl.apply_transformation_rules", task_args=[None, [], False],
+        retry_status="scheduled", next_retry_at=now
+    )
+    db.add(job)
+    db.commit()
+
+    # Both ticks read the due job before either retried it.
+    monkeypatch.setattr(RetryScheduler, "_due_job_ids", lambda self, now: [job.id, job.id])
+    outcome = asyncio.run(RetryScheduler(db).tick(now))
+
+    assert len(outcome["retried"]) == 1
+    assert db.query(ProcessingJob).filter(ProcessingJob.root_job_id == job.id).count() == 1
+    assert job.retry_status == "retried"
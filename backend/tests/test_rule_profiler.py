@@ -0,0 +1,44 @@
+import asyncio
+import pandas as pd
+import pytest
+from app.services.rule_profiler import RuleProfiler
+
+
+async def _double(df, parameters):
+    return pd.concat([df, df], ignore_index=True)
+
+
+async def _fail(df, parameters):
+    raise ValueError("bad rule")
+
+
+def test_profiler_records_rows_memory_and_failures():
+    df = pd.DataFrame({"value": range(1000)})
+    profiler = RuleProfiler(trace_memory=True)
+
+    async def run():
+        with profiler:
+            out = await profiler.run("double", _double, df, {})
+            with pytest.raises(ValueError):
+                await profiler.run("fail", _fail, out, {})
+
+    asyncio.run(run())
+    report = profiler.report()
+
+    double, failed = report["rules"]
+    assert (double["rows_in"], double["rows_out"], double["failed"]) == (1000, 2000, False)
+    assert double["peak_memory_delta_bytes"] > 0
+    assert failed["failed"] and failed["rows_out"] is None
+    assert report["total_wall_ms"] >= report["total_rule_wall_ms"]
+    assert report["cprofile"] is None
+
+
+def test_cprofile_dump_is_captured_on_request():
+    profiler = RuleProfiler(capture_cprofile=True)
+
+    async def run():
+        with profiler:
+            await profiler.run("double", _double, pd.DataFrame({"value": [1]}), {})
+
+    asyncio.run(run())
+    assert "_double" in profiler.report()["cprofile"]
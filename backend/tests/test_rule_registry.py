@@ -0,0 +1,49 @@
+import asyncio
+from unittest.mock import MagicMock
+import pytest
+from app.models.processing_job import JobStatus
+from app.schemas.processing import TransformationRuleCreate
+from app.schemas.rule_parameters import RuleParameters
+from app.services.data_processing_service import DataProcessingService
+from app.services.rule_registry import rule_registry, RuleSpec, RuleValidationError
+
+
+def test_bad_rule_sets_fail_before_the_job_runs():
+    job = MagicMock(id=1, source_id=1, status=JobStatus.PENDING, input_data={"data": [{"a": 1}]})
+    rules = [
+        TransformationRuleCreate(rule_type="no_such_rule", parameters={}),
+        TransformationRuleCreate(rule_type="expression", parameters={"column": "b", "expression": "a +"}),
+        TransformationRuleCreate(rule_type="top_n", parameters={"by": "a", "n": -1}),
+    ]
+    service = DataProcessingService(MagicMock())
+
+    with pytest.raises(RuleValidationError) as error:
+        asyncio.run(service.apply_transformation_rules(job, rules))
+
+    assert len(error.value.errors) == 3
+    assert job.status == JobStatus.PENDING
+
+
+def test_compiled_rule_sets_are_cached_and_plugins_hot_register():
+    rules = [TransformationRuleCreate(rule_type="sort", parameters={"by": "a"})]
+    first = rule_registry.compile(rules)
+    assert rule_registry.compile(rules) is first
+    assert first.rules[0].parameters == {"by": "a", "ascending": True}
+
+    async def tag(service, df, parameters):
+        df["tag"] = parameters["value"]
+        return df
+
+    class TagParameters(RuleParameters):
+        value: str
+
+    rule_registry.register(RuleSpec("tag", tag, TagParameters))
+    try:
+        assert rule_registry.compile(rules) is not first
+        preview = asyncio.run(DataProcessingService(MagicMock()).preview_transformation_rules(
+            MagicMock(id=1, source_id=1, input_data={"data": [{"a": 1}]}),
+            [TransformationRuleCreate(rule_type="tag", parameters={"value": "x"})]
+        ))
+        assert preview["rows"] == [{"a": 1, "tag": "x"}]
+    finally:
+        rule_registry.unregister("tag")
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from app.services.sorting import sort_frame, top_n
+
+
+def make_frame(rows=5000):
+    rng = np.random.default_rng(7)
+    values = rng.integers(0, 50, rows).astype(float)
+    values[::97] = np.nan
+    return pd.DataFrame({
+        "book": rng.choice(["fx", "rates", "credit"], rows),
+        "amount": values,
+        "seq": np.arange(rows)
+    })
+
+
+def test_sort_is_stable_with_nulls_last():
+    df = make_frame()
+    expected = df.sort_values(["book", "amount"], ascending=[True, False], kind="mergesort", na_position="last")
+
+    result, stats = sort_frame(df, ["book", "amount"], [True, False])
+
+    assert stats == {"method": "in_memory", "rows": len(df)}
+    assert result["seq"].tolist() == expected["seq"].tolist()
+
+
+def test_top_n_matches_full_sort():
+    df = make_frame()
+    expected = df.sort_values(["book", "amount"], ascending=False, kind="mergesort", na_position="last").head(25)
+
+    assert top_n(df, ["book", "amount"], 25, chunk_rows=700)["seq"].tolist() == expected["seq"].tolist()
+    assert top_n(df, "seq", 3)["seq"].tolist() == [4999, 4998, 4997]
+
+
+def test_top_n_keeps_nulls_last_on_both_paths():
+    df = pd.DataFrame({"amount": [3.0, None, 1.0, None], "book": ["c", None, "a", None], "seq": [0, 1, 2, 3]})
+
+    assert top_n(df, "amount", 3)["seq"].tolist() == [0, 2, 1]
+    assert top_n(df, "book", 3)["seq"].tolist() == [0, 2, 1]
@@ -0,0 +1,29 @@
+import os
+import pandas as pd
+from app.services.transformation_cache import TransformationCache
+
+
+def test_rules_hash_ignores_descriptions_and_key_order():
+    first = [{"rule_type": "filter_rows", "parameters": {"a": 1, "b": 2}, "description": "x"}]
+    second = [{"rule_type": "filter_rows", "parameters": {"b": 2, "a": 1}}]
+    assert TransformationCache.rules_hash(first) == TransformationCache.rules_hash(second)
+
+
+def test_input_hash_changes_with_values():
+    df = pd.DataFrame({"a": [1, 2]})
+    assert TransformationCache.input_hash(df) == TransformationCache.input_hash(df.copy())
+    assert TransformationCache.input_hash(df) != TransformationCache.input_hash(pd.DataFrame({"a": [1, 3]}))
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = TransformationCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+    payload = {"processed_df": pd.DataFrame({"a": range(1000)})}
+    cache.put("old", payload)
+    os.utime(tmp_path / "old.pkl", (0, 0))
+    cache.put("new", payload)
+
+    cache.max_bytes = os.path.getsize(tmp_path / "new.pkl")
+    cache.evict()
+
+    assert cache.get("old") is None
+    assert cache.get("new") is not None